@@ -0,0 +1,208 @@
+"""
+zone_changes.py
+
+An ansible-rulebook event source that watches UltraDNS zones for changes.
+
+Each poll walks the account's zones through the /v3/zones cursor pagination and
+compares every zone's lastModifiedDateTime and record count against an in-memory
+index. Only zones that differ are looked at more closely: their SOA serial is read
+and, when the serial moved and include_rrsets is set, their rrsets are fetched and
+attached to the event. The index holds a few fields per zone, so it stays small even
+for 100k zones.
+
+A zone's serial is known from its first change on, so records_changed is None for
+the first change of a zone, as its previous serial is not known. With seed_serials
+set, the first poll reads the SOA serial of every zone, concurrently, so even a first
+change tells record changes from metadata changes, at the cost of one request per zone.
+
+When the rrsets of a changed zone cannot be read, the event carries an error instead
+of rrsets. A poll that fails is logged and retried, and the index only moves on once a
+poll completed, so no change is lost.
+
+The polling interval adapts to activity: it drops to the minimum interval after a poll
+that found changes and doubles after every quiet or failed poll, up to the maximum interval.
+
+Arguments:
+    username:       UltraDNS username, defaults to ULTRADNS_USERNAME
+    password:       UltraDNS password, defaults to ULTRADNS_PASSWORD
+    use_test:       use the UltraDNS test API, defaults to false
+    host:           API host, overrides use_test. May include a scheme, e.g. http://127.0.0.1:8080 for a stub API
+    zone_filter:    optional v3 zones query, e.g. "zone_type:PRIMARY+account_name:example"
+    interval:       minimum seconds between polls, defaults to 60
+    max_interval:   maximum seconds between polls, defaults to 900
+    include_rrsets: attach the rrsets of changed zones to their events, defaults to false
+    emit_initial:   emit an event for every zone on the first poll, defaults to false
+    page_size:      zones requested per page, defaults to 1000
+    seed_serials:   read every zone's SOA serial on the first poll, defaults to false
+    max_workers:    concurrent SOA reads while seeding, defaults to 8
+
+Example:
+
+    - name: React to UltraDNS zone changes
+      hosts: localhost
+      sources:
+        - ultradns.ultradns.zone_changes:
+            zone_filter: "zone_type:PRIMARY"
+            interval: 30
+            include_rrsets: true
+      rules:
+        - name: Zone changed
+          condition: event.change == "modified"
+          action:
+            run_playbook:
+              name: playbooks/audit_zone.yml
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.concurrency import DEFAULT_WORKERS, run_parallel
+from ansible_collections.ultradns.ultradns.plugins.module_utils.connection import UltraConnection
+from ansible_collections.ultradns.ultradns.plugins.module_utils.models import RRSet
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSError, UltraDNSModule
+
+PROD = 'api.ultradns.com'
+TEST = 'test-api.ultradns.com'
+
+logger = logging.getLogger(__name__)
+
+
+class ZoneChangeDetector:
+    """Keeps the zone index and turns one poll of the API into a list of change events."""
+
+    def __init__(self, connection, zone_filter=None, include_rrsets=False, emit_initial=False, page_size=1000,
+                 seed_serials=False, max_workers=DEFAULT_WORKERS):
+        self.connection = connection
+        self.zone_filter = zone_filter
+        self.include_rrsets = include_rrsets
+        self.emit_initial = emit_initial
+        self.seed_serials = seed_serials
+        self.max_workers = max_workers
+        # zone name -> (lastModifiedDateTime, resourceRecordCount, status)
+        self.index: Dict[str, tuple] = {}
+        # zone name -> SOA serial, known from a zone's first change on, or seeded on the first poll
+        self.serials: Dict[str, Optional[int]] = {}
+        self.initialized = False
+        # the shared paged reader, sending its requests on this connection
+        self.api = UltraDNSModule({'page_size': page_size})
+        self.api.connection = connection
+
+    def _serial(self, name):
+        result = self.connection.get(f'/v3/zones/{name}/rrsets/SOA/{name}')
+        try:
+            return RRSet.first(result).serial
+        except (IndexError, ValueError, AttributeError):
+            return None
+
+    def _event(self, change, name, properties, serials):
+        event = {'change': change, 'zone': name, 'properties': properties}
+        if change == 'deleted':
+            serials[name] = None
+            return event
+
+        serial = self._serial(name)
+        previous = self.serials.get(name)
+        serials[name] = serial
+        event['serial'] = serial
+        event['previous_serial'] = previous
+        # a new lastModifiedDateTime with the same serial is a metadata change, the records did not move.
+        # without both serials it cannot be told, except for a new zone whose records are all new
+        if change == 'added':
+            event['records_changed'] = True
+        elif serial is None or previous is None:
+            event['records_changed'] = None
+        else:
+            event['records_changed'] = serial != previous
+        if self.include_rrsets and event['records_changed']:
+            try:
+                event['rrsets'] = list(self.api.iter_records(name))
+            except UltraDNSError as exc:
+                # a partial list would look like a zone that lost records, so none is attached
+                event['error'] = f'Unable to read the rrsets: {exc}'
+        return event
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """
+        Raises:
+            UltraDNSError: The zones could not be listed, the index is left as it was
+        """
+        events, index, serials = [], {}, {}
+        for zone in self.api.iter_zones({'query': self.zone_filter} if self.zone_filter else {}):
+            properties = zone.get('properties', {})
+            name = properties.get('name')
+            if not name:
+                continue
+            key = (properties.get('lastModifiedDateTime'), properties.get('resourceRecordCount'), properties.get('status'))
+            previous = self.index.get(name)
+            index[name] = key
+            if previous == key or (not self.initialized and not self.emit_initial):
+                continue
+            events.append(self._event('added' if previous is None else 'modified', name, properties, serials))
+
+        for name in self.index:
+            if name not in index:
+                events.append(self._event('deleted', name, {'name': name}, serials))
+
+        if not self.initialized and self.seed_serials:
+            names = list(n for n in index if n not in serials)
+            serials.update(zip(names, run_parallel(self._serial, names, self.max_workers)))
+
+        # the poll completed, so the index and serials move on together
+        self.index = index
+        for name, serial in serials.items():
+            if name in index:
+                self.serials[name] = serial
+            else:
+                self.serials.pop(name, None)
+        self.initialized = True
+        return events
+
+
+def _connect(args):
+    host = args.get('host') or (TEST if args.get('use_test') else PROD)
+    connection = UltraConnection(host=host)
+    connection.auth(args.get('username') or os.environ.get('ULTRADNS_USERNAME'),
+                    args.get('password') or os.environ.get('ULTRADNS_PASSWORD'))
+    return connection
+
+
+async def main(queue: asyncio.Queue, args: Dict[str, Any]):
+    interval = int(args.get('interval', 60))
+    max_interval = max(interval, int(args.get('max_interval', 900)))
+    connection = await asyncio.to_thread(_connect, args)
+    detector = ZoneChangeDetector(
+        connection,
+        zone_filter=args.get('zone_filter'),
+        include_rrsets=bool(args.get('include_rrsets', False)),
+        emit_initial=bool(args.get('emit_initial', False)),
+        page_size=int(args.get('page_size', 1000)),
+        seed_serials=bool(args.get('seed_serials', False)),
+        max_workers=int(args.get('max_workers', DEFAULT_WORKERS)))
+
+    delay = interval
+    while True:
+        try:
+            events = await asyncio.to_thread(detector.poll)
+        except Exception as exc:
+            # timeouts, token refreshes and API errors end one poll, not the event source
+            delay = min(delay * 2, max_interval)
+            logger.warning('Polling UltraDNS zones failed, retrying in %s seconds: %s', delay, exc)
+            await asyncio.sleep(delay)
+            continue
+        for event in events:
+            await queue.put(event)
+
+        # poll again soon while zones are changing, back off while they are quiet
+        delay = interval if events else min(delay * 2, max_interval)
+        await asyncio.sleep(delay)
+
+
+if __name__ == '__main__':
+
+    class MockQueue:
+        async def put(self, event):
+            print(event)
+
+    asyncio.run(main(MockQueue(), {'interval': 10, 'include_rrsets': True}))
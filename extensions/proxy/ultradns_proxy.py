@@ -0,0 +1,55 @@
+"""
+ultradns_proxy.py
+
+A local daemon that shares one UltraDNS API session between ansible-playbook runs.
+
+It logs in once with ULTRADNS_USERNAME and ULTRADNS_PASSWORD and serves the modules
+whose provider sets proxy_socket over a Unix socket, see ProxyServer in
+plugins/module_utils/proxy.py for what is shared, merged and cached.
+
+Usage:
+
+    ULTRADNS_USERNAME=user ULTRADNS_PASSWORD=secret \\
+        python -m ansible_collections.ultradns.ultradns.extensions.proxy.ultradns_proxy \\
+        --socket ~/.ultradns.sock --rate 10 --cache-ttl 30
+"""
+
+import argparse
+import os
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.connection import UltraConnection
+from ansible_collections.ultradns.ultradns.plugins.module_utils.proxy import ProxyServer
+
+PROD = 'api.ultradns.com'
+TEST = 'test-api.ultradns.com'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Share one UltraDNS API session between local ansible-playbook runs.')
+    parser.add_argument('--socket', required=True, help='path of the Unix socket to listen on')
+    parser.add_argument('--test', action='store_true', help='use the test API endpoint')
+    parser.add_argument('--rate', type=float, default=10, help='API requests per second across all clients')
+    parser.add_argument('--burst', type=int, default=None, help='requests allowed at once before the rate applies')
+    parser.add_argument('--cache-ttl', type=float, default=30, help='seconds a GET response is reused, 0 disables the cache')
+    parser.add_argument('--idle-timeout', type=float, default=None, help='exit after this many seconds without requests')
+    args = parser.parse_args(argv)
+
+    username, password = os.environ.get('ULTRADNS_USERNAME'), os.environ.get('ULTRADNS_PASSWORD')
+    if not username or not password:
+        parser.error('set ULTRADNS_USERNAME and ULTRADNS_PASSWORD')
+
+    # the connection keeps its HTTP connections alive between requests on its own session
+    connection = UltraConnection(host=TEST if args.test else PROD)
+    connection.auth(username=username, password=password)
+
+    server = ProxyServer(os.path.expanduser(args.socket), connection, args.rate, args.burst, args.cache_ttl, args.idle_timeout)
+    try:
+        server.serve_forever(poll_interval=1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
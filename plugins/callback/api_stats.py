@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: UltraDNS
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+name: api_stats
+author: UltraDNS (@ultradns)
+type: aggregate
+short_description: Summarize the UltraDNS API cost of a playbook
+description:
+    - Collects the C(api_stats) returned by the UltraDNS modules and reports, per task, how many API calls,
+      logins, retries and bytes the task caused, plus the slowest endpoints of the run.
+    - Reads the proxy daemon answered from its cache or from another caller's request are counted as C(cached).
+    - For tasks that loop over a module which has a bulk mode, the report estimates how many calls the bulk mode would have saved.
+    - The report is shown at the end of the play recap and can also be written to text and JSON files.
+version_added: 1.2.0
+requirements:
+    - enable in configuration
+options:
+    json_file:
+        description:
+            - Path of a file to write the aggregated report to as JSON
+        type: path
+        env:
+            - name: ULTRADNS_API_STATS_JSON
+        ini:
+            - section: callback_ultradns_api_stats
+              key: json_file
+    text_file:
+        description:
+            - Path of a file to write the text report to
+        type: path
+        env:
+            - name: ULTRADNS_API_STATS_TEXT
+        ini:
+            - section: callback_ultradns_api_stats
+              key: text_file
+    top_endpoints:
+        description:
+            - How many of the slowest endpoints to list in the report
+        type: int
+        default: 5
+        env:
+            - name: ULTRADNS_API_STATS_TOP
+        ini:
+            - section: callback_ultradns_api_stats
+              key: top_endpoints
+'''
+
+EXAMPLES = '''
+# ansible.cfg
+# [defaults]
+# callbacks_enabled = ultradns.ultradns.api_stats
+#
+# [callback_ultradns_api_stats]
+# json_file = ./ultradns-api-stats.json
+'''
+
+import json
+
+from ansible.plugins.callback import CallbackBase
+
+# modules whose loops could be replaced by one call of their bulk mode
+BULK_MODULES = {
+    'record': 'rdata',
+    'zone': 'zones',
+    'secondary_zone': 'zones',
+}
+COUNTERS = ('calls', 'cached', 'logins', 'retries', 'bytes_sent', 'bytes_received', 'seconds')
+
+
+def _short_name(action):
+    return action.rsplit('.', 1)[-1]
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'ultradns.ultradns.api_stats'
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self):
+        super().__init__()
+        self.tasks = {}
+        self.endpoints = {}
+        self.page_sizes = {}
+
+    def _task_entry(self, task):
+        key = task._uuid
+        if key not in self.tasks:
+            self.tasks[key] = dict(
+                {'task': task.get_name(), 'module': _short_name(task.action), 'runs': 0, 'bulk_groups': {}},
+                **dict((c, 0) for c in COUNTERS))
+        return self.tasks[key]
+
+    def _add(self, entry, stats, args):
+        entry['runs'] += 1
+        for counter in COUNTERS:
+            entry[counter] += stats.get(counter, 0)
+        for endpoint, data in stats.get('endpoints', {}).items():
+            calls, seconds, slowest = self.endpoints.get(endpoint, (0, 0.0, 0.0))
+            self.endpoints[endpoint] = (calls + data['calls'], seconds + data['seconds'], max(slowest, data['slowest']))
+        self.page_sizes.update(stats.get('page_sizes', {}))
+
+        # remember which runs a bulk call could have combined and what they cost
+        if entry['module'] == 'record':
+            group = (args.get('zone'), args.get('name'), args.get('type'))
+        elif entry['module'] in BULK_MODULES:
+            group = (args.get('account'), args.get('state'))
+        else:
+            return
+        cost = entry['bulk_groups'].setdefault(str(group), [0, 0, 0])
+        cost[0] += 1
+        cost[1] += stats.get('calls', 0)
+        cost[2] += stats.get('logins', 0)
+
+    def _collect(self, result):
+        res = result._result
+        items = res.get('results') if isinstance(res.get('results'), list) else [res]
+        for item in items:
+            if isinstance(item, dict) and isinstance(item.get('api_stats'), dict):
+                args = item.get('invocation', {}).get('module_args', {})
+                self._add(self._task_entry(result._task), item['api_stats'], args)
+
+    def v2_runner_on_ok(self, result):
+        self._collect(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._collect(result)
+
+    @staticmethod
+    def _estimate_saved(entry):
+        # a bulk call logs in once for the whole group. the record module also merges the reads and
+        # writes of every run on the same rrset into one run, the zone modules still need a call per zone.
+        saved = 0
+        for runs, calls, logins in entry['bulk_groups'].values():
+            if runs > 1:
+                saved += max(0, logins - 1)
+                if entry['module'] == 'record':
+                    saved += calls - calls // runs
+        return saved
+
+    def report(self):
+        tasks = []
+        for entry in self.tasks.values():
+            task = dict((k, v) for k, v in entry.items() if k != 'bulk_groups')
+            task['seconds'] = round(task['seconds'], 3)
+            task['bulk_savings'] = self._estimate_saved(entry) if entry['module'] in BULK_MODULES else 0
+            tasks.append(task)
+        tasks.sort(key=lambda t: t['calls'], reverse=True)
+
+        endpoints = list(
+            {'endpoint': k, 'calls': c, 'seconds': round(t, 3), 'average': round(t / c, 3) if c else 0, 'slowest': round(m, 3)}
+            for k, (c, t, m) in self.endpoints.items())
+        for endpoint in endpoints:
+            if endpoint['endpoint'] in self.page_sizes:
+                endpoint['page_size'] = self.page_sizes[endpoint['endpoint']]
+        endpoints.sort(key=lambda e: e['slowest'], reverse=True)
+
+        totals = dict((c, sum(t[c] for t in tasks)) for c in COUNTERS + ('bulk_savings',))
+        totals['seconds'] = round(totals['seconds'], 3)
+        return {'totals': totals, 'tasks': tasks, 'endpoints': endpoints}
+
+    def format_report(self, report):
+        totals = report['totals']
+        lines = [
+            f"UltraDNS API: {totals['calls']} calls, {totals['logins']} logins, {totals['retries']} retries, "
+            f"{totals['bytes_sent']} bytes sent, {totals['bytes_received']} bytes received in {totals['seconds']}s"]
+        if totals['cached']:
+            lines.append(f"{totals['cached']} reads were answered by the UltraDNS proxy without an API call")
+        if totals['bulk_savings']:
+            lines.append(f"Bulk modes could have saved about {totals['bulk_savings']} calls")
+
+        lines.append('')
+        lines.append('Tasks by API calls:')
+        for task in report['tasks']:
+            line = (f"  {task['task']} ({task['module']}): {task['calls']} calls, {task['logins']} logins, "
+                    f"{task['retries']} retries over {task['runs']} runs, {task['seconds']}s")
+            if task['bulk_savings']:
+                line += f", bulk mode saves ~{task['bulk_savings']} calls"
+            lines.append(line)
+
+        lines.append('')
+        lines.append('Slowest endpoints:')
+        for endpoint in report['endpoints'][:self.get_option('top_endpoints')]:
+            line = f"  {endpoint['endpoint']}: slowest {endpoint['slowest']}s, average {endpoint['average']}s over {endpoint['calls']} calls"
+            if 'page_size' in endpoint:
+                line += f", page size {endpoint['page_size']}"
+            lines.append(line)
+        return '\n'.join(lines)
+
+    def v2_playbook_on_stats(self, stats):
+        if not self.tasks:
+            return
+
+        report = self.report()
+        text = self.format_report(report)
+        self._display.banner('ULTRADNS API STATS')
+        self._display.display(text)
+
+        if self.get_option('json_file'):
+            with open(self.get_option('json_file'), 'w') as handle:
+                json.dump(report, handle, indent=2)
+        if self.get_option('text_file'):
+            with open(self.get_option('text_file'), 'w') as handle:
+                handle.write(text + '\n')
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: UltraDNS
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # Journal of completed operations
+    DOCUMENTATION = r'''
+options:
+    journal:
+        description:
+            - Path of a local SQLite file recording the operations that completed.
+            - Operations found in the journal are skipped without calling the API, so a rerun after
+              an interruption resumes with the remaining work.
+            - An operation is identified by the API host and all of its parameters, changing any of
+              them makes it a new operation.
+            - The file is created if missing and can be shared by every task and fork of a play.
+        required: false
+        type: path
+notes:
+    - Skipped operations report C(journal=skipped) and are not changed.
+    - Remove the journal file to make every operation run again.
+'''
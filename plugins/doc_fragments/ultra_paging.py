@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: UltraDNS
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # Paged listing options
+    DOCUMENTATION = r'''
+options:
+    page_size:
+        description:
+            - The number of items requested in the first page of every paged listing.
+            - Later pages grow while responses are fast and full, and shrink when they are slow or large.
+        required: false
+        type: int
+        default: 1000
+    page_timeout:
+        description:
+            - Seconds to wait for a page before requesting it again with half the page size.
+            - The listing fails only when a page of the smallest size times out too.
+        required: false
+        type: int
+        default: 60
+    page_stream_bytes:
+        description:
+            - Pages larger than this many bytes are decoded item by item as they arrive instead of being read whole.
+            - Streaming keeps memory flat for very large pages but decodes more slowly, so by default every page is read whole.
+        required: false
+        type: int
+notes:
+    - The page size each listing settled on is reported under C(api_stats.page_sizes).
+'''
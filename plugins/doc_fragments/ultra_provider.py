@@ -33,10 +33,19 @@ options:
                     - The UltraDNS password. Set the E(ULTRADNS_PASSWORD) environment variable to avoid exposing this in your playbook
                 required: false
                 type: str
+            proxy_socket:
+                description:
+                    - Unix socket of a running UltraDNS proxy daemon to send API requests through.
+                    - The daemon holds the login, so O(provider.username) and O(provider.password) are not needed.
+                    - Set the E(ULTRADNS_PROXY_SOCKET) environment variable to use the proxy for every task.
+                required: false
+                type: path
 requirements:
     - python requests (https://pypi.org/project/requests/)
 notes:
     - "This module must be run locally which can be achieved by specifying C(connection: local)"
     - Refer to the L(UltraDNS API documentation,https://docs.ultradns.com/submenu.html) for more information.
+    - The result includes an C(api_stats) dictionary counting the API calls, logins, retries and bytes of the task,
+      which the P(ultradns.ultradns.api_stats#callback) callback plugin aggregates across a playbook.
 
 '''
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: UltraDNS
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # Several accounts in one task
+    DOCUMENTATION = r'''
+options:
+    providers:
+        description:
+            - Connection information for several UltraDNS accounts, worked on in parallel.
+            - When set, O(provider) is ignored and the results of all accounts are combined.
+            - Each entry takes the same options as O(provider).
+            - The accounts share the O(max_workers) budget, so the total number of requests in flight does not grow.
+        required: false
+        type: list
+        elements: dict
+notes:
+    - Logged in connections are pooled per host and username and reused for later calls in the same process,
+      for example by lookups and by the accounts of O(providers).
+'''
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: UltraDNS
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # Local snapshot of zones and records
+    DOCUMENTATION = r'''
+options:
+    snapshot:
+        description:
+            - Path of a local SQLite file holding a snapshot of the account's zones and RRSets.
+            - Reads are answered from the snapshot with SQL, and the snapshot is filled from the API when it is missing or stale.
+            - The file is created if missing and can be shared by every task and fork of a play, and by later plays.
+        required: false
+        type: path
+    snapshot_max_age:
+        description:
+            - Seconds the snapshot is used without asking the API whether it is still current.
+            - Once older, the zone list is read again, while the RRSets of a zone are only read again
+              when the zone's SOA serial changed.
+        required: false
+        type: int
+        default: 300
+notes:
+    - A snapshot file holds the zones of one account, use a separate file for every account.
+    - Remove the snapshot file to read everything from the API again.
+'''
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: UltraDNS
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+name: rrset
+author: UltraDNS (@ultradns)
+short_description: Look up the rdata of records in UltraDNS
+description:
+    - Returns the rdata values of the rrsets matching the given owner names and record type.
+    - All names that belong to the same zone are answered from one paginated read of the zone's rrsets.
+    - Zone reads are cached in files on the controller, so later lookups in the play, including those of other tasks and hosts,
+      do not call the API again until O(cache_ttl) expires.
+version_added: 1.2.0
+options:
+    _terms:
+        description:
+            - Owner names to look up, either fully qualified or relative to O(zone)
+        required: true
+        type: list
+        elements: str
+    type:
+        description:
+            - The record type by common name
+        type: str
+        default: A
+        choices: ['A', 'AAAA', 'CNAME', 'TXT', 'MX', 'NS', 'CAA', 'HTTPS', 'SVCB', 'PTR', 'SOA', 'SRV', 'SSHFP']
+    zone:
+        description:
+            - The zone containing the records
+            - If not set, the zone is the longest zone in the account that the name belongs to
+        type: str
+    cache_ttl:
+        description:
+            - How long in seconds a zone read is reused by later lookups
+            - V(0) disables the cache
+        type: int
+        default: 300
+    username:
+        description:
+            - The UltraDNS username
+        type: str
+        env:
+            - name: ULTRADNS_USERNAME
+    password:
+        description:
+            - The UltraDNS password
+        type: str
+        env:
+            - name: ULTRADNS_PASSWORD
+    use_test:
+        description:
+            - Whether to use the test API endpoint
+        type: bool
+        default: false
+        env:
+            - name: ULTRADNS_USE_TEST
+    proxy_socket:
+        description:
+            - Unix socket of a running UltraDNS proxy daemon to send API requests through
+            - The daemon holds the login, so O(username) and O(password) are not needed
+        type: path
+        env:
+            - name: ULTRADNS_PROXY_SOCKET
+notes:
+    - Names that do not exist return no values rather than failing the lookup.
+    - The cache files are kept per account in C(udns-ansible-lookup-cache-<uid>) under the system temporary directory,
+      readable only by the user running the play.
+    - The cache is not used when that directory or a file in it is not owned by the user running the play or is accessible to others.
+'''
+
+EXAMPLES = '''
+- name: Show the addresses of www.example.com
+  ansible.builtin.debug:
+    msg: "{{ lookup('ultradns.ultradns.rrset', 'www.example.com', type='A') }}"
+
+- name: Look up several names of one zone with a single API read
+  ansible.builtin.debug:
+    msg: "{{ query('ultradns.ultradns.rrset', 'www', 'mail', 'api', zone='example.com.', type='A') }}"
+
+- name: Use the MX records of a zone in a template variable
+  ansible.builtin.set_fact:
+    mail_exchangers: "{{ query('ultradns.ultradns.rrset', 'example.com', type='MX') }}"
+'''
+
+RETURN = '''
+_raw:
+    description: The rdata values of every matching rrset
+    type: list
+    elements: str
+'''
+
+import hashlib
+import os
+import stat
+import tempfile
+import time
+
+from ansible.errors import AnsibleLookupError
+from ansible.plugins.lookup import LookupBase
+from ansible_collections.ultradns.ultradns.plugins.module_utils import codec
+from ansible_collections.ultradns.ultradns.plugins.module_utils.dns import fqdn
+from ansible_collections.ultradns.ultradns.plugins.module_utils.models import RRSet, rrtype_code
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+# lookups run in a worker fork per task, so zone reads and zone lists are shared through files.
+# the directory is per user and only trusted while it and its files belong to that user alone
+CACHE_DIR = os.path.join(tempfile.gettempdir(), f'udns-ansible-lookup-cache-{os.getuid()}')
+
+
+def _private(info, kind):
+    return kind(info.st_mode) and info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+
+def _cache_dir():
+    """The cache directory, or None when it cannot be trusted and the cache is not used."""
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        info = os.lstat(CACHE_DIR)
+    except OSError:
+        return None
+    return CACHE_DIR if _private(info, stat.S_ISDIR) else None
+
+
+def _read(path):
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0))
+    with os.fdopen(fd, 'rb') as handle:
+        if not _private(os.fstat(fd), stat.S_ISREG):
+            raise ValueError(f'{path} is not private to this user')
+        return handle.read()
+
+
+class LookupModule(LookupBase):
+
+    def _cached(self, key, ttl, load):
+        directory = _cache_dir() if ttl else None
+        if directory is None:
+            return load()
+
+        path = os.path.join(directory, hashlib.sha256(codec.dumps(key).encode('utf-8')).hexdigest())
+        try:
+            stored, value = codec.loads(_read(path))
+            if 0 <= time.time() - stored < ttl:
+                return value
+        except (OSError, ValueError, TypeError):
+            pass
+
+        value = load()
+        # written to a private temporary file and renamed, so readers never see half a zone
+        try:
+            fd, temp = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(codec.dumps([time.time(), value]).encode('utf-8'))
+            os.replace(temp, path)
+        except OSError:
+            pass
+        return value
+
+    def _api(self, **params):
+        params['provider'] = {
+            'username': self.get_option('username'),
+            'password': self.get_option('password'),
+            'use_test': self.get_option('use_test'),
+            'proxy_socket': self.get_option('proxy_socket')}
+        return UltraDNSModule(params)
+
+    def _zone_names(self, account_key, ttl):
+        def load():
+            zones, result = self._api().get_zones()
+            if result['failed']:
+                raise AnsibleLookupError(f"Unable to list zones: {result['msg']}")
+            return list(fqdn(z['properties']['name']) for z in zones)
+
+        return self._cached(account_key + ('zones',), ttl, load)
+
+    def _zone_index(self, account_key, zone, ttl):
+        def load():
+            records, result = self._api(zone=zone).get_records()
+            if result['failed']:
+                raise AnsibleLookupError(f"Unable to read rrsets of {zone}: {result['msg']}")
+            # keep only the owner, type code and rdata of every rrset for the rest of the play
+            return list([rrset.owner, rrset.rrtype, rrset.rdata] for rrset in map(RRSet.from_api, records))
+
+        return dict(((owner, rrtype), rdata) for owner, rrtype, rdata in self._cached(account_key + ('zone', zone), ttl, load))
+
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+        rrtype = rrtype_code(self.get_option('type'))
+        ttl = self.get_option('cache_ttl')
+        zone = fqdn(self.get_option('zone')) if self.get_option('zone') else None
+        account_key = (self.get_option('use_test'), self.get_option('username'), self.get_option('proxy_socket'))
+
+        # work out the owner and zone of every term first so each zone is read only once
+        wanted = []
+        for term in terms:
+            if zone:
+                owner = fqdn(term)
+                if owner != zone and not owner.endswith(f'.{zone}'):
+                    owner = fqdn(f'{term}.{zone}')
+                wanted.append((owner, zone))
+                continue
+
+            owner = fqdn(term)
+            matches = list(z for z in self._zone_names(account_key, ttl) if owner == z or owner.endswith(f'.{z}'))
+            if not matches:
+                raise AnsibleLookupError(f"No zone in the account contains {owner}")
+            wanted.append((owner, max(matches, key=len)))
+
+        indexes = {}
+        for owner_zone in dict.fromkeys(z for _, z in wanted):
+            indexes[owner_zone] = self._zone_index(account_key, owner_zone, ttl)
+
+        values = []
+        for owner, owner_zone in wanted:
+            values.extend(indexes[owner_zone].get((owner, rrtype), []))
+        return values
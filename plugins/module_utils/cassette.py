@@ -0,0 +1,131 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+import atexit
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+
+from . import codec
+from .concurrency import file_lock
+
+CASSETTE_ENV = 'ULTRADNS_CASSETTE'
+MODE_ENV = 'ULTRADNS_CASSETTE_MODE'
+LATENCY_ENV = 'ULTRADNS_CASSETTE_LATENCY'
+MODES = ('record', 'replay')
+
+
+def replaying():
+    """Whether the environment selects a cassette to replay, so no API access or credentials are needed."""
+    return bool(os.environ.get(CASSETTE_ENV)) and (os.environ.get(MODE_ENV) or 'replay') == 'replay'
+
+
+def _canonical(value):
+    # bodies arrive as dicts from some callers and as JSON text from others
+    if isinstance(value, (str, bytes)):
+        try:
+            value = codec.loads(value)
+        except ValueError:
+            return value if isinstance(value, str) else value.decode('utf-8', 'replace')
+    return json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+
+def _key(method, uri, params, body):
+    return method.upper(), uri, _canonical(params or None), _canonical(body)
+
+
+def _encode(result):
+    # zone exports come back as zip bytes, which JSON cannot hold
+    if isinstance(result, bytes):
+        return {'__bytes__': base64.b64encode(result).decode('ascii')}
+    return result
+
+
+def _decode(result):
+    if isinstance(result, dict) and set(result) == {'__bytes__'}:
+        return base64.b64decode(result['__bytes__'])
+    return result
+
+
+class Cassette:
+    """
+    API requests and responses kept in a gzip compressed JSON lines file, for testing offline.
+
+    In record mode every request made through the connection is appended with its response
+    and how long it took. Entries are buffered and written as one gzip member per flush, under
+    a lock, so forks recording into the same cassette do not interleave. In replay mode no
+    request leaves the controller: responses are served in the order they were recorded for the
+    same method, URI, parameters and body, the last one repeating once they run out, so polling
+    loops replay as recorded. Each response is delayed by its recorded time scaled by latency.
+    """
+    def __init__(self, path, mode='replay', latency=0.0, flush_every=1000):
+        if mode not in MODES:
+            raise ValueError(f"Cassette mode must be one of {', '.join(MODES)}, not {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.flush_every = flush_every
+        self.lock = threading.Lock()
+        self.pending = []
+        self.responses = {}
+        if mode == 'replay':
+            self._load()
+        else:
+            atexit.register(self.flush)
+
+    @classmethod
+    def from_env(cls):
+        """The cassette named by ULTRADNS_CASSETTE, or None when it is not set."""
+        path = os.environ.get(CASSETTE_ENV)
+        if not path:
+            return None
+        return cls(path, 'replay' if replaying() else os.environ.get(MODE_ENV), float(os.environ.get(LATENCY_ENV) or 0))
+
+    @property
+    def replaying(self):
+        return self.mode == 'replay'
+
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as handle:
+            for line in handle:
+                if line.strip():
+                    entry = codec.loads(line)
+                    key = _key(entry['method'], entry['uri'], entry.get('params'), entry.get('body'))
+                    self.responses.setdefault(key, []).append((entry['response'], entry.get('seconds', 0.0)))
+        self.position = dict((key, 0) for key in self.responses)
+
+    def play(self, method, uri, params=None, body=None):
+        """The next recorded response to a request, or an API style error if it was never recorded."""
+        key = _key(method, uri, params, body)
+        with self.lock:
+            recorded = self.responses.get(key)
+            if not recorded:
+                return {'errorCode': 404, 'statusCode': 404,
+                        'errorMessage': f'No response to {method.upper()} {uri} in cassette {self.path}'}
+            index = self.position[key]
+            self.position[key] = min(index + 1, len(recorded) - 1)
+        response, seconds = recorded[index]
+        if self.latency and seconds:
+            time.sleep(seconds * self.latency)
+        return _decode(response)
+
+    def record(self, method, uri, params, body, response, seconds):
+        entry = {'method': method.upper(), 'uri': uri, 'params': params or None, 'body': body,
+                 'response': _encode(response), 'seconds': round(seconds, 4)}
+        with self.lock:
+            self.pending.append(codec.dumps(entry))
+            due = len(self.pending) >= self.flush_every
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            lines, self.pending = self.pending, []
+        if not lines:
+            return
+        data = gzip.compress(('\n'.join(lines) + '\n').encode('utf-8'))
+        with file_lock(f'cassette|{os.path.abspath(self.path)}'):
+            with open(self.path, 'ab') as handle:
+                handle.write(data)
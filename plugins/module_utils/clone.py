@@ -0,0 +1,67 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from .models import _fqdn, rrtype_code
+
+SOA = rrtype_code('SOA')
+NS = rrtype_code('NS')
+# record types whose rdata holds domain names, which may point inside the source zone
+NAME_TYPES = frozenset(rrtype_code(t) for t in ('CNAME', 'MX', 'NS', 'PTR', 'SRV', 'HTTPS', 'SVCB'))
+
+
+def rename(name, source, target):
+    """
+    A name of the source zone moved to the target zone, or the name unchanged if it is outside the source.
+
+    Args:
+        name: An FQDN
+        source: The source apex, lowercase with a trailing dot
+        target: The target apex, lowercase with a trailing dot
+    """
+    lower = name.lower()
+    if lower == source:
+        return target
+    if lower.endswith(f'.{source}'):
+        return name[:len(name) - len(source)] + target
+    return name
+
+
+def _rewrite_rdata(value, source, target):
+    # names are whole whitespace separated fields, e.g. the exchange of "10 mail.example.com."
+    return ' '.join(rename(field, source, target) if field.endswith('.') else field for field in value.split(' '))
+
+
+def clone_operations(rrsets, source, target, rewrite_rdata=True):
+    """
+    The API operations creating copies of the source zone's RRSets in the target zone.
+
+    The SOA and the NS RRSet at the apex are left out, the target zone gets its own when it
+    is created. The operations only depend on the RRSets read from the source, so they are
+    computed in memory once per target without reading the source again.
+
+    Args:
+        rrsets: The RRSet models of the source zone
+        source: The source zone name
+        target: The target zone name
+        rewrite_rdata: Also move names inside the source zone found in the rdata of CNAME, MX, NS,
+            PTR, SRV, HTTPS and SVCB RRSets to the target zone
+
+    Returns:
+        A list of [method, path, body] operations
+    """
+    source, target = _fqdn(source), _fqdn(target)
+    operations = []
+    for rrset in rrsets:
+        if rrset.rrtype == SOA or (rrset.rrtype == NS and rrset.owner == source):
+            continue
+        owner = rename(rrset.owner, source, target)
+        rdata = list(rrset.rdata)
+        if rewrite_rdata and rrset.rrtype in NAME_TYPES:
+            rdata = list(_rewrite_rdata(value, source, target) for value in rdata)
+        body = {'rdata': rdata}
+        if rrset.ttl is not None:
+            body['ttl'] = rrset.ttl
+        if rrset.pool is not None:
+            body['profile'] = rrset.pool.as_dict()
+        operations.append(['POST', f'/zones/{target}/rrsets/{rrset.type_name}/{owner}', body])
+    return operations
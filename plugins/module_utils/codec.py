@@ -0,0 +1,134 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+import codecs
+import json
+
+# use the fastest JSON library available, the stdlib is always there as a fallback
+try:
+    import orjson
+    CODEC = 'orjson'
+except ImportError:
+    orjson = None
+    try:
+        import ujson
+        CODEC = 'ujson'
+    except ImportError:
+        ujson = None
+        CODEC = 'json'
+
+_decoder = json.JSONDecoder()
+WHITESPACE = ' \t\n\r'
+
+
+def loads(data):
+    """Decode a JSON document from bytes or str. Raises ValueError on malformed input."""
+    if CODEC == 'orjson':
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    if CODEC == 'ujson':
+        return ujson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """Encode obj as compact JSON text."""
+    if CODEC == 'orjson':
+        return orjson.dumps(obj).decode('utf-8')
+    if CODEC == 'ujson':
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+    return json.dumps(obj, separators=(',', ':'))
+
+
+class _Buffer:
+    """Text decoded from a stream of byte chunks, read from the front and refilled on demand."""
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        # drop what has been consumed before appending, so the buffer stays around one chunk long
+        chunk = next(self.chunks, None)
+        self.text = self.text[self.pos:] + (self.decoder.decode(chunk) if chunk is not None else self.decoder.decode(b'', True))
+        self.pos = 0
+        self.eof = chunk is None
+        return not self.eof
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text) or not self.fill():
+                return self.text[self.pos] if self.pos < len(self.text) else ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f'Expected {char!r} in JSON stream')
+        self.pos += 1
+
+    def value(self):
+        # a value may be split across chunks, keep reading until it decodes or the stream ends
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except ValueError:
+                if not self.fill():
+                    raise
+                continue
+            # a number at the very end of the buffer may still continue in the next chunk
+            if end == len(self.text) and not self.eof and isinstance(value, (int, float)):
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+    def rest(self):
+        while self.fill():
+            pass
+        return self.text[self.pos:]
+
+
+def iter_array(chunks, key, meta):
+    """
+    Yield the items of the top-level array C(key) of a JSON object read from byte chunks.
+
+    Items are decoded one at a time as the chunks arrive, so the page is never held as a
+    whole. Every other top-level member is stored in meta once it has been read, which for
+    members after the array means once the iteration is complete. A document that is not
+    an object yields nothing and is stored whole under meta['_body'].
+    """
+    buf = _Buffer(chunks)
+    if buf.peek() != '{':
+        meta['_body'] = loads(buf.rest()) if buf.peek() else {}
+        return
+
+    buf.expect('{')
+    if buf.peek() == '}':
+        return
+    while True:
+        name = buf.value()
+        buf.expect(':')
+        if name == key and buf.peek() == '[':
+            buf.expect('[')
+            if buf.peek() == ']':
+                buf.pos += 1
+            else:
+                while True:
+                    yield buf.value()
+                    if buf.peek() == ',':
+                        buf.pos += 1
+                        continue
+                    buf.expect(']')
+                    break
+        else:
+            meta[name] = buf.value()
+
+        if buf.peek() == ',':
+            buf.pos += 1
+            continue
+        buf.expect('}')
+        return
@@ -0,0 +1,291 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+import hashlib
+import os
+import random
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+DEFAULT_WORKERS = 8
+# lock files are per user, another user can neither hold nor replace them
+LOCK_DIR = os.path.join(tempfile.gettempdir(), f"udns-ansible-locks-{os.getuid() if hasattr(os, 'getuid') else 'user'}")
+# name -> [lock, number of holders and waiters], dropped when the last one leaves
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+class LockError(Exception):
+    """Raised by file_lock when the lock directory is not private to the current user."""
+
+
+def run_parallel(func, items, max_workers=DEFAULT_WORKERS):
+    """
+    Call func once for every item using a bounded pool of worker threads.
+
+    Results are returned in the same order as items. With a single worker (or a
+    single item) the calls are made inline without starting a thread pool.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    workers = max(1, min(max_workers or 1, len(items)))
+    if workers == 1:
+        return list(func(item) for item in items)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items))
+
+
+def run_streaming(func, items, max_workers=DEFAULT_WORKERS, stop=None, ordered=False):
+    """
+    Call func for every item of a possibly lazy iterable, yielding results as they complete.
+
+    At most max_workers calls are in flight and items are only pulled from the
+    iterable when a worker is free, so a long or paged source is never read ahead.
+    No new items are started once the optional stop event is set. With ordered,
+    results are yielded in input order instead, holding back at most max_workers
+    finished results.
+
+    Yields:
+        (item, result, error) tuples, error being None or the exception func raised
+    """
+    items = iter(items)
+    workers = max(1, max_workers or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while True:
+            while len(running) < workers and not (stop is not None and stop.is_set()):
+                item = next(items, StopIteration)
+                if item is StopIteration:
+                    break
+                running[pool.submit(func, item)] = item
+            if not running:
+                return
+
+            if ordered:
+                done = [next(iter(running))]
+                wait(done)
+            else:
+                done = wait(running, return_when=FIRST_COMPLETED)[0]
+            for future in done:
+                error = future.exception()
+                yield running.pop(future), None if error else future.result(), error
+
+
+def _lock_dir():
+    os.makedirs(LOCK_DIR, mode=0o700, exist_ok=True)
+    info = os.lstat(LOCK_DIR)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise LockError(f'{LOCK_DIR} must be a directory owned by the current user with mode 0700')
+    return LOCK_DIR
+
+
+@contextmanager
+def file_lock(name):
+    """
+    Hold an exclusive lock on name for the duration of the block.
+
+    The lock is shared by every thread and process of the current user on this controller,
+    so parallel forks working on the same object take turns instead of overwriting each other.
+    Platforms without fcntl only serialize threads within the current process.
+
+    Raises:
+        LockError: The lock directory is not private to the current user
+    """
+    with _thread_locks_guard:
+        entry = _thread_locks.setdefault(name, [threading.Lock(), 0])
+        entry[1] += 1
+
+    try:
+        with entry[0]:
+            if not HAS_FCNTL:
+                yield
+                return
+
+            digest = hashlib.sha1(name.encode('utf-8')).hexdigest()
+            fd = os.open(os.path.join(_lock_dir(), f'{digest}.lock'), os.O_RDWR | os.O_CREAT | getattr(os, 'O_NOFOLLOW', 0), 0o600)
+            with os.fdopen(fd, 'a') as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+    finally:
+        with _thread_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _thread_locks[name]
+
+
+class Backoff:
+    """
+    Exponential backoff with jitter, bounded by an optional overall deadline.
+
+    Callers that make progress between waits should call reset() so the next
+    wait starts from the initial delay again; idle rounds grow the delay up to
+    the maximum.
+    """
+    def __init__(self, initial=1.0, maximum=30.0, factor=2.0, timeout=None):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.delay = initial
+
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def reset(self):
+        self.delay = self.initial
+
+    def wait(self):
+        """Sleep for the next delay. Returns False without sleeping once the deadline has passed."""
+        if self.expired():
+            return False
+
+        delay = self.delay * random.uniform(0.5, 1.0)
+        if self.deadline is not None:
+            delay = min(delay, max(0.0, self.deadline - time.monotonic()))
+        time.sleep(delay)
+        self.delay = min(self.delay * self.factor, self.maximum)
+        return True
+
+
+class TaskPoller:
+    """
+    Track many UltraDNS background tasks with a single polling loop.
+
+    Each round lists the account's tasks once and only falls back to fetching a
+    task individually when it is missing from the listing, so the number of
+    requests per round does not grow with the number of tracked tasks.
+    """
+    PENDING = ('PENDING', 'IN_PROCESS')
+
+    def __init__(self, connection, backoff=None):
+        self.connection = connection
+        self.backoff = backoff or Backoff(initial=1.0, maximum=15.0, timeout=300)
+        self.tasks = {}
+
+    def add(self, key, task_id):
+        self.tasks[key] = task_id
+
+    def _poll(self, pending):
+        listing = self.connection.get('/tasks')
+        found = {}
+        if isinstance(listing, dict) and isinstance(listing.get('tasks'), list):
+            found = dict((t.get('taskId'), t) for t in listing['tasks'] if isinstance(t, dict))
+
+        statuses = {}
+        for key, task_id in pending.items():
+            task = found.get(task_id)
+            if task is None:
+                task = self.connection.get(f"/tasks/{task_id}")
+            statuses[key] = task
+        return statuses
+
+    def run(self):
+        """
+        Poll until every task has finished or the backoff deadline passes.
+
+        Returns:
+            A dictionary keyed like add() with the last task status seen for each task.
+            Tasks still running at the deadline keep their last pending status.
+        """
+        results = {}
+        pending = dict(self.tasks)
+        while pending:
+            before = len(pending)
+            for key, task in self._poll(pending).items():
+                results[key] = task
+                if not isinstance(task, dict) or 'errorCode' in task or task.get('code') not in self.PENDING:
+                    del pending[key]
+
+            # go back to the short delay whenever a task finished this round
+            if len(pending) < before:
+                self.backoff.reset()
+            if pending and not self.backoff.wait():
+                break
+        return results
+
+
+class PageSizer:
+    """
+    Choose the page size of a paged listing from how the previous pages went.
+
+    Pages that take longer than twice the target latency, or whose payload would exceed
+    max_bytes, halve the size; full pages returned in under half the target double it up
+    to the maximum. A timed out page shrinks the size so the page can be requested again.
+    """
+    def __init__(self, size=1000, minimum=50, maximum=5000, target=2.0, max_bytes=4 * 1024 * 1024):
+        self.minimum = min(minimum, size)
+        self.maximum = max(maximum, size)
+        self.size = size
+        self.worked = None
+        self.target = target
+        self.max_bytes = max_bytes
+
+    def observe(self, seconds, count, received=0):
+        self.worked = max(self.worked or 0, self.size)
+        if seconds > self.target * 2:
+            self.size = max(self.minimum, self.size // 2)
+        elif seconds < self.target / 2 and count >= self.size:
+            self.size = min(self.maximum, self.size * 2)
+        if received and count:
+            # keep pages under the payload cap whatever the latency
+            self.size = max(self.minimum, min(self.size, int(self.max_bytes * count / received)))
+        return self.size
+
+    def shrink(self):
+        """Halve the size after a timeout. Returns False if it is already at the minimum."""
+        if self.size <= self.minimum:
+            return False
+        self.size = max(self.minimum, self.size // 2)
+        return True
+
+    def reject(self):
+        """The API refused a size the pager grew to. Returns False unless a smaller size worked before."""
+        if not self.worked or self.size <= self.worked:
+            return False
+        self.maximum = self.size = self.worked
+        return True
+
+
+class RateLimiter:
+    """
+    Token bucket shared by threads: rate requests per second on average, bursts up to burst.
+
+    acquire() blocks until a token is available, so callers are spread out evenly once
+    the burst is used up instead of hitting the API's rate limit and retrying.
+    """
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst or max(1, rate))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping as needed. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
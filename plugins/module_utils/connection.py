@@ -1,6 +1,10 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
-import json
+import re
+import threading
+import time
+from . import codec
+from .cassette import Cassette
 
 VERSION = "1.1.0"
 PREFIX = "udns-ansible-"
@@ -21,19 +25,26 @@ class MockRestApiConnection:
     def auth(self, username, password):
         pass
 
+    # requests go through _do_call like in the SDK, so a replayed cassette can answer them
     def get(self, uri, params=None):
-        return {}
+        return self._do_call(uri, 'GET', params=params)
 
     def post(self, uri, body=None):
-        return {}
+        return self._do_call(uri, 'POST', body=body)
+
+    def post_multi_part(self, uri, files):
+        return self._do_call(uri, 'POST', files=files)
 
     def put(self, uri, body):
-        return {}
+        return self._do_call(uri, 'PUT', body=body)
 
     def patch(self, uri, body):
-        return {}
+        return self._do_call(uri, 'PATCH', body=body)
 
     def delete(self, uri):
+        return self._do_call(uri, 'DELETE')
+
+    def _do_call(self, uri, method, params=None, body=None, retry=True, files=None, content_type='application/json'):
         return {}
 
 
@@ -44,6 +55,7 @@ HAS_SDK = False
 
 # Try to import the real implementations
 try:
+    import requests
     from ultra_rest_client import RestApiConnection, AuthError as UltraAuthError
     HAS_SDK = True
 except ImportError:
@@ -51,10 +63,161 @@ except ImportError:
     pass
 
 
+# collapse names and IDs in request paths so calls to the same endpoint are counted together
+ENDPOINT_PATTERNS = [
+    (re.compile(r'(/zones/)[^/]+'), r'\1{zone}'),
+    (re.compile(r'(/rrsets/[^/]+/)[^/]+'), r'\1{owner}'),
+    (re.compile(r'(/tasks/)[^/]+'), r'\1{task}'),
+]
+
+
+class ApiStats:
+    """Counters for the API traffic of one connection, safe to update from worker threads"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.logins = 0
+        self.retries = 0
+        self.cached = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.seconds = 0.0
+        self.endpoints = {}
+        self.page_sizes = {}
+
+    @staticmethod
+    def endpoint(method, uri):
+        path = uri.split('?', 1)[0]
+        for pattern, repl in ENDPOINT_PATTERNS:
+            path = pattern.sub(repl, path)
+        return f'{method} {path}'
+
+    def add_call(self, method, uri, seconds, sent=0, received=0, retry=False):
+        key = self.endpoint(method, uri)
+        with self.lock:
+            self.calls += 1
+            self.retries += 1 if retry else 0
+            self.bytes_sent += sent
+            self.bytes_received += received
+            self.seconds += seconds
+            count, total, slowest = self.endpoints.get(key, (0, 0.0, 0.0))
+            self.endpoints[key] = (count + 1, total + seconds, max(slowest, seconds))
+
+    def set_page_size(self, method, uri, size):
+        # the page size a paged listing settled on, per endpoint
+        with self.lock:
+            self.page_sizes[self.endpoint(method, uri)] = size
+
+    def add_cached(self):
+        # a GET the proxy answered from its cache or from an identical request in flight
+        with self.lock:
+            self.cached += 1
+
+    def add_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def add_login(self, seconds):
+        with self.lock:
+            self.logins += 1
+            self.seconds += seconds
+
+    @classmethod
+    def combine(cls, stats):
+        """The sum of several connections' statistics, e.g. one per account."""
+        if len(stats) == 1:
+            return stats[0]
+        total = cls()
+        for item in stats:
+            with item.lock:
+                for name in ('calls', 'logins', 'retries', 'cached', 'bytes_sent', 'bytes_received', 'seconds'):
+                    setattr(total, name, getattr(total, name) + getattr(item, name))
+                for key, (count, seconds, slowest) in item.endpoints.items():
+                    c, t, m = total.endpoints.get(key, (0, 0.0, 0.0))
+                    total.endpoints[key] = (c + count, t + seconds, max(m, slowest))
+                total.page_sizes.update(item.page_sizes)
+        return total
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                'calls': self.calls,
+                'logins': self.logins,
+                'retries': self.retries,
+                'cached': self.cached,
+                'bytes_sent': self.bytes_sent,
+                'bytes_received': self.bytes_received,
+                'seconds': round(self.seconds, 3),
+                'endpoints': dict(
+                    (k, {'calls': c, 'seconds': round(t, 3), 'slowest': round(m, 3)})
+                    for k, (c, t, m) in self.endpoints.items()),
+                'page_sizes': dict(self.page_sizes)}
+
+
+def _size(payload):
+    if payload is None:
+        return 0
+    if isinstance(payload, (bytes, str)):
+        return len(payload)
+    try:
+        return len(codec.dumps(payload))
+    except (TypeError, ValueError):
+        return 0
+
+
 class UltraConnection(RestApiConnection):
     def __init__(self, host='api.ultradns.com'):
         custom_headers = {'User-Agent': f'{PREFIX}{VERSION}'}
         super().__init__(host=host, custom_headers=custom_headers)
+        self.base_url = host if host.startswith(('http://', 'https://')) else f'https://{host}'
+        self.stats = ApiStats()
+        # seconds to wait for a GET response before raising TimeoutError, None waits forever
+        self.read_timeout = None
+        # pages larger than this many bytes are decoded item by item as they arrive, None reads every page whole
+        self.stream_threshold = None
+        # GETs are sent on their own session, which keeps connections alive between calls, so their
+        # bodies reach the codec undecoded; every other request goes through the SDK
+        self.session = None
+        if HAS_SDK:
+            self.session = requests.Session()
+            self.session.headers.update({'Accept': 'application/json', **custom_headers})
+        # recording or replaying API traffic for offline tests, see ULTRADNS_CASSETTE
+        self.cassette = Cassette.from_env()
+
+    @property
+    def replaying(self):
+        return self.cassette is not None and self.cassette.replaying
+
+    def auth(self, username, password):
+        if self.replaying:
+            return None
+        start = time.monotonic()
+        try:
+            return super().auth(username, password)
+        finally:
+            self.stats.add_login(time.monotonic() - start)
+
+    def _refresh(self):
+        if self.replaying:
+            return None
+        start = time.monotonic()
+        try:
+            return super()._refresh()
+        finally:
+            self.stats.add_login(time.monotonic() - start)
+
+    def _do_call(self, uri, method, params=None, body=None, retry=True, files=None, content_type='application/json'):
+        # every SDK request funnels through here, including its own retries which pass retry=False
+        start = time.monotonic()
+        if self.replaying:
+            result = self.cassette.play(method, uri, params, body)
+        else:
+            result = super()._do_call(uri, method, params=params, body=body, retry=retry, files=files, content_type=content_type)
+        self.stats.add_call(method, uri, time.monotonic() - start, _size(body), _size(result), retry=not retry)
+        # only the outer call is recorded, with the response the SDK settled on after its own retries
+        if self.cassette is not None and not self.replaying and retry:
+            self.cassette.record(method, uri, params, body, result, time.monotonic() - start)
+        return result
 
     def _authenticate(self, **kwargs):
         if not HAS_SDK:
@@ -67,26 +230,148 @@ class UltraConnection(RestApiConnection):
         else:
             raise UltraAuthError('Missing authentication credentials')
 
+    def set_proxy(self, proxy):
+        super().set_proxy(proxy)
+        if self.session is not None:
+            self.session.proxies = dict(proxy or {})
+
+    def _get_json(self, uri, params=None, retry=True, stream=False, meta=None):
+        # GETs skip the SDK so response bodies are decoded by the fast codec, or not at all when streamed
+        start = time.monotonic()
+        try:
+            response = self.session.get(
+                self.base_url + uri,
+                params=params,
+                headers={'Authorization': f'Bearer {self.access_token}'},
+                stream=stream,
+                timeout=self.read_timeout)
+            body = None if stream else response.content
+        except requests.exceptions.Timeout as exc:
+            self.stats.add_call('GET', uri, time.monotonic() - start, retry=not retry)
+            raise TimeoutError(f'GET {uri} timed out') from exc
+        elapsed = time.monotonic() - start
+
+        if response.status_code == requests.codes.TOO_MANY:
+            response.close()
+            self.stats.add_call('GET', uri, elapsed, retry=not retry)
+            time.sleep(1)
+            return self._get_json(uri, params, False, stream, meta)
+
+        # only pages above the threshold, or of unknown length, are worth decoding item by item
+        content_type = response.headers.get('content-type', 'none')
+        length = response.headers.get('content-length')
+        if stream and response.status_code == requests.codes.OK and 'json' in content_type and \
+                (length is None or int(length) > self.stream_threshold):
+            return response
+
+        body = response.content if body is None else body
+        self.stats.add_call('GET', uri, time.monotonic() - start, received=len(body), retry=not retry)
+        if meta is not None:
+            meta['_received'] = len(body)
+        if response.status_code == requests.codes.NO_CONTENT:
+            return {}
+        if content_type == 'text/plain':
+            return response.text
+        if content_type == 'application/zip':
+            return body
+        try:
+            result = codec.loads(body)
+        except ValueError:
+            result = {}
+
+        if isinstance(result, dict) and retry and result.get('errorCode') == 60001:
+            self._refresh()
+            return self._get_json(uri, params, False, stream, meta)
+        return result
+
     def get(self, uri, params=None):
-        result = super().get(uri, params)
+        if not HAS_SDK or self.replaying:
+            return self._ensure_response_format(super().get(uri, params))
+        if self.cassette is None:
+            return self._ensure_response_format(self._get_json(uri, params))
+
+        start = time.monotonic()
+        result = self._get_json(uri, params)
+        self.cassette.record('GET', uri, params, None, result, time.monotonic() - start)
         return self._ensure_response_format(result)
 
+    def stream(self, uri, key, meta):
+        """
+        Yield the items of the top-level array C(key) of a GET response.
+
+        The other members of the response, e.g. C(resultInfo) or C(cursorInfo), are put into meta,
+        along with C(errorCode) and C(errorMessage) for an error response, once the items have been
+        consumed. Pages are read and decoded whole, which is fastest for pages of ordinary size.
+        With stream_threshold set, larger pages are decoded item by item as they are received.
+        """
+        # cassettes hold whole responses, so recorded and replayed pages are not streamed
+        if self.cassette is not None:
+            response = self.get(uri)
+        elif HAS_SDK:
+            response = self._get_json(uri, stream=self.stream_threshold is not None, meta=meta)
+        else:
+            response = super().get(uri)
+        if not hasattr(response, 'iter_content'):
+            result = self._ensure_response_format(response)
+            if isinstance(result, dict):
+                meta.update(result)
+                yield from result.pop(key, None) or []
+            return
+
+        start, received = time.monotonic(), [0]
+
+        def chunks():
+            try:
+                for chunk in response.iter_content(65536):
+                    received[0] += len(chunk)
+                    yield chunk
+            except requests.exceptions.ConnectionError as exc:
+                # a read timeout in the middle of the body surfaces as a connection error
+                if 'timed out' in str(exc):
+                    raise TimeoutError(f'GET {uri} timed out') from exc
+                raise
+
+        try:
+            with response:
+                yield from codec.iter_array(chunks(), key, meta)
+        finally:
+            self.stats.add_call('GET', uri, time.monotonic() - start, received=received[0])
+        meta['_received'] = received[0]
+
+        if '_body' in meta:
+            result = self._ensure_response_format(meta.pop('_body'))
+            if isinstance(result, dict):
+                meta.update(result)
+                yield from result.pop(key, None) or []
+        elif 'errorCode' in meta:
+            meta.update(self._ensure_response_format(dict(meta)))
+
     def post(self, uri, body=None):
         if body is not None:
-            body = json.dumps(body) if isinstance(body, (dict, list)) else body
+            body = codec.dumps(body) if isinstance(body, (dict, list)) else body
         result = super().post(uri, body)
         return self._ensure_response_format(result)
 
+    def post_multi_part(self, uri, files):
+        result = super().post_multi_part(uri, files)
+        return self._ensure_response_format(result)
+
     def put(self, uri, body):
-        body = json.dumps(body) if isinstance(body, (dict, list)) else body
+        body = codec.dumps(body) if isinstance(body, (dict, list)) else body
         result = super().put(uri, body)
         return self._ensure_response_format(result)
 
     def patch(self, uri, body):
-        body = json.dumps(body) if isinstance(body, (dict, list)) else body
+        body = codec.dumps(body) if isinstance(body, (dict, list)) else body
         result = super().patch(uri, body)
         return self._ensure_response_format(result)
 
+    def json_patch(self, uri, operations):
+        # RFC 6902 patch documents need their own content type, which the SDK only exposes through _do_call
+        body = codec.dumps(operations) if isinstance(operations, list) else operations
+        result = self._do_call(uri, 'PATCH', body=body, content_type='application/json-patch+json')
+        return self._ensure_response_format(result)
+
     def delete(self, uri):
         result = super().delete(uri)
         return self._ensure_response_format(result)
@@ -95,8 +380,8 @@ class UltraConnection(RestApiConnection):
         # Ensure result is a dict
         if isinstance(result, str):
             try:
-                result = json.loads(result)
-            except json.JSONDecodeError:
+                result = codec.loads(result)
+            except ValueError:
                 return result
 
         # Handle list responses
@@ -0,0 +1,160 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+import random
+import socket
+import struct
+from ipaddress import IPv4Address, IPv6Address
+from .models import _fqdn as fqdn
+
+# record types the verifier can compare value by value, everything else is compared by SOA serial
+RRTYPES = {'A': 1, 'NS': 2, 'CNAME': 5, 'SOA': 6, 'PTR': 12, 'MX': 15, 'TXT': 16, 'AAAA': 28, 'SRV': 33}
+RRTYPE_NAMES = dict((v, k) for k, v in RRTYPES.items())
+NXDOMAIN = 3
+
+
+class DNSError(Exception):
+    pass
+
+
+def encode_name(name):
+    labels = list(label for label in fqdn(name).split('.') if label)
+    return b''.join(struct.pack('!B', len(label)) + label.encode('idna') for label in labels) + b'\x00'
+
+
+def build_query(name, rrtype):
+    """Build a non-recursive query. Returns the query ID and the wire format message."""
+    query_id = random.randint(0, 0xffff)
+    header = struct.pack('!HHHHHH', query_id, 0, 1, 0, 0, 0)
+    return query_id, header + encode_name(name) + struct.pack('!HH', RRTYPES[rrtype], 1)
+
+
+def _read_name(message, offset):
+    labels = []
+    end = None
+    for _ in range(128):
+        length = message[offset]
+        if length & 0xc0 == 0xc0:
+            # compression pointer, the name continues elsewhere in the message
+            if end is None:
+                end = offset + 2
+            offset = struct.unpack('!H', message[offset:offset + 2])[0] & 0x3fff
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(message[offset:offset + length].decode('ascii', 'replace').lower())
+        offset += length
+    else:
+        raise DNSError('Name compression loop in response')
+    return '.'.join(labels) + '.', end if end is not None else offset
+
+
+def _rdata_text(message, rrtype, offset, length):
+    rdata = message[offset:offset + length]
+    if rrtype == 1:
+        return str(IPv4Address(rdata))
+    if rrtype == 28:
+        return str(IPv6Address(rdata))
+    if rrtype in (2, 5, 12):
+        return _read_name(message, offset)[0]
+    if rrtype == 15:
+        return f'{struct.unpack("!H", rdata[:2])[0]} {_read_name(message, offset + 2)[0]}'
+    if rrtype == 33:
+        priority, weight, port = struct.unpack('!HHH', rdata[:6])
+        return f'{priority} {weight} {port} {_read_name(message, offset + 6)[0]}'
+    if rrtype == 16:
+        # a TXT record may be split into several character strings, join them back together
+        strings = []
+        i = 0
+        while i < len(rdata):
+            strings.append(rdata[i + 1:i + 1 + rdata[i]].decode('utf-8', 'replace'))
+            i += 1 + rdata[i]
+        return ''.join(strings)
+    if rrtype == 6:
+        mname, i = _read_name(message, offset)
+        rname, i = _read_name(message, i)
+        serial, refresh, retry, expire, minimum = struct.unpack('!IIIII', message[i:i + 20])
+        return f'{mname} {rname} {serial} {refresh} {retry} {expire} {minimum}'
+    return None
+
+
+def parse_response(message, query_id):
+    """
+    Parse the answer section of a response.
+
+    Returns a tuple of (rcode, truncated, answers) where answers is a list of
+    (owner, type name, rdata text) tuples.
+    """
+    if len(message) < 12:
+        raise DNSError('Short DNS response')
+    rid, flags, qdcount, ancount, _, _ = struct.unpack('!HHHHHH', message[:12])
+    if rid != query_id:
+        raise DNSError('DNS response ID does not match the query')
+
+    offset = 12
+    for _ in range(qdcount):
+        offset = _read_name(message, offset)[1] + 4
+
+    answers = []
+    for _ in range(ancount):
+        owner, offset = _read_name(message, offset)
+        rrtype, _, _, length = struct.unpack('!HHIH', message[offset:offset + 10])
+        offset += 10
+        if rrtype in RRTYPE_NAMES:
+            answers.append((owner, RRTYPE_NAMES[rrtype], _rdata_text(message, rrtype, offset, length)))
+        offset += length
+    return flags & 0x000f, bool(flags & 0x0200), answers
+
+
+def _tcp_exchange(server, port, message, timeout):
+    with socket.create_connection((server, port), timeout=timeout) as sock:
+        sock.sendall(struct.pack('!H', len(message)) + message)
+        data = b''
+        while len(data) < 2 or len(data) < 2 + struct.unpack('!H', data[:2])[0]:
+            chunk = sock.recv(65535)
+            if not chunk:
+                raise DNSError('Connection closed by nameserver')
+            data += chunk
+        return data[2:2 + struct.unpack('!H', data[:2])[0]]
+
+
+def query(server, name, rrtype, port=53, timeout=2.0):
+    """
+    Ask one nameserver directly for an rrset, retrying over TCP if the UDP answer is truncated.
+
+    Returns a tuple of (rcode, values) where values is the sorted list of rdata texts
+    of the answers for the name and type.
+    """
+    query_id, message = build_query(name, rrtype)
+    family = socket.AF_INET6 if ':' in server else socket.AF_INET
+    with socket.socket(family, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        sock.sendto(message, (server, port))
+        response = sock.recvfrom(65535)[0]
+
+    rcode, truncated, answers = parse_response(response, query_id)
+    if truncated:
+        rcode, truncated, answers = parse_response(_tcp_exchange(server, port, message, timeout), query_id)
+
+    owner = fqdn(name)
+    return rcode, sorted(value for o, t, value in answers if o == owner and t == rrtype)
+
+
+def normalize(rrtype, values):
+    """Put API rdata in the same text form the parser produces, so the two can be compared."""
+    result = []
+    for value in values:
+        value = value.strip()
+        if rrtype == 'A':
+            value = str(IPv4Address(value))
+        elif rrtype == 'AAAA':
+            value = str(IPv6Address(value))
+        elif rrtype in ('CNAME', 'NS', 'PTR'):
+            value = fqdn(value)
+        elif rrtype in ('MX', 'SRV'):
+            parts = value.split()
+            value = ' '.join(parts[:-1] + [fqdn(parts[-1])])
+        elif rrtype == 'TXT' and len(value) > 1 and value.startswith('"') and value.endswith('"'):
+            value = value[1:-1]
+        result.append(value)
+    return sorted(result)
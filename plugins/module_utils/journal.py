@@ -0,0 +1,78 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+import hashlib
+import sqlite3
+import threading
+import time
+
+from . import codec
+
+
+def operation_key(*parts):
+    """A short stable key for an operation, from everything that defines it."""
+    return hashlib.sha1(codec.dumps(list(parts)).encode('utf-8')).hexdigest()
+
+
+class Journal:
+    """
+    Local record of completed operations, so a rerun can skip them without calling the API.
+
+    The journal is an SQLite file that every fork and every task of a play can share. Lookups
+    are single indexed reads; completed operations are buffered and written in one transaction
+    every flush_every entries, every flush_interval seconds, or on flush() and close().
+    Entries not yet flushed when a run dies are simply done again by the next run.
+    """
+    def __init__(self, path, flush_every=100, flush_interval=2.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.last_flush = time.monotonic()
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS done (key TEXT PRIMARY KEY, value TEXT, completed REAL)')
+
+    def get(self, key, default=None):
+        """The value stored with a completed operation, or default if it has not completed."""
+        with self.lock:
+            if key in self.pending:
+                return self.pending[key]
+            row = self.db.execute('SELECT value FROM done WHERE key = ?', (key,)).fetchone()
+        return default if row is None else codec.loads(row[0])
+
+    def done(self, key):
+        return self.get(key, default=self) is not self
+
+    def put(self, key, value=True):
+        with self.lock:
+            self.pending[key] = value
+            due = len(self.pending) >= self.flush_every or time.monotonic() - self.last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            entries, self.pending = self.pending, {}
+            self.last_flush = time.monotonic()
+            if not entries:
+                return
+            now = time.time()
+            self.db.execute('BEGIN IMMEDIATE')
+            try:
+                self.db.executemany('INSERT OR REPLACE INTO done (key, value, completed) VALUES (?, ?, ?)',
+                                    list((k, codec.dumps(v), now) for k, v in entries.items()))
+                self.db.execute('COMMIT')
+            except Exception:
+                self.db.execute('ROLLBACK')
+                raise
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,179 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+# record type codes as used by the API in rrtype strings such as 'A (1)'
+RRTYPE_CODES = {
+    'A': 1, 'NS': 2, 'CNAME': 5, 'SOA': 6, 'PTR': 12, 'HINFO': 13, 'MX': 15, 'TXT': 16, 'RP': 17,
+    'AAAA': 28, 'SRV': 33, 'NAPTR': 35, 'DS': 43, 'SSHFP': 44, 'TLSA': 52, 'SVCB': 64, 'HTTPS': 65,
+    'SPF': 99, 'CAA': 257, 'APEXALIAS': 65282,
+}
+RRTYPE_NAMES = dict((v, k) for k, v in RRTYPE_CODES.items())
+
+
+def rrtype_code(rrtype):
+    """
+    Turn an API rrtype such as 'A (1)', a type name such as 'AAAA' or a code into the type code.
+
+    Returns:
+        The integer code, or None if the type is unknown
+    """
+    if isinstance(rrtype, int):
+        return rrtype
+    rrtype = rrtype.strip()
+    if rrtype.endswith(')') and '(' in rrtype:
+        return int(rrtype[rrtype.rindex('(') + 1:-1])
+    if rrtype.upper().startswith('TYPE') and rrtype[4:].isdigit():
+        return int(rrtype[4:])
+    return RRTYPE_CODES.get(rrtype.upper())
+
+
+def rrtype_name(code):
+    return RRTYPE_NAMES.get(code, f'TYPE{code}')
+
+
+def _fqdn(name):
+    name = name.strip().lower()
+    return name if name.endswith('.') else f'{name}.'
+
+
+def _freeze(value):
+    # nested profile values become tuples so pools can be hashed and compared cheaply
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class Pool:
+    """The profile of a pool RRSet, e.g. an RD, SB, TC or directional pool."""
+    __slots__ = ('kind', '_profile', '_frozen')
+
+    def __init__(self, profile):
+        # e.g. http://schemas.ultradns.com/RDPool.jsonschema -> RDPool
+        context = profile.get('@context', '')
+        self.kind = context.rsplit('/', 1)[-1].split('.')[0] if context else None
+        self._profile = profile
+        self._frozen = None
+
+    @property
+    def frozen(self):
+        if self._frozen is None:
+            self._frozen = _freeze(self._profile)
+        return self._frozen
+
+    @property
+    def order(self):
+        return self._profile.get('order')
+
+    def __eq__(self, other):
+        return isinstance(other, Pool) and self.frozen == other.frozen
+
+    def __hash__(self):
+        return hash(self.frozen)
+
+    def __repr__(self):
+        return f'Pool({self.kind})'
+
+    def as_dict(self):
+        return self._profile
+
+
+class RRSet:
+    """
+    One RRSet as returned by the API, with the owner as a lowercase FQDN, the type as
+    its integer code and the rdata as a tuple.
+
+    Equality and hashing use (owner, type, ttl, rdata, profile), so RRSets read at two
+    points in time can be put in sets and diffed directly. The hash is computed once.
+    """
+    __slots__ = ('owner', 'rrtype', 'ttl', 'rdata', 'pool', '_hash')
+
+    def __init__(self, owner, rrtype, ttl=None, rdata=(), pool=None):
+        self.owner = _fqdn(owner)
+        self.rrtype = rrtype_code(rrtype)
+        self.ttl = ttl
+        self.rdata = tuple(rdata)
+        self.pool = pool
+        self._hash = None
+
+    @classmethod
+    def from_api(cls, data):
+        profile = data.get('profile')
+        return cls(data.get('ownerName', ''), data.get('rrtype', 0), data.get('ttl'), data.get('rdata') or (),
+                   Pool(profile) if isinstance(profile, dict) else None)
+
+    @classmethod
+    def first(cls, result):
+        """The first RRSet of an API response, or None if the response holds none."""
+        try:
+            data = result['rrSets'][0]
+        except (KeyError, IndexError, TypeError):
+            return None
+        return cls.from_api(data)
+
+    @property
+    def type_name(self):
+        return rrtype_name(self.rrtype)
+
+    @property
+    def key(self):
+        return self.owner, self.rrtype
+
+    @property
+    def serial(self):
+        """The serial of an SOA RRSet."""
+        return int(self.rdata[0].split()[2])
+
+    def _identity(self):
+        return self.owner, self.rrtype, self.ttl, self.rdata, self.pool
+
+    def __eq__(self, other):
+        return isinstance(other, RRSet) and self._identity() == other._identity()
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self._identity())
+        return self._hash
+
+    def __repr__(self):
+        return f'RRSet({self.owner} {self.type_name} {self.ttl} {list(self.rdata)})'
+
+    def as_dict(self):
+        data = {'ownerName': self.owner, 'rrtype': f'{self.type_name} ({self.rrtype})',
+                'ttl': self.ttl, 'rdata': list(self.rdata)}
+        if self.pool is not None:
+            data['profile'] = self.pool.as_dict()
+        return data
+
+
+class Zone:
+    """The properties of a zone from the zone listing or a zone read."""
+    __slots__ = ('name', 'type', 'status', 'account', 'record_count', 'modified')
+
+    def __init__(self, name, type=None, status=None, account=None, record_count=None, modified=None):
+        self.name = _fqdn(name)
+        self.type = type
+        self.status = status
+        self.account = account
+        self.record_count = record_count
+        self.modified = modified
+
+    @classmethod
+    def from_api(cls, data):
+        properties = data.get('properties', data)
+        return cls(properties['name'], properties.get('type'), properties.get('status'),
+                   properties.get('accountName'), properties.get('resourceRecordCount'),
+                   properties.get('lastModifiedDateTime'))
+
+    def _identity(self):
+        return self.name, self.type, self.status, self.account, self.record_count, self.modified
+
+    def __eq__(self, other):
+        return isinstance(other, Zone) and self._identity() == other._identity()
+
+    def __hash__(self):
+        return hash(self._identity())
+
+    def __repr__(self):
+        return f'Zone({self.name})'
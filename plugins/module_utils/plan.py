@@ -0,0 +1,119 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+import gzip
+import os
+import time
+from ipaddress import ip_address
+
+from . import codec
+from .models import rrtype_code, rrtype_name
+
+PLAN_VERSION = 1
+RDPOOL = {'@context': 'http://schemas.ultradns.com/RDPool.jsonschema', 'order': 'ROUND_ROBIN'}
+
+
+def owner_fqdn(name, zone):
+    """The owner name of a record given relative to its zone, as an FQDN."""
+    zone = zone.lower() if zone.endswith('.') else f'{zone.lower()}.'
+    name = (name or '@').strip().lower()
+    if name == '@':
+        return zone
+    if name.endswith('.'):
+        return name
+    return f'{name}.{zone}'
+
+
+def _canonical(rrtype, values):
+    # addresses are compared by value so 2001:db8::1 matches 2001:DB8:0::1
+    if rrtype in ('A', 'AAAA'):
+        return sorted(str(ip_address(v)) for v in values)
+    return sorted(values)
+
+
+def zone_operations(zone, desired, current):
+    """
+    Work out the API operations that turn the current rrsets of a zone into the desired ones.
+
+    Args:
+        zone: The zone name
+        desired: A list of dictionaries with name, type, ttl, rdata and state
+        current: A dictionary of RRSet models keyed by (owner, type code)
+
+    Returns:
+        A list of [method, path, body] operations, body being None for deletes
+    """
+    operations = []
+    for record in desired:
+        rrtype = record['type'].upper()
+        owner = owner_fqdn(record.get('name'), zone)
+        path = f"/zones/{zone}/rrsets/{rrtype}/{owner}"
+        existing = current.get((owner, rrtype_code(rrtype)))
+
+        if record.get('state', 'present') == 'absent':
+            if existing is not None:
+                operations.append(['DELETE', path, None])
+            continue
+
+        values = list(dict.fromkeys(record['rdata']))
+        ttl = record.get('ttl')
+        if existing is not None and _canonical(rrtype, values) == _canonical(rrtype, existing.rdata):
+            if ttl is None or ttl == existing.ttl:
+                continue
+
+        body = {'rdata': values}
+        if ttl is not None or existing is not None:
+            body['ttl'] = ttl if ttl is not None else existing.ttl
+        # multiple A/AAAA values are an rdpool, keep an existing profile or start a round robin one
+        if rrtype in ('A', 'AAAA') and len(values) > 1:
+            body['profile'] = existing.pool.as_dict() if existing is not None and existing.pool is not None else dict(RDPOOL)
+        operations.append(['POST' if existing is None else 'PUT', path, body])
+    return operations
+
+
+def soa_serial(current, zone):
+    soa = current.get((owner_fqdn('@', zone), rrtype_code('SOA')))
+    return soa.serial if soa is not None else None
+
+
+def new_plan(host):
+    return {'version': PLAN_VERSION, 'host': host, 'created': int(time.time()), 'zones': {}}
+
+
+def write_plan(path, plan):
+    """
+    Write a plan as compact JSON, gzip compressed when the path ends in .gz.
+
+    Returns:
+        True if the file was created or its operations changed
+    """
+    try:
+        previous = read_plan(path)
+    except (IOError, OSError, ValueError):
+        previous = None
+    if previous is not None and previous.get('host') == plan['host'] and previous.get('zones') == plan['zones']:
+        return False
+
+    data = codec.dumps(plan).encode('utf-8')
+    tmp = f'{path}.tmp'
+    with (gzip.open(tmp, 'wb') if path.endswith('.gz') else open(tmp, 'wb')) as handle:
+        handle.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def read_plan(path):
+    with (gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')) as handle:
+        plan = codec.loads(handle.read())
+    if not isinstance(plan, dict) or plan.get('version') != PLAN_VERSION:
+        raise ValueError(f'{path} is not a version {PLAN_VERSION} plan')
+    return plan
+
+
+def summarize(operations):
+    counts = {}
+    for method, path, _ in operations:
+        rrtype = path.split('/')[4]
+        key = {'POST': 'create', 'PUT': 'update', 'DELETE': 'delete'}.get(method, method.lower())
+        counts.setdefault(key, {}).setdefault(rrtype_name(rrtype_code(rrtype)), 0)
+        counts[key][rrtype_name(rrtype_code(rrtype))] += 1
+    return counts
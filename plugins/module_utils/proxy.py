@@ -0,0 +1,294 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+import os
+import re
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections import OrderedDict
+
+from . import codec
+from .concurrency import RateLimiter
+from .connection import ApiStats
+
+ZONE_PATTERN = re.compile(r'/zones/([^/?]+)')
+WRITES = ('POST', 'PUT', 'PATCH', 'JSON_PATCH', 'DELETE')
+
+
+def _zones(uri, body):
+    """The zones a write touches, or None when it cannot tell and every cached read must go."""
+    uris = [uri]
+    if uri.split('?')[0].rstrip('/') == '/batch':
+        uris = list(r.get('uri', '') for r in body if isinstance(r, dict)) if isinstance(body, list) else []
+    zones = set()
+    for item in uris:
+        match = ZONE_PATTERN.search(item)
+        if match is None:
+            return None
+        zones.add(match.group(1).lower().rstrip('.'))
+    return zones
+
+
+class ReadCache:
+    """
+    GET responses by URI for ttl seconds, dropped as soon as a write touches their zone.
+
+    Every write moves the generation on. A response is only stored if no write happened
+    while it was being fetched, so a read that raced a write is never cached.
+    """
+    def __init__(self, ttl=30, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.generation = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            self.entries.move_to_end(key)
+            return entry[2]
+
+    def put(self, key, generation, value):
+        if not self.ttl or isinstance(value, dict) and 'errorCode' in value:
+            return
+        match = ZONE_PATTERN.search(key[0])
+        zone = match.group(1).lower().rstrip('.') if match else None
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.entries[key] = (time.monotonic() + self.ttl, zone, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, zones=None):
+        with self.lock:
+            self.generation += 1
+            if zones is None:
+                self.entries.clear()
+                return
+            for key in list(k for k, e in self.entries.items() if e[1] is None or e[1] in zones):
+                del self.entries[key]
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = self.error = None
+
+
+class SingleFlight:
+    """Run identical calls that overlap in time once, handing every caller the same result."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, func):
+        """
+        Returns:
+            (result, shared), shared being True if another caller made the call
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except Exception as exc:
+            call.error = exc
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.event.set()
+        return call.result, False
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    # one JSON request line in, one JSON response line out, then the connection closes
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            response = {'result': self.server.call(codec.loads(line))}
+        except Exception as exc:
+            response = {'error': str(exc), 'type': type(exc).__name__}
+        self.wfile.write(codec.dumps(response).encode('utf-8') + b'\n')
+
+
+class ProxyServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Local daemon sharing one logged in connection to the API between processes.
+
+    Every ansible-playbook run on the controller that points its provider at the socket
+    uses the same token, the same pool of HTTP connections and one global rate limit.
+    Identical GETs in flight at the same time are sent once, and GET responses are cached
+    for cache_ttl seconds until a write touches their zone.
+    """
+    daemon_threads = True
+
+    def __init__(self, path, connection, rate=10, burst=None, cache_ttl=30, idle_timeout=None):
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        # the socket carries an authenticated session, so it is created with no access for other users
+        umask = os.umask(0o077)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(umask)
+        os.chmod(path, 0o600)
+        self.path = path
+        self.connection = connection
+        self.limiter = RateLimiter(rate, burst)
+        self.cache = ReadCache(cache_ttl)
+        self.flights = SingleFlight()
+        self.idle_timeout = idle_timeout
+        self.last_request = time.monotonic()
+        self.counters = {'requests': 0, 'cached': 0, 'shared': 0, 'upstream': 0}
+        self.lock = threading.Lock()
+
+    def _count(self, key):
+        with self.lock:
+            self.counters[key] += 1
+
+    def _upstream(self, method, uri, params=None, body=None):
+        self.limiter.acquire()
+        self._count('upstream')
+        if method == 'GET':
+            return self.connection.get(uri, params)
+        if method == 'DELETE':
+            return self.connection.delete(uri)
+        if method == 'JSON_PATCH':
+            return self.connection.json_patch(uri, body)
+        return getattr(self.connection, method.lower())(uri, body)
+
+    def call(self, request):
+        self.last_request = time.monotonic()
+        self._count('requests')
+        method, uri = request['method'].upper(), request.get('uri', '')
+
+        if method == 'HELLO':
+            return {'host': getattr(self.connection, 'host', None)}
+        if method == 'STATS':
+            with self.lock:
+                return dict(self.counters, api_stats=self.connection.stats.as_dict())
+
+        if method == 'GET':
+            key = (uri, codec.dumps(request.get('params') or {}))
+            result = self.cache.get(key)
+            if result is not None:
+                self._count('cached')
+                return {'body': result, 'cached': True}
+            generation = self.cache.generation
+            result, shared = self.flights.do((generation,) + key, lambda: self._upstream('GET', uri, request.get('params')))
+            if shared:
+                self._count('shared')
+            else:
+                self.cache.put(key, generation, result)
+            return {'body': result, 'cached': shared}
+
+        if method not in WRITES:
+            raise ValueError(f'Unsupported method {method}')
+        try:
+            return {'body': self._upstream(method, uri, body=request.get('body'))}
+        finally:
+            self.cache.invalidate(_zones(uri, request.get('body')))
+
+    def service_actions(self):
+        # called by serve_forever between requests
+        if self.idle_timeout and time.monotonic() - self.last_request > self.idle_timeout:
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class ProxyConnection:
+    """
+    Stands in for UltraConnection in modules whose provider sets proxy_socket.
+
+    Requests are forwarded to a ProxyServer, which holds the login, so no credentials
+    are needed here. API calls are counted in stats like a direct connection, with GETs
+    answered by the proxy's cache or by another caller's request counted as cached.
+    """
+    def __init__(self, path, timeout=None):
+        self.path = path
+        self.stats = ApiStats()
+        # seconds to wait for the proxy to answer, None waits forever
+        self.read_timeout = timeout
+        self.host = self._call({'method': 'HELLO'})['host']
+
+    def _call(self, request):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.read_timeout)
+        try:
+            sock.connect(self.path)
+            sock.sendall(codec.dumps(request).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as handle:
+                line = handle.readline()
+        except socket.timeout as exc:
+            raise TimeoutError(f"{request['method']} {request.get('uri', '')} timed out") from exc
+        finally:
+            sock.close()
+        if not line:
+            raise ConnectionError(f'The UltraDNS proxy at {self.path} closed the connection')
+        response = codec.loads(line)
+        if 'error' in response:
+            # timeouts keep their type so paged listings still retry them with smaller pages
+            if response.get('type') == 'TimeoutError':
+                raise TimeoutError(response['error'])
+            raise ConnectionError(f"The UltraDNS proxy failed: {response['type']}: {response['error']}")
+        return response['result']
+
+    def _request(self, method, uri, params=None, body=None):
+        start = time.monotonic()
+        result = self._call({'method': method, 'uri': uri, 'params': params, 'body': body})
+        if result.get('cached'):
+            self.stats.add_cached()
+        else:
+            self.stats.add_call(method, uri, time.monotonic() - start, len(codec.dumps(body)) if body is not None else 0)
+        return result['body']
+
+    def get(self, uri, params=None):
+        return self._request('GET', uri, params)
+
+    def stream(self, uri, key, meta):
+        # the proxy caches whole responses, so a page arrives whole and is handed out item by item
+        result = self.get(uri)
+        if isinstance(result, dict):
+            items = result.pop(key, None) or []
+            meta.update(result)
+            meta['_received'] = len(codec.dumps(items))
+            yield from items
+
+    def post(self, uri, body=None):
+        return self._request('POST', uri, body=body)
+
+    def put(self, uri, body):
+        return self._request('PUT', uri, body=body)
+
+    def patch(self, uri, body):
+        return self._request('PATCH', uri, body=body)
+
+    def json_patch(self, uri, operations):
+        return self._request('JSON_PATCH', uri, body=operations)
+
+    def delete(self, uri):
+        return self._request('DELETE', uri)
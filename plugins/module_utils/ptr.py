@@ -0,0 +1,104 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+import socket
+
+from .models import rrtype_code
+
+PTR = rrtype_code('PTR')
+
+
+def reverse_names(addresses):
+    """
+    The reverse DNS owner name of every address, in order, or None for an invalid address.
+
+    Each address is packed once with inet_pton and its name built straight from the bytes,
+    which is several times faster than going through ipaddress objects for large zones.
+    """
+    names = []
+    for address in addresses:
+        try:
+            if ':' in address:
+                names.append('.'.join(reversed(socket.inet_pton(socket.AF_INET6, address).hex())) + '.ip6.arpa.')
+            else:
+                packed = socket.inet_pton(socket.AF_INET, address)
+                names.append(f'{packed[3]}.{packed[2]}.{packed[1]}.{packed[0]}.in-addr.arpa.')
+        except (OSError, ValueError):
+            names.append(None)
+    return names
+
+
+def longest_zone(name, zones):
+    """The longest of zones that name belongs to, or None."""
+    labels = name.split('.')
+    for i in range(len(labels) - 1):
+        suffix = '.'.join(labels[i:])
+        if suffix in zones:
+            return suffix
+    return None
+
+
+def within(name, zones):
+    return longest_zone(name.lower() if name.endswith('.') else f'{name.lower()}.', zones) is not None
+
+
+def desired_ptrs(forward, reverse_zones):
+    """
+    Group the PTR records implied by forward address RRSets by reverse zone.
+
+    Args:
+        forward: An iterable of (owner, ttl, addresses) of A and AAAA RRSets
+        reverse_zones: A set of reverse zone names, lowercase with a trailing dot
+
+    Returns:
+        ({zone: {owner: [ttl, set of targets]}}, list of addresses outside every reverse zone)
+    """
+    zones, unmanaged, found = {}, [], {}
+    for owner, ttl, addresses in forward:
+        for address, name in zip(addresses, reverse_names(addresses)):
+            if name is None:
+                continue
+            # addresses of one /24 or /64 share their zone, so it is looked up once
+            parent = name.split('.', 1)[1]
+            zone = found[parent] if parent in found else found.setdefault(parent, longest_zone(name, reverse_zones))
+            if zone is None:
+                unmanaged.append(address)
+                continue
+            entry = zones.setdefault(zone, {}).setdefault(name, [ttl, set()])
+            entry[1].add(owner)
+            # an address used by several RRSets gets the shortest of their TTLs
+            if ttl is not None and (entry[0] is None or ttl < entry[0]):
+                entry[0] = ttl
+    return zones, unmanaged
+
+
+def ptr_records(wanted, current, forward_zones, prune=False, ttl=None):
+    """
+    The desired PTR RRSets of one reverse zone, in the form zone_operations() takes.
+
+    Targets outside the forward zones are managed elsewhere and kept as they are. With prune,
+    PTRs that point only into the forward zones but match no forward address are removed.
+
+    Args:
+        wanted: {owner: (ttl, targets)} for the zone, from desired_ptrs()
+        current: The zone's PTR RRSet models keyed by (owner, type code)
+        forward_zones: A set of the forward zone names
+        prune: Remove stale PTRs
+        ttl: A fixed TTL for every PTR, instead of the TTL of the forward RRSet
+    """
+    records = []
+    for owner, (forward_ttl, targets) in wanted.items():
+        existing = current.get((owner, PTR))
+        foreign = list(t for t in existing.rdata if not within(t, forward_zones)) if existing is not None else []
+        records.append({'name': owner, 'type': 'PTR', 'rdata': sorted(targets) + foreign,
+                        'ttl': ttl if ttl is not None else forward_ttl})
+
+    if prune:
+        for (owner, rrtype), rrset in current.items():
+            if rrtype != PTR or owner in wanted:
+                continue
+            foreign = list(t for t in rrset.rdata if not within(t, forward_zones))
+            if not foreign:
+                records.append({'name': owner, 'type': 'PTR', 'state': 'absent'})
+            elif len(foreign) < len(rrset.rdata):
+                records.append({'name': owner, 'type': 'PTR', 'rdata': foreign, 'ttl': rrset.ttl})
+    return records
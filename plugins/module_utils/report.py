@@ -0,0 +1,194 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+import csv
+import hashlib
+import io
+import json
+import os
+from collections import Counter
+
+DEFAULT_TTL_BUCKETS = [60, 300, 900, 3600, 86400]
+OWNER_BUCKETS = [1, 2, 5, 10, 50]
+CSV_FIELDS = ['zone', 'account', 'type', 'status', 'rrsets', 'records', 'pools', 'owners', 'largest_owner', 'min_ttl', 'max_ttl']
+
+
+def _bucket(value, bounds):
+    for bound in bounds:
+        if value <= bound:
+            return f'<={bound}'
+    return f'>{bounds[-1]}'
+
+
+class ZoneStats:
+    """
+    Counters for one zone, updated one RRSet model at a time.
+
+    Records per owner are counted from runs of the same owner name, which relies on the
+    API returning RRSets ordered by owner, so no per-owner table is kept in memory.
+    """
+    __slots__ = ('name', 'account', 'type', 'status', 'rrsets', 'records', 'pools', 'owners',
+                 'largest_owner', 'min_ttl', 'max_ttl', 'by_type', 'ttls', 'pool_kinds', 'owner_sizes',
+                 '_owner', '_owner_records', '_ttl_buckets', 'error')
+
+    def __init__(self, zone, ttl_buckets=None):
+        self.name = zone.name
+        self.account = zone.account
+        self.type = zone.type
+        self.status = zone.status
+        self.rrsets = self.records = self.pools = self.owners = self.largest_owner = 0
+        self.min_ttl = self.max_ttl = None
+        self.by_type, self.ttls, self.pool_kinds, self.owner_sizes = Counter(), Counter(), Counter(), Counter()
+        self._owner, self._owner_records = None, 0
+        self._ttl_buckets = ttl_buckets or DEFAULT_TTL_BUCKETS
+        self.error = None
+
+    def add(self, rrset):
+        count = len(rrset.rdata)
+        self.rrsets += 1
+        self.records += count
+        self.by_type[rrset.type_name] += count
+
+        ttl = rrset.ttl
+        if ttl is not None:
+            self.ttls[_bucket(ttl, self._ttl_buckets)] += 1
+            self.min_ttl = ttl if self.min_ttl is None else min(self.min_ttl, ttl)
+            self.max_ttl = ttl if self.max_ttl is None else max(self.max_ttl, ttl)
+
+        if rrset.pool is not None:
+            self.pools += 1
+            self.pool_kinds[rrset.pool.kind] += 1
+
+        owner = rrset.owner
+        if owner != self._owner:
+            self._end_owner()
+            self._owner = owner
+        self._owner_records += count
+
+    def _end_owner(self):
+        if self._owner is not None:
+            self.owners += 1
+            self.owner_sizes[_bucket(self._owner_records, OWNER_BUCKETS)] += 1
+            self.largest_owner = max(self.largest_owner, self._owner_records)
+        self._owner, self._owner_records = None, 0
+
+    def finish(self):
+        self._end_owner()
+        return self
+
+    def row(self):
+        row = {'zone': self.name, 'account': self.account, 'type': self.type, 'status': self.status}
+        row.update((field, getattr(self, field)) for field in CSV_FIELDS[4:])
+        return row
+
+    def as_dict(self):
+        result = self.row()
+        result.update({
+            'records_by_type': dict(self.by_type),
+            'ttl_histogram': dict(self.ttls),
+            'pools_by_kind': dict(self.pool_kinds),
+            'records_per_owner': dict(self.owner_sizes),
+        })
+        if self.error:
+            result['error'] = self.error
+        return result
+
+
+class ReportTotals:
+    """Account-wide aggregates merged from finished zones, independent of the number of zones."""
+    def __init__(self):
+        self.zones = 0
+        self.rrsets = self.records = self.pools = 0
+        self.by_status, self.by_zone_type = Counter(), Counter()
+        self.by_type, self.ttls, self.pool_kinds, self.owner_sizes = Counter(), Counter(), Counter(), Counter()
+        self.errors = {}
+
+    def add(self, stats):
+        self.zones += 1
+        self.by_status[stats.status] += 1
+        self.by_zone_type[stats.type] += 1
+        self.rrsets += stats.rrsets
+        self.records += stats.records
+        self.pools += stats.pools
+        self.by_type.update(stats.by_type)
+        self.ttls.update(stats.ttls)
+        self.pool_kinds.update(stats.pool_kinds)
+        self.owner_sizes.update(stats.owner_sizes)
+        if stats.error:
+            self.errors[stats.name] = stats.error
+
+    def as_dict(self):
+        return {
+            'zones': self.zones,
+            'zones_by_status': dict(self.by_status),
+            'zones_by_type': dict(self.by_zone_type),
+            'rrsets': self.rrsets,
+            'records': self.records,
+            'pools': self.pools,
+            'records_by_type': dict(self.by_type),
+            'ttl_histogram': dict(self.ttls),
+            'pools_by_kind': dict(self.pool_kinds),
+            'records_per_owner': dict(self.owner_sizes),
+        }
+
+
+class ReportWriter:
+    """
+    Write per-zone rows to CSV and JSON files as zones finish.
+
+    Rows go to temporary files next to the targets, which replace the targets on close()
+    only when their content differs, so C(changed) reflects a real change of the report.
+    """
+    def __init__(self, csv_path=None, json_path=None):
+        self.targets = list(p for p in (csv_path, json_path) if p)
+        self.csv_path, self.json_path = csv_path, json_path
+        self._csv = self._json = None
+        self._first = True
+        if csv_path:
+            self._csv_file = open(f'{csv_path}.tmp', 'w', newline='')
+            self._csv = csv.DictWriter(self._csv_file, fieldnames=CSV_FIELDS)
+            self._csv.writeheader()
+        if json_path:
+            self._json = open(f'{json_path}.tmp', 'w')
+            self._json.write('{"zones": [\n')
+
+    def write(self, stats):
+        if self._csv:
+            self._csv.writerow(stats.row())
+        if self._json:
+            self._json.write(('' if self._first else ',\n') + json.dumps(stats.as_dict(), sort_keys=True))
+            self._first = False
+
+    def close(self, totals):
+        """Finish both files. Returns True if any target was created or changed."""
+        if self._csv:
+            self._csv_file.close()
+        if self._json:
+            self._json.write('\n],\n"totals": ' + json.dumps(totals, sort_keys=True) + '}\n')
+            self._json.close()
+
+        changed = False
+        for path in self.targets:
+            if _digest(path) != _digest(f'{path}.tmp'):
+                os.replace(f'{path}.tmp', path)
+                changed = True
+            else:
+                os.remove(f'{path}.tmp')
+        return changed
+
+    def abort(self):
+        for handle in (getattr(self, '_csv_file', None), self._json):
+            if handle:
+                handle.close()
+        for path in self.targets:
+            if os.path.exists(f'{path}.tmp'):
+                os.remove(f'{path}.tmp')
+
+
+def _digest(path):
+    if not os.path.exists(path):
+        return None
+    sha = hashlib.sha1()
+    with io.open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(65536), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
@@ -0,0 +1,74 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from .connection import UltraConnection
+
+MAX_SESSIONS = 16
+IDLE_TIMEOUT = 1800
+
+
+class SessionPool:
+    """
+    Logged in connections by (host, username), shared by every caller in this process.
+
+    A connection is reused as long as it was used within idle_timeout seconds and the
+    password matches the one it logged in with. Beyond max_sessions the least recently
+    used connection is dropped. Callers asking for the same account at the same time
+    wait for a single login.
+    """
+    def __init__(self, max_sessions=MAX_SESSIONS, idle_timeout=IDLE_TIMEOUT):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+        self.logins = {}
+
+    def get(self, host, username, password, factory=UltraConnection):
+        """
+        A logged in connection for the account, reusing a pooled one when possible.
+
+        Raises:
+            Whatever the login raises, e.g. the SDK's AuthError
+        """
+        key = (host, username)
+        secret = hashlib.sha256((password or '').encode('utf-8')).hexdigest()
+        with self.lock:
+            login_lock = self.logins.setdefault(key, threading.Lock())
+
+        with login_lock:
+            with self.lock:
+                self._expire()
+                entry = self.sessions.get(key)
+                if entry is not None and entry[1] == secret:
+                    self.sessions[key] = (entry[0], secret, time.monotonic())
+                    self.sessions.move_to_end(key)
+                    return entry[0]
+
+            connection = factory(host=host)
+            connection.auth(username=username, password=password)
+            with self.lock:
+                self.sessions[key] = (connection, secret, time.monotonic())
+                self.sessions.move_to_end(key)
+                while len(self.sessions) > self.max_sessions:
+                    self.sessions.popitem(last=False)
+            return connection
+
+    def discard(self, host, username):
+        with self.lock:
+            self.sessions.pop((host, username), None)
+
+    def _expire(self):
+        # entries are in order of use, so the idle ones are at the front
+        now = time.monotonic()
+        while self.sessions:
+            key, (_, _, used) = next(iter(self.sessions.items()))
+            if now - used <= self.idle_timeout:
+                break
+            del self.sessions[key]
+
+
+SESSIONS = SessionPool()
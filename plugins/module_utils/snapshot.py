@@ -0,0 +1,199 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+import os
+import sqlite3
+import time
+from urllib.parse import quote
+
+from . import codec
+from .models import _fqdn, RRSet
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)',
+    'CREATE TABLE IF NOT EXISTS zones (name TEXT PRIMARY KEY, account TEXT, type TEXT, status TEXT, data TEXT,'
+    ' serial INTEGER, checked REAL, loaded REAL)',
+    'CREATE TABLE IF NOT EXISTS rrsets (zone TEXT, owner TEXT, rrtype INTEGER, ttl INTEGER, pool TEXT, data TEXT)',
+    'CREATE INDEX IF NOT EXISTS rrsets_key ON rrsets (zone, owner, rrtype)',
+    'CREATE TABLE IF NOT EXISTS rdata (zone TEXT, owner TEXT, rrtype INTEGER, value TEXT)',
+    'CREATE INDEX IF NOT EXISTS rdata_value ON rdata (value)',
+    'CREATE INDEX IF NOT EXISTS rdata_key ON rdata (zone, owner, rrtype)',
+]
+# record_facts kinds and the pool profile they select
+POOL_KINDS = {'RD_POOLS': 'RDPool', 'DIR_POOLS': 'DirPool', 'SB_POOLS': 'SBPool', 'TC_POOLS': 'TCPool'}
+CHUNK = 1000
+
+
+def _chunks(items, size=CHUNK):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class SnapshotStore:
+    """
+    Zones and RRSets kept in a local SQLite file, so repeated reads are answered without the API.
+
+    RRSets are indexed by (zone, owner, type) and every rdata value has its own indexed row, so
+    exact lookups by name or value take milliseconds whatever the number of zones. Each zone
+    remembers the SOA serial its RRSets were read at, and the time the serial was last checked.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        for statement in SCHEMA:
+            self.db.execute(statement)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _transaction(self, func):
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            func()
+            self.db.execute('COMMIT')
+        except Exception:
+            self.db.execute('ROLLBACK')
+            raise
+
+    def zones_age(self):
+        """Seconds since the zone list was stored, or None if it never was."""
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'zones_listed'").fetchone()
+        return time.time() - float(row[0]) if row else None
+
+    def replace_zones(self, zones):
+        """Store the full zone list, dropping zones that are no longer listed together with their RRSets."""
+        def write():
+            self.db.execute('CREATE TEMP TABLE IF NOT EXISTS listed (name TEXT PRIMARY KEY)')
+            self.db.execute('DELETE FROM listed')
+            for chunk in _chunks(zones):
+                rows = []
+                for zone in chunk:
+                    properties = zone.get('properties', zone)
+                    rows.append((_fqdn(properties['name']), properties.get('accountName'), properties.get('type'),
+                                 properties.get('status'), codec.dumps(zone)))
+                self.db.executemany('INSERT OR IGNORE INTO listed (name) VALUES (?)', list((r[0],) for r in rows))
+                self.db.executemany(
+                    'INSERT INTO zones (name, account, type, status, data) VALUES (?, ?, ?, ?, ?) ON CONFLICT (name) DO UPDATE'
+                    ' SET account = excluded.account, type = excluded.type, status = excluded.status, data = excluded.data', rows)
+            for table in ('rrsets', 'rdata'):
+                self.db.execute(f'DELETE FROM {table} WHERE zone NOT IN (SELECT name FROM listed)')
+            self.db.execute('DELETE FROM zones WHERE name NOT IN (SELECT name FROM listed)')
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('zones_listed', ?)", (str(time.time()),))
+        self._transaction(write)
+
+    def zone_state(self, zone):
+        """The serial, last check and last load time of a zone's RRSets, or None if they were never stored."""
+        row = self.db.execute('SELECT serial, checked, loaded FROM zones WHERE name = ?', (_fqdn(zone),)).fetchone()
+        if row is None or row[2] is None:
+            return None
+        return {'serial': row[0], 'checked': row[1], 'loaded': row[2]}
+
+    def mark_checked(self, zone, serial):
+        self.db.execute('UPDATE zones SET serial = ?, checked = ? WHERE name = ?', (serial, time.time(), _fqdn(zone)))
+
+    def replace_records(self, zone, serial, rrsets):
+        """
+        Replace the RRSets of a zone with those of an iterable of API dicts, streamed in chunks.
+
+        The zone keeps its previous RRSets until the new ones are complete, as the whole
+        replacement is one transaction.
+        """
+        zone = _fqdn(zone)
+
+        def write():
+            self.db.execute('DELETE FROM rrsets WHERE zone = ?', (zone,))
+            self.db.execute('DELETE FROM rdata WHERE zone = ?', (zone,))
+            for chunk in _chunks(rrsets):
+                rows, values = [], []
+                for data in chunk:
+                    rrset = RRSet.from_api(data)
+                    rows.append((zone, rrset.owner, rrset.rrtype, rrset.ttl, rrset.pool.kind if rrset.pool else None, codec.dumps(data)))
+                    values.extend((zone, rrset.owner, rrset.rrtype, value) for value in rrset.rdata)
+                self.db.executemany('INSERT INTO rrsets (zone, owner, rrtype, ttl, pool, data) VALUES (?, ?, ?, ?, ?, ?)', rows)
+                self.db.executemany('INSERT INTO rdata (zone, owner, rrtype, value) VALUES (?, ?, ?, ?)', values)
+            now = time.time()
+            self.db.execute(
+                'INSERT INTO zones (name, serial, checked, loaded) VALUES (?, ?, ?, ?) ON CONFLICT (name) DO UPDATE'
+                ' SET serial = excluded.serial, checked = excluded.checked, loaded = excluded.loaded', (zone, serial, now, now))
+        self._transaction(write)
+
+    def zones(self, filters):
+        """Zones as the API lists them, filtered like zone_facts."""
+        where, args = ['data IS NOT NULL'], []
+        if filters.get('name'):
+            where.append("name LIKE ? ESCAPE '\\'")
+            args.append(f"%{_escape(filters['name'].lower())}%")
+        if filters.get('type'):
+            where.append('type = ?')
+            args.append(filters['type'])
+        if filters.get('status') and filters['status'] != 'ALL':
+            where.append('status = ?')
+            args.append(filters['status'])
+        if filters.get('account'):
+            where.append('account = ?')
+            args.append(filters['account'])
+        rows = self.db.execute(f"SELECT data FROM zones WHERE {' AND '.join(where)} ORDER BY name", args)
+        return list(codec.loads(r[0]) for r in rows)
+
+    def records(self, zone, filters):
+        """RRSets of a zone as the API returns them, filtered like record_facts."""
+        where, args = ['zone = ?'], [_fqdn(zone)]
+        if filters.get('owner'):
+            where.append("owner LIKE ? ESCAPE '\\'")
+            args.append(f"%{_escape(filters['owner'].lower())}%")
+        kind = filters.get('kind') or 'ALL'
+        if kind == 'RECORDS':
+            where.append('pool IS NULL')
+        elif kind == 'POOLS':
+            where.append('pool IS NOT NULL')
+        elif kind in POOL_KINDS:
+            where.append('pool = ?')
+            args.append(POOL_KINDS[kind])
+        # like the API, TTL and value filters only apply to plain records
+        if kind in ('ALL', 'RECORDS'):
+            if filters.get('ttl') is not None:
+                where.append('ttl = ?')
+                args.append(filters['ttl'])
+            if filters.get('value'):
+                where.append("EXISTS (SELECT 1 FROM rdata v WHERE v.zone = rrsets.zone AND v.owner = rrsets.owner"
+                             " AND v.rrtype = rrsets.rrtype AND v.value LIKE ? ESCAPE '\\')")
+                args.append(f"%{_escape(filters['value'])}%")
+        order = 'DESC' if filters.get('reverse') else 'ASC'
+        rows = self.db.execute(f"SELECT data FROM rrsets WHERE {' AND '.join(where)} ORDER BY owner {order}, rrtype {order}", args)
+        return list(codec.loads(r[0]) for r in rows)
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def query(path, sql, parameters=None):
+    """
+    Run a query against a snapshot file opened read-only, so the query cannot change it.
+
+    Returns:
+        A list of rows as dictionaries keyed by column name
+    """
+    if not os.path.exists(path):
+        raise OSError(f'No snapshot at {path}')
+    db = sqlite3.connect(f'file:{quote(os.path.abspath(path))}?mode=ro', uri=True, timeout=30)
+    try:
+        cursor = db.execute(sql, parameters or [])
+        columns = list(c[0] for c in cursor.description or [])
+        return list(dict(zip(columns, row)) for row in cursor)
+    except sqlite3.Error as exc:
+        raise ValueError(f'The snapshot query failed: {exc}') from exc
+    finally:
+        db.close()
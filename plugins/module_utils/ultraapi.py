@@ -1,8 +1,26 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
+import json
+import socket
+import threading
+import time
 from ansible.module_utils.basic import env_fallback
 from ipaddress import ip_address
-from .connection import UltraConnection
+from . import clone
+from . import dns
+from .concurrency import Backoff, DEFAULT_WORKERS, file_lock, LockError, PageSizer, RateLimiter, run_parallel, run_streaming, TaskPoller
+from .cassette import replaying
+from .connection import ApiStats
+from .models import RRSet, rrtype_code, Zone
+from .proxy import ProxyConnection
+from . import plan as planner
+from . import ptr
+from .journal import Journal, operation_key
+from .report import ReportTotals, ReportWriter, ZoneStats
+from .sessions import SESSIONS
+from . import snapshot
+from .snapshot import SnapshotStore
+from .validate import validate_record, validate_records, validate_ttl
 
 PROD = 'api.ultradns.com'
 TEST = 'test-api.ultradns.com'
@@ -10,6 +28,7 @@ CONNECTION_SPEC = {
     'use_test': dict(required=False, type='bool', default=False),
     'username': dict(required=False, type='str', fallback=(env_fallback, ['ULTRADNS_USERNAME'])),
     'password': dict(required=False, type='str', fallback=(env_fallback, ['ULTRADNS_PASSWORD']), no_log=True),
+    'proxy_socket': dict(required=False, type='path', fallback=(env_fallback, ['ULTRADNS_PROXY_SOCKET'])),
 }
 
 
@@ -17,11 +36,44 @@ def ultra_connection_spec():
     return {'provider': dict(required=False, type='dict', options=CONNECTION_SPEC)}
 
 
+def ultra_paging_spec():
+    return {
+        'page_size': dict(required=False, type='int', default=1000),
+        'page_timeout': dict(required=False, type='int', default=60),
+        'page_stream_bytes': dict(required=False, type='int'),
+    }
+
+
+def ultra_providers_spec():
+    return {
+        'providers': dict(required=False, type='list', elements='dict', options=CONNECTION_SPEC),
+    }
+
+
+def ultra_journal_spec():
+    return {
+        'journal': dict(required=False, type='path'),
+    }
+
+
+def ultra_snapshot_spec():
+    return {
+        'snapshot': dict(required=False, type='path'),
+        'snapshot_max_age': dict(required=False, type='int', default=300),
+    }
+
+
+class UltraDNSError(Exception):
+    """Raised by the streaming readers when the API returns an error mid-stream."""
+
+
 class UltraDNSModule:
     def __init__(self, spec):
         self.params = spec
         self.connection = None
         self.msg = ''
+        # one module per entry of providers, kept for their API statistics
+        self.accounts = []
 
     def _fail_no_change(self, msg=''):
         return {'changed': False, 'failed': True, 'msg': msg if msg else self.msg}
@@ -42,7 +94,9 @@ class UltraDNSModule:
                              'password': '********'}})
         else:
             d = self.params['provider']
-            missing += list(f'provider.{k}' for k in conn if k not in d or not d[k])
+            # the proxy daemon and a replayed cassette need no credentials from the task
+            if not d.get('proxy_socket') and not replaying():
+                missing += list(f'provider.{k}' for k in conn if k not in d or not d[k])
 
         try:
             if env_fallback('ULTRADNS_USE_TEST'):
@@ -58,7 +112,11 @@ class UltraDNSModule:
             return True
 
         connspec = self.params['provider']
-        if not connspec['username'] or not connspec['password']:
+        if connspec.get('proxy_socket'):
+            return self._connect_proxy(connspec)
+
+        # a replayed cassette answers without logging in, so it needs no credentials
+        if not replaying() and (not connspec['username'] or not connspec['password']):
             self.msg = 'Missing UltraDNS API credentials'
             return False
 
@@ -69,21 +127,93 @@ class UltraDNSModule:
             except Exception:
                 passwd = ''
 
-        self.connection = UltraConnection(host=TEST if connspec['use_test'] else PROD)
+        # logged in connections are pooled per account, so later calls in this process skip the login
         try:
-            self.connection.auth(username=connspec['username'], password=passwd)
+            self.connection = SESSIONS.get(TEST if connspec['use_test'] else PROD, connspec['username'], passwd)
         except Exception as exc:
             self.msg = str(exc)
             return False
+        self.connection.read_timeout = self.params.get('page_timeout')
+        self.connection.stream_threshold = self.params.get('page_stream_bytes')
 
         self.msg = 'connected'
         return True
 
+    def _connect_proxy(self, connspec):
+        # the proxy daemon holds the login, so no credentials are sent from here
+        try:
+            connection = ProxyConnection(connspec['proxy_socket'], self.params.get('page_timeout'))
+        except (OSError, ValueError) as exc:
+            self.msg = f"Unable to reach the UltraDNS proxy at {connspec['proxy_socket']}: {exc}"
+            return False
+
+        host = TEST if connspec['use_test'] else PROD
+        if connection.host != host:
+            self.msg = f"The UltraDNS proxy is connected to {connection.host}, not {host}"
+            return False
+
+        self.connection = connection
+        self.msg = 'connected'
+        return True
+
+    def _api_host(self):
+        # known before connecting, so journaled work can be skipped without logging in
+        provider = self.params.get('provider') or {}
+        return TEST if provider.get('use_test') else PROD
+
+    def _open_journal(self):
+        return Journal(self.params['journal']) if self.params.get('journal') else None
+
+    @staticmethod
+    def _provider_label(provider):
+        return f"{provider.get('username') or ''}@{TEST if provider.get('use_test') else PROD}"
+
+    def for_each_provider(self, func):
+        """
+        Call func with a copy of this module for every entry of O(providers), accounts in parallel.
+
+        The accounts split the O(max_workers) budget between them, so the total number of
+        requests in flight stays the same as for a single account.
+
+        Returns:
+            A list of (label, result) pairs, label being username@host
+        """
+        providers = self.params['providers']
+        workers = self.params.get('max_workers') or DEFAULT_WORKERS
+        share = max(1, workers // len(providers))
+
+        def run(provider):
+            api = UltraDNSModule(dict(self.params, provider=provider, providers=None, max_workers=share))
+            return api, func(api)
+
+        results = run_parallel(run, providers, workers)
+        self.accounts = list(api for api, _ in results)
+        return list((self._provider_label(p), r) for p, (_, r) in zip(providers, results))
+
+    def api_stats(self):
+        """
+        Summarize the API traffic of this module run.
+
+        Returns:
+            A dictionary with an C(api_stats) key to merge into the module result, or
+            an empty dictionary if no connection was made
+        """
+        # accounts sharing a pooled connection are counted once
+        connections = dict((id(c), c) for c in list(a.connection for a in self.accounts) + [self.connection])
+        stats = list(c.stats for c in connections.values() if c and hasattr(c, 'stats'))
+        if not stats:
+            return {}
+        return {'api_stats': ApiStats.combine(stats).as_dict()}
+
     def _check_result(self, result):
         if 'errorCode' in result:
             return self._fail_no_change(result['errorMessage'])
-        else:
-            return self._success()
+
+        res = self._success()
+        # background operations hand back a task to poll for the final status
+        if isinstance(result, dict) and result.get('task_id'):
+            res['task_id'] = result['task_id']
+        return res
 
     def data_in_record(self, data, rrset, type):
         if not isinstance(rrset, list) or not isinstance(data, str):
@@ -130,21 +260,67 @@ class UltraDNSModule:
         else:
             return self._fail_no_change(msg='Not connected to UltraDNS API')
 
-    def primary_zone(self):
-        # check for required fields
-        required = ['name', 'account', 'state']
-        missing = self._check_params(required)
+    def json_patch(self, path, operations):
+        if self.connection:
+            return self._check_result(self.connection.json_patch(path, operations))
+        else:
+            return self._fail_no_change(msg='Not connected to UltraDNS API')
 
-        if missing:
-            return self._fail_no_change(f"Missing required fields: {', '.join(missing)}")
+    def upload(self, path, data, filename):
+        if not self.connection:
+            return self._fail_no_change(msg='Not connected to UltraDNS API')
 
-        # connect to the API
-        if not self.connect():
-            return self._fail_no_change()
+        try:
+            with open(filename, 'rb') as zone_file:
+                files = {
+                    'zone': ('', json.dumps(data), 'application/json'),
+                    'file': ('file', zone_file, 'application/octet-stream')}
+                return self._check_result(self.connection.post_multi_part(path, files))
+        except (IOError, OSError) as exc:
+            return self._fail_no_change(msg=f"Unable to read zone file {filename}: {exc}")
+
+    def _primary_create_info(self):
+        # NEW creates an empty zone, UPLOAD imports a BIND file and TRANSFER pulls the zone from a nameserver
+        create_type = self.params.get('create_type') or 'NEW'
+        info = {'forceImport': 'True', 'createType': create_type}
+        if create_type == 'TRANSFER':
+            transfer = self.params['transfer']
+            nameserver = {'ip': transfer['ip']}
+            if transfer.get('tsigKey'):
+                nameserver.update({
+                    'tsigKey': transfer['tsigKey'],
+                    'tsigKeyValue': transfer['tsigKeyValue'],
+                    'tsigAlgorithm': transfer['tsigAlgorithm']})
+            info['nameServer'] = nameserver
+        return info
+
+    def _check_create_type(self):
+        missing = []
+        create_type = self.params.get('create_type') or 'NEW'
+        if create_type == 'UPLOAD':
+            if not self.params.get('zone_file'):
+                missing.append('zone_file')
+        elif create_type == 'TRANSFER':
+            transfer = self.params.get('transfer')
+            if not isinstance(transfer, dict) or not transfer.get('ip'):
+                missing.append('transfer.ip')
+            else:
+                # if there is one tsig field, they all must be present
+                tsig = ['tsigKey', 'tsigKeyValue', 'tsigAlgorithm']
+                tlist = list(k for k in tsig if transfer.get(k))
+                if tlist and len(tlist) != len(tsig):
+                    missing += list(f'transfer.{k}' for k in tsig if k not in tlist)
+        return missing
 
+    def _upload_through_proxy(self):
+        # the proxy daemon forwards JSON requests only, zone files are multipart uploads
+        return (self.params.get('create_type') == 'UPLOAD'
+                and bool((self.params.get('provider') or {}).get('proxy_socket')))
+
+    def _primary_zone(self, name, account, state):
         res = {}
-        if self.params['state'] == 'present':
-            result = self.connection.get(f"/zones/{self.params['name']}")
+        if state == 'present':
+            result = self.connection.get(f"/zones/{name}")
             if 'errorCode' in result:
                 # 8001 is insufficient permissions
                 if result['errorCode'] == 8001:
@@ -153,30 +329,148 @@ class UltraDNSModule:
                     # zone probably doesn't exist. ok to create
                     primary_data = {
                         'properties': {
-                            'name': self.params['name'],
-                            'accountName': self.params['account'],
+                            'name': name,
+                            'accountName': account,
                             'type': 'PRIMARY'
                         },
-                        'primaryCreateInfo': {
-                            'forceImport': 'True',
-                            'createType': 'NEW'
-                        }}
-                    res = self.create('/zones', primary_data)
+                        'primaryCreateInfo': self._primary_create_info()}
+                    if primary_data['primaryCreateInfo']['createType'] == 'UPLOAD':
+                        res = self.upload('/zones', primary_data, self.params['zone_file'])
+                    else:
+                        res = self.create('/zones', primary_data)
             else:
                 # zone exists, show its details
                 res = self._no_change(f"zone: {result['properties']['name']} type: {result['properties']['type']}")
-        elif self.params['state'] == 'absent':
-            res = self.delete(f"/zones/{self.params['name']}")
+        elif state == 'absent':
+            res = self.delete(f"/zones/{name}")
         else:
-            res = self._fail_no_change(f"Unsupported state {self.params['state']}")
+            res = self._fail_no_change(f"Unsupported state {state}")
         return res
 
-    def secondary_zone(self):
+    def _wait_for_tasks(self, outcome):
+        # poll the background tasks returned by creates and deletes and fold their final status into each result
+        timeout = self.params.get('wait_timeout')
+        poller = TaskPoller(self.connection, Backoff(initial=1.0, maximum=15.0, timeout=300 if timeout is None else timeout))
+        for name, res in outcome.items():
+            if res.get('task_id'):
+                poller.add(name, res['task_id'])
+
+        for name, task in poller.run().items():
+            if not isinstance(task, dict):
+                continue
+            if 'errorCode' in task:
+                outcome[name].update({'failed': True, 'msg': task['errorMessage']})
+            elif task.get('code') in TaskPoller.PENDING:
+                outcome[name].update({'failed': True, 'msg': 'Timed out waiting for task', 'status': task.get('code')})
+            elif task.get('code') == 'ERROR':
+                outcome[name].update({'failed': True, 'msg': task.get('message') or 'Task failed', 'status': task.get('code')})
+            else:
+                outcome[name].update({'status': task.get('code')})
+        return outcome
+
+    def primary_zone(self):
         # check for required fields
         required = ['name', 'account', 'state']
         missing = self._check_params(required)
+        if self.params['state'] == 'present':
+            missing += self._check_create_type()
 
+        if missing:
+            return self._fail_no_change(f"Missing required fields: {', '.join(missing)}")
+        if self.params['state'] == 'present' and self._upload_through_proxy():
+            return self._fail_no_change('Zone files cannot be uploaded through the UltraDNS proxy, unset proxy_socket to use create_type UPLOAD')
+
+        # connect to the API
+        if not self.connect():
+            return self._fail_no_change()
+
+        name = self.params['name']
+        outcome = {name: self._primary_zone(name, self.params['account'], self.params['state'])}
+        return self._wait_for_tasks(outcome)[name]
+
+    def primary_zones(self):
+        """
+        Create or remove a list of primary zones.
+
+        Each entry of O(zones) may override the task level O(account) and O(state), so
+        creates and deletes can be mixed in one call. Requests are submitted concurrently
+        and any background task IDs returned by the API are tracked by a single poller
+        until they finish or O(wait_timeout) expires.
+
+        Returns:
+            A result object with a per-zone outcome under the C(zones) key
+        """
+        # check for required fields
+        required = ['zones']
+        missing = self._check_params(required)
+
+        entries = []
+        for i, zone in enumerate(self.params.get('zones') or []):
+            entry = {
+                'name': zone.get('name'),
+                'account': zone.get('account') or self.params.get('account'),
+                'state': zone.get('state') or self.params.get('state') or 'present'}
+            if not entry['name']:
+                missing.append(f'zones[{i}].name')
+            elif entry['state'] == 'present' and not entry['account']:
+                missing.append(f'zones[{i}].account')
+            entries.append(entry)
+
+        # outcomes are keyed by zone name, so a zone may only be listed once
+        seen, duplicates = set(), set()
+        for name in list(dns.fqdn(e['name']) for e in entries if e['name']):
+            (duplicates if name in seen else seen).add(name)
+        if duplicates:
+            return self._fail_no_change(f"Zones listed more than once: {', '.join(sorted(duplicates))}")
+
+        if any(e['state'] == 'present' for e in entries):
+            missing += self._check_create_type()
+
+        if missing:
+            return self._fail_no_change(f"Missing required fields: {', '.join(missing)}")
+        if any(e['state'] == 'present' for e in entries) and self._upload_through_proxy():
+            return self._fail_no_change('Zone files cannot be uploaded through the UltraDNS proxy, unset proxy_socket to use create_type UPLOAD')
+
+        journal = self._open_journal()
+        keys = dict((e['name'], operation_key('primary_zone', self._api_host(), e, self._primary_create_info())) for e in entries)
+        skipped = list(e for e in entries if journal and journal.done(keys[e['name']]))
+        entries = list(e for e in entries if e not in skipped)
+
+        # connect to the API
+        if entries and not self.connect():
+            return self._fail_no_change()
+
+        workers = self.params.get('max_workers') or DEFAULT_WORKERS
+        results = run_parallel(lambda e: self._primary_zone(e['name'], e['account'], e['state']), entries, workers)
+        outcome = self._wait_for_tasks(dict((e['name'], r) for e, r in zip(entries, results)))
+        self._journal_outcome(journal, keys, outcome)
+        outcome.update((e['name'], self._skipped()) for e in skipped)
+
+        changed = sum(1 for r in outcome.values() if r['changed'])
+        failed = sum(1 for r in outcome.values() if r['failed'])
+        return {
+            'changed': changed > 0,
+            'failed': failed > 0,
+            'msg': f"{len(outcome)} zones: {changed} changed, {failed} failed",
+            'zones': outcome}
+
+    def _skipped(self):
+        res = self._no_change('Already completed according to the journal')
+        res['journal'] = 'skipped'
+        return res
+
+    def _journal_outcome(self, journal, keys, outcome):
+        # remember the entries that went through, the next run starts with the rest
+        if journal is None:
+            return
+        with journal:
+            for name, res in outcome.items():
+                if not res['failed']:
+                    journal.put(keys[name])
+
+    def _check_primary(self):
         # secondary zone requires primary nameserver info
+        missing = []
         tsig = ['tsigKey', 'tsigKeyValue', 'tsigAlgorithm']
         if 'primary' not in self.params or not isinstance(self.params['primary'], dict):
             missing.append('primary')
@@ -191,31 +485,28 @@ class UltraDNSModule:
             # if tsigAlgorithm is present, it must be a valid choice
             if 'tsigAlgorithm' in d and d['tsigAlgorithm'] not in ['hmac-md5', 'sha-256', 'sha-512']:
                 missing.append('primary.tsigAlgorithm')
+        return missing
 
-        if missing:
-            return self._fail_no_change(f"Missing required fields: {', '.join(missing)}")
-
-        # connect to the API
-        if not self.connect():
-            return self._fail_no_change()
-
+    def _primary_nameserver(self):
+        # build the primary nameserver data used for creating or updating
+        primaryns = {'ip': self.params['primary']['ip']}
+        if 'tsigKey' in self.params['primary']:
+            primaryns.update({
+                'tsigKey': self.params['primary']['tsigKey'],
+                'tsigKeyValue': self.params['primary']['tsigKeyValue'],
+                'tsigAlgorithm': self.params['primary']['tsigAlgorithm']})
+        return primaryns
+
+    def _secondary_zone(self, name, state, primaryns):
         res = {}
-        if self.params['state'] == 'present':
-            # build the secondary zone data used for creating or updating
-            primaryns = {'ip': self.params['primary']['ip']}
-            if 'tsigKey' in self.params['primary']:
-                primaryns.update({
-                    'tsigKey': self.params['primary']['tsigKey'],
-                    'tsigKeyValue': self.params['primary']['tsigKeyValue'],
-                    'tsigAlgorithm': self.params['primary']['tsigAlgorithm']})
-
+        if state == 'present':
             secondary_info = {
                 'secondaryCreateInfo': {
                     'primaryNameServers': {
                         'nameServerIpList': {
                             'nameServerIp1': primaryns}}}}
 
-            result = self.connection.get(f"/zones/{self.params['name']}")
+            result = self.connection.get(f"/zones/{name}")
             if 'errorCode' in result:
                 # 8001 is insufficient permissions
                 if result['errorCode'] == 8001:
@@ -224,7 +515,7 @@ class UltraDNSModule:
                     # ok to create secondary zone
                     data = {
                         'properties': {
-                            'name': self.params['name'],
+                            'name': name,
                             'accountName': self.params['account'],
                             'type': 'SECONDARY'}}
                     data.update(secondary_info)
@@ -240,13 +531,140 @@ class UltraDNSModule:
                         res = self.update(f"/zones/{result['properties']['name']}", secondary_info)
                     else:
                         res = self._success()
-        elif self.params['state'] == 'absent':
-            res = self.delete(f"/zones/{self.params['name']}")
+        elif state == 'absent':
+            res = self.delete(f"/zones/{name}")
         else:
-            res = self._fail_no_change(f"Unsupported state {self.params['state']}")
+            res = self._fail_no_change(f"Unsupported state {state}")
         return res
 
+    def secondary_zone(self):
+        # check for required fields
+        required = ['name', 'account', 'state']
+        missing = self._check_params(required)
+        missing += self._check_primary()
+
+        if missing:
+            return self._fail_no_change(f"Missing required fields: {', '.join(missing)}")
+
+        # connect to the API
+        if not self.connect():
+            return self._fail_no_change()
+
+        return self._secondary_zone(self.params['name'], self.params['state'], self._primary_nameserver())
+
+    def _transfer_status(self, name):
+        """
+        Check the transfer status of a secondary zone.
+
+        Returns a tuple of (done, result) where done is False while the zone is
+        still waiting on its first transfer from the primary nameserver.
+        """
+        result = self.connection.get(f"/zones/{name}")
+        if 'errorCode' in result:
+            return True, {'failed': True, 'msg': result['errorMessage']}
+
+        status = result.get('properties', {}).get('status', '')
+        transfer = result.get('transferStatusDetails', {})
+        if status == 'ACTIVE':
+            return True, {'status': status}
+        if transfer.get('lastRefreshStatus') == 'FAILED':
+            return True, {'status': status, 'failed': True, 'msg': transfer.get('lastRefreshStatusMessage') or 'Zone transfer failed'}
+        return False, {'status': status}
+
+    def secondary_zones(self):
+        """
+        Create, update or remove a list of secondary zones sharing the same primary nameserver.
+
+        Zones are processed concurrently with at most O(max_workers) requests in flight.
+        When O(wait) is set, zones that were created or updated are polled until they
+        are active, backing off between rounds while no zone changes state.
+
+        Returns:
+            A result object with a per-zone outcome under the C(zones) key
+        """
+        # check for required fields
+        required = ['zones', 'account', 'state']
+        missing = self._check_params(required)
+        if self.params['state'] == 'present':
+            missing += self._check_primary()
+
+        if missing:
+            return self._fail_no_change(f"Missing required fields: {', '.join(missing)}")
+
+        state = self.params['state']
+        primaryns = self._primary_nameserver() if state == 'present' else {}
+        workers = self.params.get('max_workers') or DEFAULT_WORKERS
+        names = list(dict.fromkeys(self.params['zones']))
+
+        journal = self._open_journal()
+        keys = dict((n, operation_key('secondary_zone', self._api_host(), n, self.params['account'], state, primaryns)) for n in names)
+        skipped = list(n for n in names if journal and journal.done(keys[n]))
+        names = list(n for n in names if n not in skipped)
+
+        # connect to the API
+        if names and not self.connect():
+            return self._fail_no_change()
+
+        results = run_parallel(lambda name: self._secondary_zone(name, state, primaryns), names, workers)
+        outcome = dict(zip(names, results))
+
+        if state == 'present' and self.params.get('wait'):
+            pending = list(n for n in names if outcome[n]['changed'] and not outcome[n]['failed'])
+            timeout = self.params.get('wait_timeout')
+            backoff = Backoff(initial=2.0, maximum=30.0, timeout=300 if timeout is None else timeout)
+            while pending:
+                polled = run_parallel(self._transfer_status, pending, workers)
+                still_pending = []
+                for name, (done, status) in zip(pending, polled):
+                    outcome[name].update(status)
+                    if not done:
+                        still_pending.append(name)
+
+                # go back to the short delay whenever a zone finished this round
+                if len(still_pending) < len(pending):
+                    backoff.reset()
+                pending = still_pending
+                if pending and not backoff.wait():
+                    break
+
+            for name in pending:
+                outcome[name].update({'failed': True, 'msg': 'Timed out waiting for zone transfer'})
+
+        self._journal_outcome(journal, keys, outcome)
+        outcome.update((n, self._skipped()) for n in skipped)
+        changed = sum(1 for r in outcome.values() if r['changed'])
+        failed = sum(1 for r in outcome.values() if r['failed'])
+        return {
+            'changed': changed > 0,
+            'failed': failed > 0,
+            'msg': f"{len(outcome)} zones: {changed} changed, {failed} failed",
+            'zones': outcome}
+
     def record(self):
+        """
+        Create, update or remove a record, skipping it when the journal shows it already completed.
+
+        Returns:
+            A result object
+        """
+        journal = self._open_journal()
+        if journal is None:
+            return self._record()
+
+        with journal:
+            key = operation_key('record', self._api_host(), *list(self.params.get(k) for k in (
+                'zone', 'name', 'type', 'state', 'data', 'rdata', 'ttl', 'solo', 'rdata_mode')))
+            if journal.done(key):
+                res = self._no_change('Already completed according to the journal')
+                res['journal'] = 'skipped'
+                return res
+
+            res = self._record()
+            if not res['failed']:
+                journal.put(key)
+            return res
+
+    def _record(self):
         # check for required fields
         # missing the `data` field is ok for certain delete actions and TTL-only updates. check on that later
         required = ['zone', 'name', 'type', 'state']
@@ -258,6 +676,14 @@ class UltraDNSModule:
         if not self.params['type'] in ['A', 'AAAA', 'CNAME', 'TXT', 'MX', 'NS', 'CAA', 'HTTPS', 'SVCB', 'PTR', 'SOA', 'SRV', 'SSHFP']:
             return self._fail_no_change(f"Unsupported record type {self.params['type']}")
 
+        # bad values are rejected here rather than by the API after a login and a read.
+        # values being removed are left to the API, so a value it holds can always be removed
+        invalid = []
+        if self.params['state'] == 'present':
+            invalid = validate_record(self.params['type'], self._record_values(), self.params.get('ttl'))
+        if invalid:
+            return self._fail_no_change(f"Invalid {self.params['type']} record: {'; '.join(invalid)}")
+
         if self.params['name'] == '@':
             self.params['name'] = self.params['zone']
 
@@ -267,25 +693,104 @@ class UltraDNSModule:
 
         # make a path to the record. going to need it a few times
         path = f"/zones/{self.params['zone']}/rrsets/{self.params['type']}"
+
+        # writers on this controller take turns on the rrset, whichever way they spell its owner.
+        # writers elsewhere are caught by the compare-and-swap loop: every write of an existing
+        # rrset is conditional on the values it was computed from, and when it fails because the
+        # rrset changed since it was read, the change is computed again from the fresh copy.
+        host = getattr(self.connection, 'host', '')
+        try:
+            with file_lock(f"{host}|{dns.fqdn(self.params['zone'])}|{self.params['type']}|{self._owner_fqdn()}"):
+                return self._write_rrset(path)
+        except LockError as exc:
+            return self._fail_no_change(str(exc))
+
+    def _write_rrset(self, path):
+        """Apply the record task to the rrset at path, computing the change again while the rrset changes underneath."""
+        backoff = Backoff(initial=0.5, maximum=8.0, timeout=60)
+        while True:
+            result, res = self._read_rrset(path)
+            if res:
+                return res
+
+            res = self._record_change(path, result)
+            if not res['failed']:
+                return res
+
+            current, error = self._read_rrset(path)
+            if error or current == result:
+                # nothing changed underneath us, this is a genuine failure
+                return res
+            if not backoff.wait():
+                return self._fail_no_change(f"Gave up after concurrent changes to the rrset: {res['msg']}")
+            if hasattr(self.connection, 'stats'):
+                self.connection.stats.add_retry()
+
+    def _read_rrset(self, path):
+        """
+        Read the rrset the record task manages.
+
+        Returns a tuple of (result, failure) where result is an empty dictionary when the
+        rrset does not exist and failure is set when the rrset cannot be managed.
+        """
         # for records, the first thing to do it try to get the record by owner and type.
         # records can be simple records, multiple records with rdata in a list or pools.
         result = self.connection.get(f"{path}/{self.params['name']}")
         if 'errorCode' in result:
             # 8001 is insufficient permissions
             if result['errorCode'] == 8001:
-                return self._fail_no_change(result['errorMessage'])
+                return {}, self._fail_no_change(result['errorMessage'])
             else:
                 result = {}
         else:
             # if the record is a pool, check the profile context, if it's not an rdpool, fail
             if 'profile' in result['rrSets'][0]:
                 if result['rrSets'][0]['profile']['@context'] != 'http://schemas.ultradns.com/RDPool.jsonschema':
-                    return self._fail_no_change('Advanced traffic management records are not supported')
-
+                    return {}, self._fail_no_change('Advanced traffic management records are not supported')
+        return result, {}
+
+    def _record_values(self):
+        # the rdata list and the single data string are two ways of giving the values of the rrset
+        if self.params.get('rdata'):
+            return list(dict.fromkeys(self.params['rdata']))
+        if self.params.get('data'):
+            return [self.params['data']]
+        return []
+
+    def _rdata_mode(self):
+        # solo, CNAME and SOA always replace the whole rrset
+        mode = self.params.get('rdata_mode') or 'append'
+        if mode == 'append' and (self.params.get('solo') or self.params['type'] in ['CNAME', 'SOA']):
+            mode = 'replace'
+        return mode
+
+    def _missing_values(self, values, rdata):
+        return list(v for v in values if not self.data_in_record(v, rdata, self.params['type']))
+
+    def _same_rdata(self, values, rdata, ordered):
+        if len(values) != len(rdata):
+            return False
+        if ordered:
+            if self.params['type'] in ['A', 'AAAA']:
+                return list(ip_address(v) for v in values) == list(ip_address(r) for r in rdata)
+            return list(values) == list(rdata)
+        return not self._missing_values(values, rdata) and not self._missing_values(rdata, values)
+
+    def _rdpool_profile(self, rrset, rdata):
+        # multiple A/AAAA values are managed as an rdpool, keep an existing profile or start a round robin one
+        if self.params['type'] not in ['A', 'AAAA'] or len(rdata) < 2:
+            return {}
+        if isinstance(rrset.get('profile'), dict):
+            return {'profile': rrset['profile']}
+        return {'profile': {'@context': 'http://schemas.ultradns.com/RDPool.jsonschema', 'order': 'ROUND_ROBIN'}}
+
+    def _record_change(self, path, result):
         res = {}
+        values = self._record_values()
+        rrpath = f"{path}/{self.params['name']}"
         if self.params['state'] == 'present':
             # Check if this is a TTL-only update (data not provided but ttl is)
-            if ('data' not in self.params or not self.params['data']) and 'ttl' in self.params and self.params['ttl']:
+            if not values and 'ttl' in self.params and self.params['ttl']:
                 if not result:
                     return self._fail_no_change('Record does not exist. Cannot update TTL only.')
 
@@ -295,131 +800,285 @@ class UltraDNSModule:
 
                 # Use PATCH to update only the TTL
                 data = {'ttl': self.params['ttl']}
-                return self.patch(f"{path}/{self.params['name']}", data)
+                return self.patch(rrpath, data)
 
             # Regular record update with data
-            if 'data' not in self.params or not self.params['data']:
+            if not values:
                 return self._fail_no_change('Missing required field: data')
 
+            mode = self._rdata_mode()
+            if self.params['type'] in ['CNAME', 'SOA'] and len(values) > 1:
+                return self._fail_no_change(f"A {self.params['type']} record can only have one value")
+
             if not result:
                 # record probably doesn't exist. ok to create
-                data = {'rdata': [self.params['data']]}
+                data = {'rdata': values}
                 if self.params['ttl']:
                     data.update({'ttl': self.params['ttl']})
-
-                res = self.create(f"{path}/{self.params['name']}", data)
+                data.update(self._rdpool_profile({}, values))
+
+                res = self.create(rrpath, data)
+            elif mode == 'append':
+                # add the values that are missing from the rrset, keeping the existing ones
+                rrset = result['rrSets'][0]
+                missing = self._missing_values(values, rrset['rdata'])
+                if not missing:
+                    if self.params['ttl'] and self.params['ttl'] != rrset['ttl']:
+                        data = {'ttl': self.params['ttl'], 'rdata': rrset['rdata']}
+                        data.update(self._rdpool_profile(rrset, rrset['rdata']))
+                        return self._put_rrset(rrpath, rrset, data)
+                    return self._no_change()
+
+                # a single A/AAAA record becomes an rdpool when it grows, that needs the full PUT with a profile
+                if self.params['type'] not in ['A', 'AAAA'] or isinstance(rrset.get('profile'), dict):
+                    operations = list({'op': 'add', 'path': '/rdata/-', 'value': v} for v in missing)
+                    if self.params['ttl'] and self.params['ttl'] != rrset['ttl']:
+                        operations.append({'op': 'replace', 'path': '/ttl', 'value': self.params['ttl']})
+                    return self._patch_rrset(rrpath, operations, self._append_to_rrset)
+                return self._append_to_rrset(rrpath, rrset)
             else:
-                # record exists.  check its properties (pools, etc)
-                # if data is already in the rdata list, return  no change
-                # for CNAME, SOA:
-                #   rdata is always a list of 1, replace
-                # for solo=True:
-                #   rdata is always a list of 1, replace
-                # for type in A, AAAA:
-                #   when do i create an rdpool vs replace existing? need some flag for that
-                # for others:
-                #   add to the rdata list or replace the entire list
+                # replace compares the values as a set, exact also compares their order
+                rrset = result['rrSets'][0]
                 data = {}
-                if self.params['solo'] or self.params['type'] in ['CNAME', 'SOA']:
-                    if len(result['rrSets'][0]['rdata']) == 1:
-                        if result['rrSets'][0]['rdata'][0] != self.params['data']:
-                            data = {'rdata': [self.params['data']]}
-                    else:
-                        data = {'rdata': [self.params['data']]}
-
-                    # Only add TTL if we're already making a change or if TTL is different
-                    if data or (self.params['ttl'] and self.params['ttl'] != result['rrSets'][0]['ttl']):
-                        if self.params['ttl']:
-                            data.update({'ttl': self.params['ttl']})
-                        elif data:  # If making rdata change but no TTL specified, preserve existing TTL
-                            data.update({'ttl': result['rrSets'][0]['ttl']})
-
-                    if not data:
-                        return self._no_change()
-                elif self.data_in_record(self.params['data'], result['rrSets'][0]['rdata'], self.params['type']):
-                    if self.params['ttl'] and self.params['ttl'] != result['rrSets'][0]['ttl']:
-                        data = {'ttl': self.params['ttl'], 'rdata': result['rrSets'][0]['rdata']}
-                    else:
-                        return self._no_change()
-                else:
-                    data = {'rdata': result['rrSets'][0]['rdata']}
-                    data['rdata'].append(self.params['data'])
+                if not self._same_rdata(values, rrset['rdata'], ordered=(mode == 'exact')):
+                    data = {'rdata': values}
+
+                # Only add TTL if we're already making a change or if TTL is different
+                if data or (self.params['ttl'] and self.params['ttl'] != rrset['ttl']):
                     if self.params['ttl']:
                         data.update({'ttl': self.params['ttl']})
-                    else:
-                        data.update({'ttl': result['rrSets'][0]['ttl']})
+                    else:  # If making rdata change but no TTL specified, preserve existing TTL
+                        data.update({'ttl': rrset['ttl']})
+                    data.setdefault('rdata', rrset['rdata'])
+                    data.update(self._rdpool_profile(rrset, data['rdata']))
 
-                    if self.params['type'] in ['A', 'AAAA'] and len(data['rdata']) > 1:
-                        if 'profile' in result['rrSets'][0] and isinstance(result['rrSets'][0]['profile'], dict):
-                            data.update({'profile': result['rrSets'][0]['profile']})
-                        else:
-                            data.update({'profile': {'@context': 'http://schemas.ultradns.com/RDPool.jsonschema', 'order': 'ROUND_ROBIN'}})
+                if not data:
+                    return self._no_change()
 
-                res = self.update(f"{path}/{self.params['name']}", data)
+                res = self._put_rrset(rrpath, rrset, data)
         elif self.params['state'] == 'absent':
             # if the type is SOA, fail
-            # if the record does not exist or data is not in the rdata simply return
-            # if the data is in the rdata list and the length of the rdata list is 1
+            # if the record does not exist or none of the values are in the rdata simply return
+            # if no values are left after removing them
             #   delete the record  -- simple records and rdpools are the same call
-            # if the data is in the rdata list and the length of the rdata list greater than 1
-            #   build an update payload with the data removed from the rdata list
-            #   if the record is an rdpool and the remaining rdata list is greater than 1
-            #     add a `profile` payload
-            #   update the record with PUT
+            # otherwise remove only the matching values with a patch
+            #   if the record is an rdpool and only one value is left, PUT it back as a simple record
             if self.params['type'] == 'SOA':
                 res = self._fail_no_change('Cannot delete SOA record')
             elif not result:
                 res = self._no_change()
-            elif 'data' not in self.params or not self.params['data']:
-                res = self.delete(f"{path}/{self.params['name']}")
-            elif not self.data_in_record(self.params['data'], result['rrSets'][0]['rdata'], self.params['type']):
+            elif not values:
+                res = self.delete(rrpath)
+            elif len(self._missing_values(values, result['rrSets'][0]['rdata'])) == len(values):
                 res = self._no_change()
             else:
-                if len(result['rrSets'][0]['rdata']) == 1:
-                    res = self.delete(f"{path}/{self.params['name']}")
+                rrset = result['rrSets'][0]
+                remaining = self._remaining_values(values, rrset['rdata'])
+                # an rdpool shrinking to one value turns back into a simple record, that needs the full PUT
+                if len(remaining) > 1 or (remaining and not isinstance(rrset.get('profile'), dict)):
+                    operations = []
+                    # remove from the end so the earlier indexes stay valid, test guards against concurrent edits
+                    for i in reversed(range(len(rrset['rdata']))):
+                        if rrset['rdata'][i] not in remaining:
+                            operations.append({'op': 'test', 'path': f'/rdata/{i}', 'value': rrset['rdata'][i]})
+                            operations.append({'op': 'remove', 'path': f'/rdata/{i}'})
+                    res = self._patch_rrset(rrpath, operations, self._remove_from_rrset)
                 else:
-                    data = {
-                        'ttl': result['rrSets'][0]['ttl'],
-                        'rdata': self.remove_from_record(self.params['data'], result['rrSets'][0]['rdata'], self.params['type'])}
-                    if 'profile' in result['rrSets'][0] and isinstance(result['rrSets'][0]['profile'], dict) and len(data['rdata']) > 1:
-                        data.update({'profile': result['rrSets'][0]['profile']})
-                    res = self.update(f"{path}/{self.params['name']}", data)
+                    res = self._remove_from_rrset(rrpath, rrset)
         else:
             res = self._fail_no_change(f"Unsupported state {self.params['state']}")
         return res
 
-    def get_zones(self):
+    def _remaining_values(self, values, rdata):
+        for value in values:
+            rdata = self.remove_from_record(value, rdata, self.params['type'])
+        return rdata
+
+    def _append_to_rrset(self, path, rrset):
+        # PUT the whole rrset with the missing values appended
+        missing = self._missing_values(self._record_values(), rrset['rdata'])
+        if not missing and (not self.params['ttl'] or self.params['ttl'] == rrset['ttl']):
+            return self._no_change()
+
+        data = {'rdata': list(rrset['rdata']) + missing}
+        if self.params['ttl']:
+            data.update({'ttl': self.params['ttl']})
+        else:
+            data.update({'ttl': rrset['ttl']})
+        data.update(self._rdpool_profile(rrset, data['rdata']))
+
+        return self._put_rrset(path, rrset, data)
+
+    def _remove_from_rrset(self, path, rrset):
+        # PUT the whole rrset without the values, or delete it when nothing is left
+        values = self._record_values()
+        if len(self._missing_values(values, rrset['rdata'])) == len(values):
+            return self._no_change()
+
+        data = {
+            'ttl': rrset['ttl'],
+            'rdata': self._remaining_values(values, rrset['rdata'])}
+        if not data['rdata']:
+            return self.delete(path)
+        if 'profile' in rrset and isinstance(rrset['profile'], dict) and len(data['rdata']) > 1:
+            data.update({'profile': rrset['profile']})
+        return self._put_rrset(path, rrset, data)
+
+    def _put_rrset(self, path, rrset, data):
         """
-        Retrieve all zones from the UltraDNS API with pagination support.
+        Replace an RRSet with data, but only if it still holds the rdata and profile it was read with.
 
-        This function handles cursor-based pagination automatically, making multiple
-        requests as needed to retrieve all zones. The default limit is set to 1000
-        zones per request, and filtering is done based on provided parameters.
+        The write is a JSON Patch whose test operations guard the values the change was computed
+        from, so another writer's change is never silently overwritten. If the API rejects the
+        patch, the RRSet is read again and PUT only when it is unchanged; otherwise the write
+        fails and the record task computes it again from the fresh copy.
+        """
+        operations = [{'op': 'test', 'path': '/rdata', 'value': rrset['rdata']}]
+        if 'profile' in rrset:
+            operations.append({'op': 'test', 'path': '/profile', 'value': rrset['profile']})
+        operations.append({'op': 'replace', 'path': '/rdata', 'value': data['rdata']})
+        operations.append({'op': 'replace', 'path': '/ttl', 'value': data['ttl']})
+        if 'profile' in data:
+            operations.append({'op': 'add', 'path': '/profile', 'value': data['profile']})
+        elif 'profile' in rrset:
+            operations.append({'op': 'remove', 'path': '/profile'})
+        res = self.json_patch(path, operations)
+        if not res['failed']:
+            return res
+
+        result = self.connection.get(path)
+        if 'errorCode' in result:
+            return self._fail_no_change(result['errorMessage'])
+        current = result['rrSets'][0]
+        if current['rdata'] != rrset['rdata'] or current.get('profile') != rrset.get('profile'):
+            return self._fail_no_change('The rrset changed while it was being written')
+        return self.update(path, data)
 
-        Returns:
-            A list of zone objects from the API response
+    def _patch_rrset(self, path, operations, fallback):
         """
-        # Connect to the API
-        if not self.connect():
-            return [], self._fail_no_change()
+        Apply a JSON Patch to an RRSet so only the changed values are sent.
 
-        # Initialize empty zones list and base URL
-        all_zones = []
-        base_path = '/v3/zones'
+        If the API rejects the patch (unsupported, or a test operation failed because
+        another writer changed the RRSet), the RRSet is read again and fallback is called
+        with the fresh copy to compute and PUT the full RRSet instead.
+        """
+        res = self.json_patch(path, operations)
+        if not res['failed']:
+            return res
 
+        result = self.connection.get(path)
+        if 'errorCode' in result:
+            return self._fail_no_change(result['errorMessage'])
+        return fallback(path, result['rrSets'][0])
+
+    def _propagation_nameservers(self):
+        # explicit nameservers may carry a port, e.g. 127.0.0.1:5353 for a local stub
+        servers = []
+        names = self.params.get('propagation_nameservers') or []
+        if not names:
+            zone = self.params['zone']
+            result = self.connection.get(f"/zones/{zone}/rrsets/NS/{zone}")
+            if 'errorCode' in result:
+                return [], result['errorMessage']
+            names = RRSet.first(result).rdata
+
+        for name in names:
+            host, port = name, 53
+            if name.count(':') == 1:
+                host, port = name.split(':')[0], int(name.split(':')[1])
+            elif name.startswith('[') and ']:' in name:
+                host, port = name[1:].split(']:')[0], int(name.split(']:')[1])
+            try:
+                address = socket.getaddrinfo(host.rstrip('.'), port, proto=socket.IPPROTO_UDP)[0][4][0]
+            except socket.gaierror as exc:
+                return [], f"Unable to resolve nameserver {host}: {exc}"
+            servers.append((name, address, port))
+        return servers, ''
+
+    def _owner_fqdn(self):
+        name, zone = self.params['name'], dns.fqdn(self.params['zone'])
+        if name.endswith('.') or dns.fqdn(name) == zone:
+            return dns.fqdn(name)
+        return f"{dns.fqdn(name)}{zone}"
+
+    def wait_for_propagation(self):
+        """
+        Wait until the zone's nameservers answer with the rrset as it is now stored in UltraDNS.
+
+        Every nameserver is queried directly and in parallel, each with its own backoff, until it
+        serves the expected answer or O(propagation_timeout) expires. Types the resolver cannot
+        compare value by value are checked by waiting for the SOA serial to catch up instead.
+
+        Returns:
+            A result object with the per-nameserver convergence under the C(propagation) key
+        """
+        zone = self.params['zone']
+        rrtype = self.params['type']
+        owner = self._owner_fqdn()
+        servers, msg = self._propagation_nameservers()
+        if not servers:
+            return self._fail_no_change(msg or 'No nameservers to check')
+
+        # the API holds the state the nameservers should converge on
+        expected, serial = [], None
+        if rrtype in dns.RRTYPES and rrtype != 'SOA':
+            result = self.connection.get(f"/zones/{zone}/rrsets/{rrtype}/{self.params['name']}")
+            if 'errorCode' not in result:
+                expected = dns.normalize(rrtype, RRSet.first(result).rdata)
+        else:
+            owner, rrtype = dns.fqdn(zone), 'SOA'
+            result = self.connection.get(f"/zones/{zone}/rrsets/SOA/{zone}")
+            if 'errorCode' in result:
+                return self._fail_no_change(result['errorMessage'])
+            serial = RRSet.first(result).serial
+
+        timeout = self.params.get('propagation_timeout')
+        started = time.monotonic()
+
+        def watch(server):
+            label, address, port = server
+            backoff = Backoff(initial=1.0, maximum=15.0, timeout=300 if timeout is None else timeout)
+            attempts, error = 0, ''
+            while True:
+                attempts += 1
+                try:
+                    rcode, values = dns.query(address, owner, rrtype, port=port)
+                    if serial is not None:
+                        converged = bool(values) and int(values[0].split()[2]) >= serial
+                    else:
+                        converged = values == expected and (rcode == 0 or (rcode == dns.NXDOMAIN and not expected))
+                    error = ''
+                except (OSError, dns.DNSError, ValueError, IndexError) as exc:
+                    converged, error = False, str(exc)
+
+                if converged:
+                    return label, {'converged': True, 'seconds': round(time.monotonic() - started, 3), 'attempts': attempts}
+                if not backoff.wait():
+                    status = {'converged': False, 'seconds': round(time.monotonic() - started, 3), 'attempts': attempts}
+                    if error:
+                        status['error'] = error
+                    return label, status
+
+        propagation = dict(run_parallel(watch, servers, len(servers)))
+        pending = list(k for k, v in propagation.items() if not v['converged'])
+        res = self._no_change() if not pending else self._fail_no_change(f"Change not visible on {', '.join(pending)}")
+        res['propagation'] = propagation
+        return res
+
+    def _zones_path(self, filters, limit):
         # Build the query string for filters
         query_parts = []
 
         # Add limit parameter
-        query_parts.append('limit=1000')
+        query_parts.append(f'limit={limit}')
 
         # Filter by name (partial match)
-        if 'name' in self.params and self.params['name']:
-            query_parts.append(f"q=name:{self.params['name']}")
+        if filters.get('name'):
+            query_parts.append(f"q=name:{filters['name']}")
 
         # Filter by zone type
-        if 'type' in self.params and self.params['type']:
-            zone_type = self.params['type']
+        if filters.get('type'):
+            zone_type = filters['type']
             if zone_type in ['PRIMARY', 'SECONDARY', 'ALIAS']:
                 if 'q=' in ' '.join(query_parts):
                     # Append to existing q parameter
@@ -429,8 +1088,8 @@ class UltraDNSModule:
                     query_parts.append(f"q=zone_type:{zone_type}")
 
         # Filter by status
-        if 'status' in self.params and self.params['status']:
-            status = self.params['status']
+        if filters.get('status'):
+            status = filters['status']
             if status in ['ACTIVE', 'SUSPENDED', 'ALL']:
                 if 'q=' in ' '.join(query_parts):
                     # Append to existing q parameter
@@ -440,9 +1099,9 @@ class UltraDNSModule:
                     query_parts.append(f"q=zone_status:{status}")
 
         # Filter by account name
-        if 'account' in self.params and self.params['account']:
+        if filters.get('account'):
             # URL-encode spaces in account name
-            account = self.params['account'].replace(' ', '%20')
+            account = filters['account'].replace(' ', '%20')
             if 'q=' in ' '.join(query_parts):
                 # Append to existing q parameter
                 q_index = next(i for i, part in enumerate(query_parts) if part.startswith('q='))
@@ -451,8 +1110,8 @@ class UltraDNSModule:
                 query_parts.append(f"q=account_name:{account}")
 
         # Filter by network
-        if 'network' in self.params and self.params['network']:
-            network = self.params['network']
+        if filters.get('network'):
+            network = filters['network']
             if network in ['ultra1', 'ultra2']:
                 if 'q=' in ' '.join(query_parts):
                     # Append to existing q parameter
@@ -461,46 +1120,161 @@ class UltraDNSModule:
                 else:
                     query_parts.append(f"q=network:{network}")
 
-        # Build initial path with query parameters
-        path = base_path
-        if query_parts:
-            path = f"{base_path}?{'&'.join(query_parts)}"
+        # A raw v3 zones query, e.g. zone_type:PRIMARY+account_name:example
+        if filters.get('query'):
+            if 'q=' in ' '.join(query_parts):
+                # Append to existing q parameter
+                q_index = next(i for i, part in enumerate(query_parts) if part.startswith('q='))
+                query_parts[q_index] = f"{query_parts[q_index]}+{filters['query']}"
+            else:
+                query_parts.append(f"q={filters['query']}")
 
-        # Track if we have more data to fetch
-        has_more = True
-        next_path = path
+        return f"/v3/zones?{'&'.join(query_parts)}"
 
-        while has_more:
-            # Get zones with current path
-            result = self.connection.get(next_path)
+    def _page(self, path, key):
+        """
+        Request one page and return its items and the rest of the response.
+
+        Connections that can stream hand the items over as they are decoded; the rest of the
+        response (paging info or an error) is only complete once the items have been consumed.
+        """
+        stream = getattr(self.connection, 'stream', None)
+        if stream is None:
+            result = self.connection.get(path)
+            return (result.get(key) or [] if isinstance(result, dict) else []), result
+        meta = {}
+        return stream(path, key, meta), meta
+
+    def _pager(self, limit):
+        # page_size and page_timeout come from the paging options of the read modules
+        return PageSizer(size=limit or self.params.get('page_size') or 1000)
+
+    def _record_page_size(self, path, sizer):
+        if hasattr(self.connection, 'stats'):
+            self.connection.stats.set_page_size('GET', path, sizer.size)
+
+    def iter_zones(self, filters=None, limit=None):
+        """
+        Stream zones from the UltraDNS API one page at a time.
+
+        Pages are fetched lazily as the caller iterates, so a caller that stops early never
+        requests the remaining pages and only one page is held in memory at a time. The page
+        size adapts to the observed latency and payload size, and a page that times out is
+        requested again with a smaller size, skipping the zones already yielded.
+
+        Args:
+            filters: A dictionary with any of the name, type, status, account and network filters,
+                and a raw v3 zones query under query
+            limit: The number of zones to request in the first page, O(page_size) by default
+
+        Yields:
+            Zone objects from the API response
+
+        Raises:
+            UltraDNSError: The API returned an error for one of the pages
+        """
+        filters = filters or {}
+        sizer = self._pager(limit)
+        cursor = None
+
+        while True:
+            path = self._zones_path(filters, sizer.size) + (f"&cursor={cursor}" if cursor else '')
+            start, count, skip = time.monotonic(), 0, 0
+            while True:
+                try:
+                    # Get zones with current path, the page is complete once its zones have been read
+                    zones, result = self._page(path, 'zones')
+                    for zone in zones:
+                        count += 1
+                        if count > skip:
+                            yield zone
+                    break
+                except TimeoutError:
+                    if not sizer.shrink():
+                        raise UltraDNSError(f"Timed out listing zones with a page size of {sizer.size}")
+                    # the same cursor with a smaller page starts with the zones already yielded
+                    path = self._zones_path(filters, sizer.size) + (f"&cursor={cursor}" if cursor else '')
+                    start, count, skip = time.monotonic(), 0, max(skip, count)
 
             # Check if response has an error
+            if isinstance(result, list) and result and isinstance(result[0], dict) and 'errorCode' in result[0]:
+                raise UltraDNSError(result[0].get('errorMessage', 'Unknown error'))
+            if not isinstance(result, dict):
+                return
             if 'errorCode' in result:
-                return [], self._fail_no_change(result['errorMessage'])
+                if not count and sizer.reject():
+                    continue
+                raise UltraDNSError(result['errorMessage'])
 
-            # Add zones from current response to our collection
-            if 'zones' in result and isinstance(result['zones'], list):
-                all_zones.extend(result['zones'])
+            sizer.observe(time.monotonic() - start, count, result.pop('_received', 0))
+            self._record_page_size('/v3/zones', sizer)
 
             # Check for cursorInfo to determine if more data is available
             if 'cursorInfo' in result and result['cursorInfo'].get('next'):
                 cursor = result['cursorInfo']['next']
-                # Determine if the path already has query parameters
-                if '?' in next_path:
-                    if 'cursor=' in next_path:
-                        # Replace existing cursor parameter
-                        next_path = next_path.split('cursor=', maxsplit=1)[0] + f"cursor={cursor}"
-                    else:
-                        # Add cursor parameter
-                        next_path = f"{next_path}&cursor={cursor}"
-                else:
-                    # Add cursor as first parameter
-                    next_path = f"{next_path}?cursor={cursor}"
             else:
-                has_more = False
+                return
+
+    def get_zones(self):
+        """
+        Retrieve all zones from the UltraDNS API with pagination support.
+
+        This function handles cursor-based pagination automatically, making multiple
+        requests as needed to retrieve all zones. The default limit is set to 1000
+        zones per request, and filtering is done based on provided parameters.
+
+        Returns:
+            A list of zone objects from the API response
+        """
+        if self.params.get('providers'):
+            return self._zones_of_providers()
+        # the network of a zone is not part of the listing, so only the API can filter on it
+        if self.params.get('snapshot') and not self.params.get('network'):
+            return self._snapshot_zones()
+
+        # Connect to the API
+        if not self.connect():
+            return [], self._fail_no_change()
+
+        try:
+            all_zones = list(self.iter_zones(self.params))
+        except UltraDNSError as exc:
+            return [], self._fail_no_change(str(exc))
 
         return all_zones, self._no_change(f"Retrieved {len(all_zones)} zones")
 
+    def _snapshot_max_age(self):
+        max_age = self.params.get('snapshot_max_age')
+        return 300 if max_age is None else max_age
+
+    def _snapshot_zones(self):
+        with SnapshotStore(self.params['snapshot']) as store:
+            age = store.zones_age()
+            if age is None or age > self._snapshot_max_age():
+                if not self.connect():
+                    return [], self._fail_no_change()
+                try:
+                    # the snapshot keeps every zone and filters them itself
+                    store.replace_zones(list(self.iter_zones({'status': 'ALL'})))
+                except UltraDNSError as exc:
+                    return [], self._fail_no_change(str(exc))
+            zones = store.zones(self.params)
+        return zones, self._no_change(f"Retrieved {len(zones)} zones from the snapshot")
+
+    def _zones_of_providers(self):
+        # a zone visible to several of the accounts is listed once
+        zones, failed = {}, {}
+        for label, (found, res) in self.for_each_provider(lambda api: api.get_zones()):
+            if res['failed']:
+                failed[label] = res['msg']
+            for zone in found:
+                zones.setdefault(zone['properties']['name'], zone)
+
+        if failed:
+            return list(zones.values()), self._fail_no_change(
+                '; '.join(f'{label}: {msg}' for label, msg in failed.items()))
+        return list(zones.values()), self._no_change(f"Retrieved {len(zones)} zones from {len(self.accounts)} accounts")
+
     def get_zone_metadata(self):
         """
         Retrieve metadata for a list of specific zones from the UltraDNS API.
@@ -561,108 +1335,109 @@ class UltraDNSModule:
 
         return zone_metadata, self._no_change(f"Retrieved metadata for {len(zone_metadata)} out of {len(zone_names)} requested zones")
 
-    def get_records(self):
-        """
-        Retrieve RRSet records for a specified zone from the UltraDNS API with offset-based pagination.
-
-        This function handles offset-based pagination automatically, making multiple
-        requests as needed to retrieve all records. The default limit is set to 1000
-        records per request, and filtering is done based on provided parameters.
-
-        Returns:
-            A list of RRSet records from the API response plus a result object indicating success or failure
-        """
-        # Check for required fields
-        required = ['zone']
-        missing = self._check_params(required)
-
-        if missing:
-            return [], self._fail_no_change(f"Missing required fields: {', '.join(missing)}")
-
-        # Connect to the API
-        if not self.connect():
-            return [], self._fail_no_change()
-
-        # Initialize empty records list and base URL
-        all_records = []
-        zone_name = self.params['zone']
+    def _records_path(self, zone_name, filters, limit):
         base_path = f"/v3/zones/{zone_name}/rrsets"
 
         # Build the query parameters
         query_parts = []
 
         # Always include a limit parameter
-        query_parts.append('limit=1000')
+        query_parts.append(f'limit={limit}')
 
         # Build the 'q' parameter for filtering
         q_filters = []
 
         # Filter by owner (partial match)
-        if 'owner' in self.params and self.params['owner']:
-            q_filters.append(f"owner:{self.params['owner']}")
+        if filters.get('owner'):
+            q_filters.append(f"owner:{filters['owner']}")
 
         # Filter by TTL (exact match) - only for RECORDS type
-        if 'ttl' in self.params and self.params['ttl'] is not None:
-            if not self.params.get('kind') or self.params.get('kind') in ['ALL', 'RECORDS']:
-                q_filters.append(f"ttl:{self.params['ttl']}")
+        if filters.get('ttl') is not None:
+            if not filters.get('kind') or filters.get('kind') in ['ALL', 'RECORDS']:
+                q_filters.append(f"ttl:{filters['ttl']}")
 
         # Filter by value (partial match) - only for RECORDS type
-        if 'value' in self.params and self.params['value']:
-            if not self.params.get('kind') or self.params.get('kind') in ['ALL', 'RECORDS']:
-                q_filters.append(f"value:{self.params['value']}")
+        if filters.get('value'):
+            if not filters.get('kind') or filters.get('kind') in ['ALL', 'RECORDS']:
+                q_filters.append(f"value:{filters['value']}")
 
         # Add q parameter if filters exist
         if q_filters:
             query_parts.append(f"q={'+'.join(q_filters)}")
 
         # Filter by kind (type of RRSets)
-        if 'kind' in self.params and self.params['kind']:
-            kind = self.params['kind']
+        if filters.get('kind'):
+            kind = filters['kind']
             valid_kinds = ['ALL', 'RECORDS', 'POOLS', 'RD_POOLS', 'DIR_POOLS', 'SB_POOLS', 'TC_POOLS']
             if kind in valid_kinds:
                 query_parts.append(f"kind={kind}")
 
         # Add reverse parameter if specified
-        if 'reverse' in self.params and self.params['reverse']:
+        if filters.get('reverse'):
             query_parts.append('reverse=true')
 
         # Add systemGeneratedStatus parameter if specified
         # This adds status indicators (systemGenerated array) to records rather than filtering them
-        if 'sys_generated' in self.params and self.params['sys_generated']:
+        if filters.get('sys_generated'):
             query_parts.append('systemGeneratedStatus=true')
 
-        # Build initial path with query parameters
-        path = base_path
-        if query_parts:
-            path = f"{base_path}?{'&'.join(query_parts)}"
+        return f"{base_path}?{'&'.join(query_parts)}"
+
+    def iter_records(self, zone_name, filters=None, limit=None):
+        """
+        Stream RRSets of a zone from the UltraDNS API one page at a time.
+
+        Pages are fetched lazily as the caller iterates. A zone without matching records
+        (error code 70002) yields nothing rather than raising. The page size adapts like
+        in iter_zones(), and a page that times out continues from the last RRSet yielded.
+
+        Args:
+            zone_name: The zone to read
+            filters: A dictionary with any of the owner, ttl, value, kind, reverse and sys_generated filters
+            limit: The number of RRSets to request in the first page, O(page_size) by default
+
+        Yields:
+            RRSet objects from the API response
+
+        Raises:
+            UltraDNSError: The API returned an error for one of the pages
+        """
+        filters = filters or {}
+        sizer = self._pager(limit)
 
         # Track offset and total count for pagination
         offset = 0
         total_count = None
 
         while total_count is None or offset < total_count:
-            # Build current request path with offset
-            current_path = path
-            if '?' in current_path:
-                current_path += f"&offset={offset}"
-            else:
-                current_path += f"?offset={offset}"
-
-            # Get records with current path
-            result = self.connection.get(current_path)
+            start, count = time.monotonic(), 0
+            try:
+                # Get records with current offset, the page is complete once its rrsets have been read
+                rrsets, result = self._page(f"{self._records_path(zone_name, filters, sizer.size)}&offset={offset}", 'rrSets')
+                for rrset in rrsets:
+                    count += 1
+                    yield rrset
+            except TimeoutError:
+                if not sizer.shrink():
+                    raise UltraDNSError(f"Timed out retrieving records of {zone_name} with a page size of {sizer.size}")
+                offset += count
+                continue
 
             # Check if response has an error
             if isinstance(result, list) and result and 'errorCode' in result[0]:
-                return [], self._fail_no_change(f"Error retrieving records: {result[0].get('errorMessage', 'Unknown error')}")
+                raise UltraDNSError(f"Error retrieving records: {result[0].get('errorMessage', 'Unknown error')}")
             elif isinstance(result, dict) and 'errorCode' in result:
-                # For "no records found" we should return an empty list without failing
+                # For "no records found" we should stop without failing
                 if result.get('errorCode') == 70002:  # Data not found error code
-                    return [], self._no_change("No records found for the specified zone and filters")
-                return [], self._fail_no_change(f"Error retrieving records: {result.get('errorMessage', 'Unknown error')}")
+                    return
+                if not count and sizer.reject():
+                    continue
+                raise UltraDNSError(f"Error retrieving records: {result.get('errorMessage', 'Unknown error')}")
+            elif not isinstance(result, dict):
+                return
 
-            # Extract records from the response
-            if 'rrSets' in result:
-                all_records.extend(result['rrSets'])
+            sizer.observe(time.monotonic() - start, count, result.pop('_received', 0))
+            self._record_page_size(f"/v3/zones/{zone_name}/rrsets", sizer)
 
             # Update pagination information
             if 'resultInfo' in result:
@@ -671,12 +1446,696 @@ class UltraDNSModule:
 
                 returned_count = result['resultInfo'].get('returnedCount', 0)
                 offset += returned_count
-
-                # If we've processed all records based on totalCount, we're done
-                if offset >= total_count:
-                    break
+                if not returned_count:
+                    total_count = offset
             else:
                 # If no resultInfo, assume we're done
-                break
+                total_count = offset
+
+    def iter_rrsets(self, zone_name, filters=None, limit=None):
+        """
+        Stream the RRSets of a zone like iter_records(), as RRSet models instead of API dicts.
+
+        Each model is built only when the caller reaches it, so a page is never converted as a whole.
+        """
+        for data in self.iter_records(zone_name, filters, limit):
+            yield RRSet.from_api(data)
+
+    def get_records(self):
+        """
+        Retrieve RRSet records for a specified zone from the UltraDNS API with offset-based pagination.
+
+        This function handles offset-based pagination automatically, making multiple
+        requests as needed to retrieve all records. The default limit is set to 1000
+        records per request, and filtering is done based on provided parameters.
+
+        Returns:
+            A list of RRSet records from the API response plus a result object indicating success or failure
+        """
+        # Check for required fields
+        required = ['zone']
+        missing = self._check_params(required)
+
+        if missing:
+            return [], self._fail_no_change(f"Missing required fields: {', '.join(missing)}")
+        # the snapshot does not keep the system generated status of the records
+        if self.params.get('snapshot') and not self.params.get('sys_generated'):
+            return self._snapshot_records()
 
+        # Connect to the API
+        if not self.connect():
+            return [], self._fail_no_change()
+
+        try:
+            all_records = list(self.iter_records(self.params['zone'], self.params))
+        except UltraDNSError as exc:
+            return [], self._fail_no_change(str(exc))
+
+        if not all_records:
+            return [], self._no_change("No records found for the specified zone and filters")
         return all_records, self._no_change(f"Retrieved {len(all_records)} records")
+
+    def _snapshot_records(self):
+        zone = self.params['zone']
+        with SnapshotStore(self.params['snapshot']) as store:
+            try:
+                self._refresh_snapshot(store, zone)
+            except UltraDNSError as exc:
+                return [], self._fail_no_change(str(exc))
+            records = store.records(zone, self.params)
+
+        if not records:
+            return [], self._no_change("No records found for the specified zone and filters")
+        return records, self._no_change(f"Retrieved {len(records)} records from the snapshot")
+
+    def _refresh_snapshot(self, store, zone):
+        # within snapshot_max_age the stored RRSets are used as they are, after that they are
+        # only read again if the SOA serial moved since they were stored
+        state = store.zone_state(zone)
+        if state is not None and time.time() - state['checked'] <= self._snapshot_max_age():
+            return
+        if not self.connect():
+            raise UltraDNSError(self.msg)
+
+        result = self.connection.get(f"/zones/{zone}/rrsets/SOA/{zone}")
+        if isinstance(result, dict) and 'errorCode' in result:
+            raise UltraDNSError(result.get('errorMessage', 'Unknown error'))
+        if isinstance(result, list) and result and isinstance(result[0], dict) and 'errorCode' in result[0]:
+            raise UltraDNSError(result[0].get('errorMessage', 'Unknown error'))
+        soa = RRSet.first(result)
+        serial = soa.serial if soa is not None else None
+
+        if state is not None and serial is not None and serial == state['serial']:
+            store.mark_checked(zone, serial)
+        else:
+            store.replace_records(zone, serial, list(self.iter_records(zone, {'kind': 'ALL'})))
+
+    def query_snapshot(self):
+        """
+        Run an SQL query against the snapshot, after bringing the RRSets of the zones listed in
+        refresh up to date with the API.
+
+        Returns:
+            A list of rows as dictionaries plus a result object indicating success or failure
+        """
+        refresh = self.params.get('refresh') or []
+        if refresh:
+            with SnapshotStore(self.params['snapshot']) as store:
+                for zone in refresh:
+                    try:
+                        self._refresh_snapshot(store, zone)
+                    except UltraDNSError as exc:
+                        return [], self._fail_no_change(f"Unable to refresh {zone}: {exc}")
+
+        try:
+            rows = snapshot.query(self.params['snapshot'], self.params['query'], self.params.get('parameters'))
+        except (OSError, ValueError) as exc:
+            return [], self._fail_no_change(str(exc))
+        return rows, self._no_change(f"Query returned {len(rows)} rows")
+
+    def search_records(self):
+        """
+        Find every RRSet whose rdata matches a value, across all zones or a given list of zones.
+
+        Zones are streamed from the zone listing and searched concurrently with the API's
+        server-side value filter. Once O(max_results) matches have been collected no further
+        zones are started and running searches stop at their next page.
+
+        Returns:
+            A result object with the matches under the C(matches) key
+        """
+        if self.params.get('providers'):
+            return self._search_providers()
+
+        missing = self._check_params(['value'])
+        if missing:
+            return self._fail_no_change(f"Missing required fields: {', '.join(missing)}")
+
+        if not self.connect():
+            return self._fail_no_change()
+
+        value = self.params['value']
+        types = set(rrtype_code(t) for t in self.params.get('types') or [])
+        max_results = self.params.get('max_results')
+        filters = {'value': value, 'kind': 'RECORDS', 'owner': self.params.get('owner')}
+
+        matches, errors = [], {}
+        lock, stop = threading.Lock(), threading.Event()
+
+        def search(zone):
+            for rrset in self.iter_records(zone, filters):
+                if stop.is_set():
+                    return
+                if types and rrtype_code(rrset.get('rrtype', '')) not in types:
+                    continue
+                with lock:
+                    if stop.is_set():
+                        return
+                    matches.append(dict(rrset, zoneName=zone))
+                    if max_results and len(matches) >= max_results:
+                        stop.set()
+
+        if self.params.get('zones'):
+            zones = iter(self.params['zones'])
+        else:
+            zones = (z['properties']['name'] for z in self.iter_zones({'account': self.params.get('account')}))
+
+        searched = 0
+        try:
+            for zone, _, error in run_streaming(search, zones, self.params.get('max_workers') or DEFAULT_WORKERS, stop):
+                searched += 1
+                if error is not None:
+                    errors[zone] = str(error)
+        except UltraDNSError as exc:
+            return self._fail_no_change(f"Error listing zones: {exc}")
+
+        truncated = stop.is_set()
+        res = self._no_change(f"Found {len(matches)} rrsets in {searched} zones" + (' (truncated)' if truncated else ''))
+        res.update({'matches': matches, 'zones_searched': searched, 'truncated': truncated, 'errors': errors})
+        if errors and self.params.get('fail_on_error'):
+            res.update({'failed': True, 'msg': f"{len(errors)} zones could not be searched"})
+        return res
+
+    def zone_ttl(self, check_mode=False, progress=None):
+        """
+        Set the TTL of every RRSet of a zone selected by the get_records() filters.
+
+        RRSets are streamed with the O(owner), O(kind) and O(current_ttl) filters and narrowed to
+        O(types); the SOA is left alone unless listed. RRSets already at the target TTL are skipped
+        without a request, the others are PATCHed on O(max_workers) threads that together send at
+        most O(rate_limit) requests per second.
+
+        Args:
+            check_mode: Only report the RRSets that would change
+            progress: Called with the counts so far after every 100 RRSets handled
+
+        Returns:
+            A result object with the counts under C(rrset_counts) and the changed RRSets under C(rrsets)
+        """
+        missing = self._check_params(['zone', 'ttl'])
+        if missing:
+            return self._fail_no_change(f"Missing required fields: {', '.join(missing)}")
+
+        target = self.params['ttl']
+        invalid = validate_ttl(target)
+        if invalid:
+            return self._fail_no_change(invalid)
+
+        if not self.connect():
+            return self._fail_no_change()
+
+        zone = self.params['zone']
+        types = set(rrtype_code(t) for t in self.params.get('types') or [])
+        soa = rrtype_code('SOA')
+        filters = {'owner': self.params.get('owner'), 'kind': self.params.get('kind') or 'ALL',
+                   'ttl': self.params.get('current_ttl')}
+        counts = {'selected': 0, 'unchanged': 0, 'changed': 0, 'failed': 0}
+        changed, errors = [], {}
+        limiter = RateLimiter(self.params.get('rate_limit') or 10)
+
+        def selected():
+            # runs on the calling thread, pulled one RRSet at a time as workers free up
+            for rrset in self.iter_rrsets(zone, filters):
+                wanted = rrset.rrtype in types if types else rrset.rrtype != soa
+                if not wanted:
+                    continue
+                counts['selected'] += 1
+                if rrset.ttl == target:
+                    counts['unchanged'] += 1
+                    continue
+                yield rrset
+
+        def patch(rrset):
+            if check_mode:
+                return self._success()
+            limiter.acquire()
+            return self.patch(f"/zones/{zone}/rrsets/{rrset.type_name}/{rrset.owner}", {'ttl': target})
+
+        try:
+            rrsets = selected()
+            # a changed RRSet drops out of a TTL filtered listing and would shift the offsets of later
+            # pages, so that selection is read in full before anything is changed
+            if filters['ttl'] is not None and not check_mode:
+                rrsets = list(rrsets)
+            for rrset, res, error in run_streaming(patch, rrsets, self.params.get('max_workers') or DEFAULT_WORKERS):
+                label = f'{rrset.owner} {rrset.type_name}'
+                if error is not None or res['failed']:
+                    counts['failed'] += 1
+                    errors[label] = str(error) if error is not None else res['msg']
+                else:
+                    counts['changed'] += 1
+                    changed.append({'owner': rrset.owner, 'type': rrset.type_name, 'previous_ttl': rrset.ttl})
+                if progress is not None and (counts['changed'] + counts['failed']) % 100 == 0:
+                    progress(dict(counts))
+        except UltraDNSError as exc:
+            res = self._fail_no_change(f"Error listing the rrsets of {zone}: {exc}")
+            res.update({'changed': counts['changed'] > 0 and not check_mode, 'rrset_counts': counts, 'rrsets': changed})
+            return res
+
+        res = self._no_change(f"{counts['changed']} of {counts['selected']} rrsets set to TTL {target}, "
+                              f"{counts['unchanged']} already at it, {counts['failed']} failed")
+        res.update({'changed': counts['changed'] > 0, 'failed': bool(errors), 'rrset_counts': counts,
+                    'rrsets': changed, 'errors': errors})
+        return res
+
+    def ptr_sync(self, check_mode=False):
+        """
+        Create, update and optionally remove the PTR records matching the A and AAAA records of forward zones.
+
+        The forward zones are streamed concurrently, keeping only the owner, TTL and addresses
+        of their A and AAAA RRSets. The reverse names are computed from the packed addresses and
+        grouped by reverse zone. Each reverse zone is then read once, diffed and changed through
+        the batch API, with O(max_workers) reverse zones worked on at the same time.
+
+        Returns:
+            A result object with the outcome per reverse zone under the C(zones) key
+        """
+        missing = self._check_params(['zones'])
+        if missing:
+            return self._fail_no_change(f"Missing required fields: {', '.join(missing)}")
+
+        if not self.connect():
+            return self._fail_no_change()
+
+        forward_zones = set(dns.fqdn(z) for z in self.params['zones'])
+        workers = self.params.get('max_workers') or DEFAULT_WORKERS
+        addresses = (rrtype_code('A'), rrtype_code('AAAA'))
+
+        def read_forward(zone):
+            return list((r.owner, r.ttl, r.rdata) for r in self.iter_rrsets(zone, {'kind': 'ALL'}) if r.rrtype in addresses)
+
+        try:
+            forward = list(rrset for rrsets in run_parallel(read_forward, sorted(forward_zones), workers) for rrset in rrsets)
+            if self.params.get('reverse_zones'):
+                reverse_zones = set(dns.fqdn(z) for z in self.params['reverse_zones'])
+            else:
+                reverse_zones = set(dns.fqdn(z['properties']['name']) for z in self.iter_zones({'name': 'arpa', 'type': 'PRIMARY'}))
+                reverse_zones = set(z for z in reverse_zones if z.endswith(('.in-addr.arpa.', '.ip6.arpa.')))
+        except UltraDNSError as exc:
+            return self._fail_no_change(f"Error reading the zones: {exc}")
+
+        desired, unmanaged = ptr.desired_ptrs(forward, reverse_zones)
+        prune = self.params.get('prune')
+        ttl = self.params.get('ttl')
+
+        def sync(zone):
+            try:
+                current = dict((r.key, r) for r in self.iter_rrsets(zone, {'kind': 'RECORDS'}) if r.rrtype == ptr.PTR)
+            except UltraDNSError as exc:
+                return {'operations': 0, 'applied': 0, 'failed': True, 'msg': str(exc)}
+            records = ptr.ptr_records(desired.get(zone, {}), current, forward_zones, prune, ttl)
+            operations = planner.zone_operations(zone, records, current)
+            outcome = {'operations': len(operations), 'changes': planner.summarize(operations), 'applied': 0, 'failed': False}
+            if operations and not check_mode:
+                outcome['applied'], error = self._apply_operations(operations)
+                if error:
+                    outcome.update({'failed': True, 'msg': error})
+            return outcome
+
+        # without prune only the reverse zones that gain or change PTRs need reading
+        zones = sorted(reverse_zones if prune else desired)
+        outcome = dict(zip(zones, run_parallel(sync, zones, workers)))
+        count = sum(o['operations'] for o in outcome.values())
+        failed = list(z for z, o in outcome.items() if o['failed'])
+        changed = count > 0 if check_mode else any(o['applied'] for o in outcome.values())
+        msg = f"{count} PTR changes in {len(zones)} reverse zones for {len(forward)} address rrsets"
+        return {
+            'changed': changed,
+            'failed': bool(failed),
+            'msg': msg + (f", failed in {', '.join(failed)}" if failed else ''),
+            'zones': outcome,
+            'unmanaged': unmanaged,
+        }
+
+    def zone_clone(self, check_mode=False):
+        """
+        Create copies of a source zone under other zone names, optionally in other accounts.
+
+        The source zone's RRSets are read once and kept in memory. For every target the owner
+        names are moved to the target apex, the zone is created and its RRSets are written
+        through the batch API, O(batch_size) RRSets per request. O(max_workers) targets are
+        cloned at the same time, all from the same source read. Targets that already exist are
+        left untouched.
+
+        Returns:
+            A result object with the outcome per target zone under the C(zones) key
+        """
+        missing = self._check_params(['source', 'targets'])
+        targets = []
+        for i, target in enumerate(self.params.get('targets') or []):
+            entry = {'name': target.get('name'), 'account': target.get('account') or self.params.get('account')}
+            if not entry['name']:
+                missing.append(f'targets[{i}].name')
+            elif not entry['account']:
+                missing.append(f'targets[{i}].account')
+            targets.append(entry)
+        if missing:
+            return self._fail_no_change(f"Missing required fields: {', '.join(missing)}")
+
+        source = dns.fqdn(self.params['source'])
+        names = list(dns.fqdn(t['name']) for t in targets)
+        duplicates = sorted(set(n for n in names if names.count(n) > 1 or n == source))
+        if duplicates:
+            return self._fail_no_change(f"Target zones listed more than once or equal to the source: {', '.join(duplicates)}")
+
+        if not self.connect():
+            return self._fail_no_change()
+
+        # the source may be read with another login, e.g. a template zone kept in a separate account
+        reader = self
+        if self.params.get('source_provider'):
+            reader = UltraDNSModule(dict(self.params, provider=self.params['source_provider']))
+            self.accounts.append(reader)
+            if not reader.connect():
+                return self._fail_no_change(f"Unable to read {source}: {reader.msg}")
+        try:
+            rrsets = list(reader.iter_rrsets(source, {'kind': 'ALL'}))
+        except UltraDNSError as exc:
+            return self._fail_no_change(f"Unable to read {source}: {exc}")
+        if not rrsets:
+            return self._fail_no_change(f"No RRSets found in {source}")
+
+        rewrite = self.params.get('rewrite_rdata', True)
+
+        def copy(target):
+            name = dns.fqdn(target['name'])
+            operations = clone.clone_operations(rrsets, source, name, rewrite)
+            outcome = {'rrsets': len(operations), 'applied': 0, 'changed': False, 'failed': False}
+            result = self.connection.get(f"/zones/{name}")
+            if 'errorCode' not in result:
+                return dict(outcome, rrsets=0, msg='The zone already exists')
+            if result['errorCode'] == 8001:
+                return dict(outcome, failed=True, msg=result['errorMessage'])
+            if check_mode:
+                return dict(outcome, changed=True)
+
+            res = self.create('/zones', {
+                'properties': {'name': name, 'accountName': target['account'], 'type': 'PRIMARY'},
+                'primaryCreateInfo': {'forceImport': 'True', 'createType': 'NEW'}})
+            res = self._wait_for_tasks({name: res})[name]
+            if res['failed']:
+                return dict(outcome, failed=True, msg=f"Unable to create the zone: {res['msg']}")
+
+            outcome['applied'], error = self._apply_operations(operations)
+            outcome['changed'] = True
+            if error:
+                outcome.update({'failed': True, 'msg': error})
+            return outcome
+
+        workers = self.params.get('max_workers') or DEFAULT_WORKERS
+        outcome = dict(zip(names, run_parallel(copy, targets, workers)))
+        created = sum(1 for o in outcome.values() if o['changed'])
+        failed = list(z for z, o in outcome.items() if o['failed'])
+        msg = f"{created} of {len(outcome)} zones {'would be ' if check_mode else ''}cloned from {source} with {len(rrsets)} rrsets"
+        return {
+            'changed': created > 0,
+            'failed': bool(failed),
+            'msg': msg + (f", failed in {', '.join(failed)}" if failed else ''),
+            'zones': outcome,
+        }
+
+    def _search_providers(self):
+        # matches and errors of every account, labelled with the account they came from
+        matches, errors, accounts, searched = [], {}, {}, 0
+        for label, res in self.for_each_provider(lambda api: api.search_records()):
+            accounts[label] = {'failed': res['failed'], 'msg': res['msg']}
+            if res['failed'] and 'matches' not in res:
+                errors[label] = res['msg']
+                continue
+            matches.extend(dict(m, provider=label) for m in res['matches'])
+            errors.update((f'{label}:{zone}', error) for zone, error in res['errors'].items())
+            searched += res['zones_searched']
+
+        max_results = self.params.get('max_results')
+        truncated = bool(max_results) and len(matches) >= max_results
+        matches = matches[:max_results] if max_results else matches
+        res = self._no_change(f"Found {len(matches)} rrsets in {searched} zones of {len(accounts)} accounts" +
+                              (' (truncated)' if truncated else ''))
+        res.update({'matches': matches, 'zones_searched': searched, 'truncated': truncated, 'errors': errors, 'providers': accounts})
+        if errors and self.params.get('fail_on_error'):
+            res.update({'failed': True, 'msg': f"{len(errors)} zones or accounts could not be searched"})
+        return res
+
+    def zone_report(self, csv_path=None, json_path=None):
+        """
+        Aggregate zone and record statistics while streaming zones and RRSets page by page.
+
+        Each zone's RRSets are folded into counters as they arrive and the zone's row is
+        written to the report files as soon as it finishes, in listing order. Neither the
+        zone list nor any zone's records are held in memory.
+
+        Args:
+            csv_path: Where to write one CSV row per zone, or None
+            json_path: Where to write per-zone statistics and the totals as JSON, or None
+
+        Returns:
+            A result object with the account-wide aggregates under the C(report) key
+        """
+        if not self.connect():
+            return self._fail_no_change()
+
+        buckets = self.params.get('ttl_buckets')
+        include_records = self.params.get('include_records', True)
+
+        def collect(zone):
+            if len(zone['properties']) == 1:
+                # zones given by name only, fetch their properties for the status and type columns
+                result = self.connection.get(f"/v3/zones/{zone['properties']['name']}")
+                if isinstance(result, dict) and 'properties' in result:
+                    zone = result
+            stats = ZoneStats(Zone.from_api(zone), sorted(buckets) if buckets else None)
+            if include_records:
+                try:
+                    for rrset in self.iter_rrsets(stats.name, {'kind': 'ALL'}):
+                        stats.add(rrset)
+                except UltraDNSError as exc:
+                    stats.error = str(exc)
+            return stats.finish()
+
+        if self.params.get('zones'):
+            zones = ({'properties': {'name': name}} for name in self.params['zones'])
+        else:
+            zones = self.iter_zones(dict((k, self.params.get(k)) for k in ('type', 'status', 'account', 'network')))
+
+        totals = ReportTotals()
+        writer = ReportWriter(csv_path, json_path)
+        try:
+            workers = self.params.get('max_workers') or DEFAULT_WORKERS
+            for _, stats, error in run_streaming(collect, zones, workers, ordered=True):
+                if error is not None:
+                    raise error
+                totals.add(stats)
+                writer.write(stats)
+        except UltraDNSError as exc:
+            writer.abort()
+            return self._fail_no_change(f"Error listing zones: {exc}")
+        except Exception:
+            writer.abort()
+            raise
+
+        report = totals.as_dict()
+        res = self._no_change(f"Reported on {totals.zones} zones with {totals.records} records")
+        res.update({'changed': writer.close(report), 'report': report, 'errors': totals.errors})
+        if totals.errors and self.params.get('fail_on_error'):
+            res.update({'failed': True, 'msg': f"{len(totals.errors)} zones could not be read"})
+        return res
+
+    def _desired_by_zone(self):
+        zones = {}
+        for record in self.params.get('records') or []:
+            zones.setdefault(record['zone'], []).append(record)
+        return zones
+
+    def dns_plan(self, plan_path=None):
+        """
+        Compare the desired records with the zones and write the API operations that reconcile them.
+
+        Each zone is read once, keeping only the rrsets named in the desired records and the SOA,
+        so the plan costs one paged listing per zone whatever the zone size. The plan records the
+        SOA serial each zone had, which dns_apply() checks before replaying the operations.
+
+        Args:
+            plan_path: Where to write the plan, or None to only report it
+
+        Returns:
+            A result object with a summary of the changes per zone under the C(plan) key
+        """
+        desired = self._desired_by_zone()
+        if not desired:
+            return self._fail_no_change('No records to plan')
+
+        # the whole plan is rejected before any zone is read if a single record is invalid
+        invalid = validate_records(self.params['records'])
+        if invalid:
+            res = self._fail_no_change(f"{len(invalid)} invalid records, nothing was planned")
+            res['invalid'] = invalid
+            return res
+
+        if not self.connect():
+            return self._fail_no_change()
+
+        def read(zone):
+            wanted = set(
+                (planner.owner_fqdn(r.get('name'), zone), rrtype_code(r['type'])) for r in desired[zone])
+            wanted.add((planner.owner_fqdn('@', zone), rrtype_code('SOA')))
+            current = {}
+            try:
+                for rrset in self.iter_rrsets(zone, {'kind': 'ALL'}):
+                    if rrset.key in wanted:
+                        current[rrset.key] = rrset
+                return planner.soa_serial(current, zone), planner.zone_operations(zone, desired[zone], current), None
+            except (UltraDNSError, ValueError) as exc:
+                return None, [], str(exc)
+
+        plan = planner.new_plan(getattr(self.connection, 'host', None))
+        summary, errors = {}, {}
+        for zone, (serial, operations, error) in zip(desired, run_parallel(read, desired, self.params.get('max_workers') or DEFAULT_WORKERS)):
+            if error:
+                errors[zone] = error
+            elif operations:
+                plan['zones'][zone] = {'serial': serial, 'operations': operations}
+                summary[zone] = {'serial': serial, 'changes': planner.summarize(operations)}
+
+        if errors:
+            res = self._fail_no_change(f"Unable to plan {len(errors)} zones")
+            res['errors'] = errors
+            return res
+
+        count = sum(len(z['operations']) for z in plan['zones'].values())
+        res = self._no_change(f"{count} operations in {len(plan['zones'])} zones")
+        res.update({'plan': summary, 'operations': count})
+        if plan_path:
+            res['changed'] = planner.write_plan(plan_path, plan)
+        return res
+
+    def _batch_failure(self, result):
+        # a batch answers with one status per request, any error fails the whole batch
+        if isinstance(result, dict) and 'errorCode' in result:
+            return result['errorMessage']
+        if isinstance(result, dict) and result.get('task_id'):
+            timeout = self.params.get('wait_timeout')
+            poller = TaskPoller(self.connection, Backoff(initial=1.0, maximum=15.0, timeout=300 if timeout is None else timeout))
+            poller.add('batch', result['task_id'])
+            task = poller.run().get('batch')
+            if isinstance(task, dict) and task.get('code') != 'COMPLETE':
+                return task.get('errorMessage') or task.get('message') or f"Batch task {task.get('code')}"
+            return None
+        for item in result if isinstance(result, list) else []:
+            body = item.get('body') if isinstance(item, dict) else None
+            body = body[0] if isinstance(body, list) and body else body
+            if isinstance(body, dict) and 'errorCode' in body:
+                return body.get('errorMessage') or str(body['errorCode'])
+            if isinstance(item, dict) and str(item.get('code', '')).startswith(('4', '5')):
+                return f"Batch request failed with status {item['code']}"
+        return None
+
+    def _apply_operations(self, operations, start=0, checkpoint=None):
+        # checkpoint is called with the number of operations applied after every batch that succeeds
+        size = max(1, self.params.get('batch_size') or 1)
+        applied = start
+        for i in range(start, len(operations), size):
+            chunk = operations[i:i + size]
+            if len(chunk) == 1:
+                method, path, body = chunk[0]
+                result = {'POST': self.create, 'PUT': self.update}[method](path, body) if body is not None else self.delete(path)
+                error = result['msg'] if result['failed'] else None
+            else:
+                batch = list(dict({'method': m, 'uri': p}, **({'body': b} if b is not None else {})) for m, p, b in chunk)
+                error = self._batch_failure(self.connection.post('/batch', batch))
+            if error:
+                return applied, error
+            applied += len(chunk)
+            if checkpoint is not None:
+                checkpoint(applied)
+        return applied, None
+
+    def dns_apply(self, plan_path, check_mode=False):
+        """
+        Replay a plan written by dns_plan(), zones in parallel and operations in batches.
+
+        Every zone's SOA serial is compared with the serial recorded in the plan first. If any
+        zone changed since the plan was made nothing is applied. A zone stops at its first failed
+        batch, so its remaining operations are reported rather than applied out of order.
+
+        With O(journal) set, each zone's progress and the SOA serial it left behind are
+        journaled after every batch, so a rerun of the same plan resumes where it stopped
+        and skips zones that were completed.
+
+        Returns:
+            A result object with the outcome per zone under the C(zones) key
+        """
+        try:
+            plan = planner.read_plan(plan_path)
+        except (IOError, OSError, ValueError) as exc:
+            return self._fail_no_change(f"Unable to read plan: {exc}")
+
+        journal = self._open_journal()
+        try:
+            return self._dns_apply(plan, journal, check_mode)
+        finally:
+            if journal is not None:
+                journal.close()
+
+    def _dns_apply(self, plan, journal, check_mode):
+        digest = operation_key(plan.get('host'), plan['zones'])
+        keys = dict((zone, operation_key('apply', digest, zone)) for zone in plan['zones'])
+        progress = dict((zone, journal.get(keys[zone]) if journal else None) for zone in plan['zones'])
+        zones = dict((zone, z) for zone, z in plan['zones'].items()
+                     if not progress[zone] or progress[zone]['applied'] < len(z['operations']))
+        if not zones:
+            res = self._no_change(f"All {len(plan['zones'])} zones already applied according to the journal")
+            res['journal'] = 'skipped'
+            return res
+
+        if not self.connect():
+            return self._fail_no_change()
+
+        host = getattr(self.connection, 'host', None)
+        if plan.get('host') and host and plan['host'] != host:
+            return self._fail_no_change(f"The plan was made against {plan['host']}, not {host}")
+
+        workers = self.params.get('max_workers') or DEFAULT_WORKERS
+
+        def serial(zone):
+            return RRSet.first(self.connection.get(f"/zones/{zone}/rrsets/SOA/{zone}"))
+
+        # a partially applied zone is expected at the serial its last journaled batch left
+        drifted = {}
+        for zone, soa in zip(zones, run_parallel(serial, zones, workers)):
+            current = soa.serial if soa is not None else None
+            expected = progress[zone]['serial'] if progress[zone] else zones[zone]['serial']
+            if current != expected:
+                drifted[zone] = {'planned_serial': expected, 'serial': current}
+        if drifted:
+            res = self._fail_no_change(f"{len(drifted)} zones changed since the plan was made: {', '.join(drifted)}")
+            res['drifted'] = drifted
+            return res
+
+        count = sum(len(z['operations']) - (progress[zone] or {}).get('applied', 0) for zone, z in zones.items())
+        if check_mode or not count:
+            res = self._no_change(f"{count} operations in {len(zones)} zones")
+            res['changed'] = bool(count)
+            return res
+
+        def apply(zone):
+            start = (progress[zone] or {}).get('applied', 0)
+
+            def checkpoint(applied):
+                soa = serial(zone)
+                journal.put(keys[zone], {'applied': applied, 'serial': soa.serial if soa is not None else None})
+                journal.flush()
+
+            applied, error = self._apply_operations(zones[zone]['operations'], start, checkpoint if journal else None)
+            outcome = {'applied': applied - start, 'pending': len(zones[zone]['operations']) - applied, 'failed': bool(error)}
+            if start:
+                outcome['resumed'] = start
+            if error:
+                outcome['msg'] = error
+            return outcome
+
+        outcome = dict(zip(zones, run_parallel(apply, zones, workers)))
+        applied = sum(o['applied'] for o in outcome.values())
+        failed = list(z for z, o in outcome.items() if o['failed'])
+        return {'changed': applied > 0, 'failed': bool(failed),
+                'msg': f"{applied} of {count} operations applied" + (f", failed in {', '.join(failed)}" if failed else ''),
+                'zones': outcome}
@@ -0,0 +1,238 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+import re
+import shlex
+from ipaddress import ip_address
+
+MAX_TTL = 2147483647
+LABEL = re.compile(r'^(\*|[A-Za-z0-9_]([A-Za-z0-9_-]{0,61}[A-Za-z0-9_])?)$')
+HEX = re.compile(r'^[0-9A-Fa-f]+$')
+CAA_TAG = re.compile(r'^[A-Za-z0-9]+$')
+CAA_TAGS = ('issue', 'issuewild', 'iodef', 'contactemail', 'contactphone', 'issuemail', 'issuevmc')
+SSHFP_ALGORITHMS = (1, 2, 3, 4, 6)
+SSHFP_LENGTHS = {1: 40, 2: 64}
+SVC_KEYS = ('mandatory', 'alpn', 'no-default-alpn', 'port', 'ipv4hint', 'ech', 'ipv6hint', 'dohpath', 'ohttp')
+SVC_KEY = re.compile(r'^key\d{1,5}$')
+
+
+def _hostname(name):
+    # relative names are expanded by the API, so a trailing dot is optional
+    if name == '.':
+        return None
+    labels = name[:-1].split('.') if name.endswith('.') else name.split('.')
+    if len(name.rstrip('.')) > 253:
+        return f'{name} is longer than 253 characters'
+    if not all(LABEL.match(label) for label in labels):
+        return f'{name} is not a valid host name'
+    return None
+
+
+def _number(value, name, maximum=65535, minimum=0):
+    if not value.isdigit() or not minimum <= int(value) <= maximum:
+        return f'{name} must be a number from {minimum} to {maximum}, not {value}'
+    return None
+
+
+def _fields(value, names):
+    fields = value.split()
+    if len(fields) != len(names):
+        return None, f"expected {len(names)} fields ({' '.join(names)}), got {len(fields)}"
+    return fields, None
+
+
+def _address(version):
+    def check(value):
+        try:
+            if ip_address(value).version == version:
+                return None
+        except ValueError:
+            pass
+        return f'{value} is not an IPv{version} address'
+    return check
+
+
+def _mx(value):
+    fields, error = _fields(value, ('preference', 'exchange'))
+    return error or _number(fields[0], 'preference') or _hostname(fields[1])
+
+
+def _srv(value):
+    fields, error = _fields(value, ('priority', 'weight', 'port', 'target'))
+    if error:
+        return error
+    for name, field in zip(('priority', 'weight', 'port'), fields):
+        error = _number(field, name)
+        if error:
+            return error
+    return _hostname(fields[3])
+
+
+def _soa(value):
+    fields, error = _fields(value, ('mname', 'rname', 'serial', 'refresh', 'retry', 'expire', 'minimum'))
+    if error:
+        return error
+    for name, field in zip(('serial', 'refresh', 'retry', 'expire', 'minimum'), fields[2:]):
+        error = _number(field, name, maximum=4294967295)
+        if error:
+            return error
+    return _hostname(fields[0]) or _hostname(fields[1])
+
+
+def _caa(value):
+    fields = value.split(None, 2)
+    if len(fields) != 3:
+        return 'expected flags, tag and value'
+    flags, tag, text = fields
+    error = _number(flags, 'flags', maximum=255)
+    if error:
+        return error
+    if not CAA_TAG.match(tag) or len(tag) > 15:
+        return f'{tag} is not a valid CAA tag'
+    text = text[1:-1] if len(text) > 1 and text[0] == text[-1] == '"' else text
+    if tag.lower() == 'iodef' and not text.startswith(('mailto:', 'http://', 'https://')):
+        return f'the iodef value must be a mailto: or http(s) URL, not {text}'
+    if tag.lower() in ('issue', 'issuewild'):
+        # an empty issuer, as in 0 issue ";", forbids issuance
+        issuer = text.split(';')[0].strip()
+        return _hostname(issuer) if issuer else None
+    return None
+
+
+def _sshfp(value):
+    fields, error = _fields(value, ('algorithm', 'type', 'fingerprint'))
+    if error:
+        return error
+    algorithm, fptype, fingerprint = fields
+    if not algorithm.isdigit() or int(algorithm) not in SSHFP_ALGORITHMS:
+        return f"algorithm must be one of {', '.join(map(str, SSHFP_ALGORITHMS))}, not {algorithm}"
+    if not fptype.isdigit() or int(fptype) not in SSHFP_LENGTHS:
+        return f'fingerprint type must be 1 (SHA-1) or 2 (SHA-256), not {fptype}'
+    if not HEX.match(fingerprint) or len(fingerprint) != SSHFP_LENGTHS[int(fptype)]:
+        return f'fingerprint must be {SSHFP_LENGTHS[int(fptype)]} hexadecimal digits for type {fptype}'
+    return None
+
+
+def _svc_param(key, value):
+    if key == 'no-default-alpn':
+        return None if value is None else 'no-default-alpn takes no value'
+    if value is None or value == '':
+        return f'{key} needs a value'
+    if key == 'port':
+        return _number(value, 'port')
+    if key in ('ipv4hint', 'ipv6hint'):
+        check = _address(4 if key == 'ipv4hint' else 6)
+        return next((e for e in (check(a) for a in value.split(',')) if e), None)
+    if key == 'mandatory':
+        keys = value.split(',')
+        return next((f'{k} is not a valid mandatory key' for k in keys if k not in SVC_KEYS and not SVC_KEY.match(k)), None)
+    if key == 'alpn' and not all(value.split(',')):
+        return 'alpn has an empty protocol id'
+    return None
+
+
+def _svcb(value):
+    try:
+        fields = shlex.split(value)
+    except ValueError as exc:
+        return str(exc)
+    if len(fields) < 2:
+        return 'expected priority, target and optional parameters'
+    error = _number(fields[0], 'priority') or _hostname(fields[1])
+    if error:
+        return error
+    # priority 0 is alias mode, which carries no parameters
+    if fields[0] == '0' and len(fields) > 2:
+        return 'an alias (priority 0) record takes no parameters'
+    seen = set()
+    for param in fields[2:]:
+        key, sep, val = param.partition('=')
+        key = key.lower()
+        if key not in SVC_KEYS and not SVC_KEY.match(key):
+            return f'{key} is not a valid service parameter'
+        if key in seen:
+            return f'{key} is given more than once'
+        seen.add(key)
+        error = _svc_param(key, val if sep else None)
+        if error:
+            return error
+    return None
+
+
+def _text(value):
+    return 'the value is empty' if not value else None
+
+
+VALIDATORS = {
+    'A': _address(4),
+    'AAAA': _address(6),
+    'CNAME': _hostname,
+    'NS': _hostname,
+    'PTR': _hostname,
+    'MX': _mx,
+    'SRV': _srv,
+    'SOA': _soa,
+    'CAA': _caa,
+    'SSHFP': _sshfp,
+    'HTTPS': _svcb,
+    'SVCB': _svcb,
+    'TXT': _text,
+}
+
+
+def validate_rdata(rrtype, value):
+    """The problem with one value of a record type, or None if it is valid or the type is not checked."""
+    check = VALIDATORS.get(rrtype.upper())
+    if check is None:
+        return None
+    value = value.strip() if isinstance(value, str) else value
+    if not isinstance(value, str):
+        return f'{value!r} is not a string'
+    return check(value)
+
+
+def validate_ttl(ttl):
+    if not 0 <= ttl <= MAX_TTL:
+        return f'TTL must be from 0 to {MAX_TTL}, not {ttl}'
+    return None
+
+
+def validate_record(rrtype, values=None, ttl=None):
+    """
+    Check the TTL and every value of a record without calling the API.
+
+    Returns:
+        A list of error messages, empty when the record is valid
+    """
+    errors = []
+    if ttl is not None and validate_ttl(ttl):
+        errors.append(validate_ttl(ttl))
+    for value in values or []:
+        error = validate_rdata(rrtype, value)
+        if error:
+            errors.append(f'{value}: {error}')
+    if rrtype.upper() in ('CNAME', 'SOA') and len(values or []) > 1:
+        errors.append(f'a {rrtype.upper()} record has a single value')
+    return errors
+
+
+def validate_records(records):
+    """
+    Check a whole batch of records in one pass, before any of them is sent.
+
+    Args:
+        records: A list of dictionaries with zone, name, type, rdata and ttl
+
+    Returns:
+        A list of error messages naming the record each belongs to, empty when all are valid
+    """
+    errors = []
+    for i, record in enumerate(records):
+        if record.get('state', 'present') == 'absent':
+            continue
+        rrtype = (record.get('type') or '').upper()
+        label = f"records[{i}] {record.get('name')} {rrtype} in {record.get('zone')}"
+        if not record.get('rdata'):
+            errors.append(f'{label}: rdata is required for a present record')
+            continue
+        errors.extend(f'{label}: {error}' for error in validate_record(rrtype, record['rdata'], record.get('ttl')))
+    return errors
@@ -0,0 +1,111 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2024, UltraDNS <info@ultradns.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: dns_apply
+short_description: Apply a DNS change plan to UltraDNS
+version_added: 1.2.0
+description:
+    - Replays the API operations of a plan written by M(ultradns.ultradns.dns_plan) without reading the rrsets again.
+    - Zones are applied in parallel and the operations of each zone are sent in batches through the UltraDNS batch API.
+    - Before anything is applied the SOA serial of every zone is compared with the serial in the plan.
+    - If any zone changed since the plan was made, nothing is applied.
+author:
+    - "UltraDNS (@ultradns)"
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_provider
+    - ultradns.ultradns.ultra_journal
+options:
+    plan_path:
+        description:
+            - The plan file written by M(ultradns.ultradns.dns_plan)
+        required: true
+        type: path
+    batch_size:
+        description:
+            - The number of operations sent in one batch request.
+            - V(1) sends every operation as its own request.
+        required: false
+        type: int
+        default: 10
+    max_workers:
+        description:
+            - The number of zones applied at the same time
+        required: false
+        type: int
+        default: 8
+    wait_timeout:
+        description:
+            - How long in seconds to wait for batches that run as background tasks
+        required: false
+        type: int
+        default: 300
+notes:
+    - A zone stops at its first failed batch; RV(zones) reports how many of its operations were applied and how many are still pending.
+    - After a partial failure, plan again, since the applied operations changed the zones' serials.
+    - In check mode the serials are verified and the number of operations is reported without applying them.
+'''
+
+EXAMPLES = '''
+- name: Apply the migration plan during the change window
+  ultradns.ultradns.dns_apply:
+    plan_path: migration.plan.json.gz
+    batch_size: 20
+    provider: "{{ ultra_provider }}"
+'''
+
+RETURN = '''
+zones:
+    description: The outcome per zone
+    returned: when operations were applied
+    type: dict
+    sample:
+        example.com.:
+            applied: 16
+            pending: 0
+            failed: false
+drifted:
+    description: The zones whose serial no longer matches the plan, with the planned and current serials
+    returned: when a zone changed since the plan was made
+    type: dict
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_journal_spec
+from ..module_utils.ultraapi import UltraDNSModule
+
+
+def main():
+    argspec = {
+        'plan_path': dict(required=True, type='path'),
+        'batch_size': dict(required=False, type='int', default=10),
+        'max_workers': dict(required=False, type='int', default=8),
+        'wait_timeout': dict(required=False, type='int', default=300),
+    }
+
+    # Add the arguments required for connecting to UltraDNS API
+    argspec.update(ultra_connection_spec())
+    argspec.update(ultra_journal_spec())
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+    api = UltraDNSModule(module.params)
+
+    result = api.dns_apply(module.params['plan_path'], check_mode=module.check_mode)
+    result.update(api.api_stats())
+
+    if result['failed']:
+        module.fail_json(**result)
+    else:
+        module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
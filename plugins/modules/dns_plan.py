@@ -0,0 +1,167 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2024, UltraDNS <info@ultradns.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: dns_plan
+short_description: Plan the API operations of a large DNS change in UltraDNS
+version_added: 1.2.0
+description:
+    - Compares a list of desired records with the current state of their zones and writes the exact API operations that reconcile them to a plan file.
+    - Each zone is read once with a paged listing, keeping only the named rrsets in memory.
+    - The plan records the SOA serial of every zone, so M(ultradns.ultradns.dns_apply) can refuse to apply it to a zone that changed in the meantime.
+    - This module makes no changes in UltraDNS.
+author:
+    - "UltraDNS (@ultradns)"
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_provider
+    - ultradns.ultradns.ultra_paging
+options:
+    records:
+        description:
+            - The desired rrsets.
+            - Present rrsets are set to exactly the given rdata; absent rrsets are deleted.
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            zone:
+                description:
+                    - The zone containing the rrset
+                required: true
+                type: str
+            name:
+                description:
+                    - The owner name, relative to the zone, V(@) for the apex, or fully qualified with a trailing dot
+                required: true
+                type: str
+            type:
+                description:
+                    - The record type, e.g. V(A), V(CNAME) or V(TXT)
+                required: true
+                type: str
+            rdata:
+                description:
+                    - The values of the rrset, required when O(records[].state=present)
+                required: false
+                type: list
+                elements: str
+            ttl:
+                description:
+                    - The TTL of the rrset. An existing rrset keeps its TTL when not set
+                required: false
+                type: int
+            state:
+                description:
+                    - Whether the rrset should exist
+                required: false
+                type: str
+                choices: ['present', 'absent']
+                default: present
+    plan_path:
+        description:
+            - Where to write the plan. A path ending in C(.gz) is compressed.
+            - When not set, the changes are only reported.
+        required: false
+        type: path
+    max_workers:
+        description:
+            - The number of zones read at the same time
+        required: false
+        type: int
+        default: 8
+notes:
+    - Every record is checked locally first, e.g. address syntax, MX and SRV numbers, CAA tags, SSHFP fingerprints
+      and HTTPS/SVCB parameters, and the whole plan is rejected before any API call if one is invalid.
+    - Multiple A or AAAA values are planned as an RD pool, keeping the profile of an existing pool.
+    - RV(changed) is true when the plan file was created or its operations changed.
+    - In check mode the changes are reported but no plan file is written.
+'''
+
+EXAMPLES = '''
+- name: Plan the migration ahead of the change window
+  ultradns.ultradns.dns_plan:
+    records: "{{ migration_records }}"
+    plan_path: migration.plan.json.gz
+    provider: "{{ ultra_provider }}"
+  register: plan
+
+- name: Review the planned changes
+  ansible.builtin.debug:
+    var: plan.plan
+'''
+
+RETURN = '''
+plan:
+    description: The planned changes per zone, counted by operation and record type
+    returned: success
+    type: dict
+    sample:
+        example.com.:
+            serial: 2024061201
+            changes:
+                create: {A: 12}
+                update: {CNAME: 3}
+                delete: {TXT: 1}
+operations:
+    description: The number of API operations in the plan
+    returned: success
+    type: int
+invalid:
+    description:
+        - The problems found in O(records) before anything was read, one message per invalid value
+        - Nothing is planned when any record is invalid
+    returned: when a record is invalid
+    type: list
+    elements: str
+    sample:
+        - "records[3] www A in example.com.: 2001:db8::1 is not an IPv4 address"
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_paging_spec
+from ..module_utils.ultraapi import UltraDNSModule
+
+RECORD_SPEC = {
+    'zone': dict(required=True, type='str'),
+    'name': dict(required=True, type='str'),
+    'type': dict(required=True, type='str'),
+    'rdata': dict(required=False, type='list', elements='str'),
+    'ttl': dict(required=False, type='int'),
+    'state': dict(required=False, type='str', choices=['present', 'absent'], default='present'),
+}
+
+
+def main():
+    argspec = {
+        'records': dict(required=True, type='list', elements='dict', options=RECORD_SPEC,
+                        required_if=[('state', 'present', ['rdata'])]),
+        'plan_path': dict(required=False, type='path'),
+        'max_workers': dict(required=False, type='int', default=8),
+    }
+
+    # Add the arguments required for connecting to UltraDNS API
+    argspec.update(ultra_connection_spec())
+    argspec.update(ultra_paging_spec())
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+    api = UltraDNSModule(module.params)
+
+    result = api.dns_plan(None if module.check_mode else module.params['plan_path'])
+    result.update(api.api_stats())
+
+    if result['failed']:
+        module.fail_json(**result)
+    else:
+        module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2024, UltraDNS <info@ultradns.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: ptr_sync
+short_description: Keep the PTR records of reverse zones in sync with forward zones in UltraDNS
+version_added: 1.2.0
+description:
+    - Reads the A and AAAA records of one or more forward zones and makes the PTR records of the matching reverse zones point back at them.
+    - Each forward and reverse zone is read once with a paged listing and the changes are sent through the batch API, reverse zones in parallel.
+    - PTR targets outside the forward zones are left as they are, so reverse zones shared with other systems can be synced safely.
+author:
+    - "UltraDNS (@ultradns)"
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_provider
+    - ultradns.ultradns.ultra_paging
+options:
+    zones:
+        description:
+            - The forward zones whose A and AAAA records are mirrored
+        required: true
+        type: list
+        elements: str
+    reverse_zones:
+        description:
+            - The in-addr.arpa and ip6.arpa zones to manage
+            - When not set, every primary reverse zone of the account is used
+            - Each address belongs to the longest reverse zone containing its reverse name
+        required: false
+        type: list
+        elements: str
+    ttl:
+        description:
+            - The TTL of the PTR records
+            - When not set, a PTR gets the TTL of its forward RRSet, the shortest one if several share the address
+        required: false
+        type: int
+    prune:
+        description:
+            - Remove PTR records that point only into the forward zones but match no A or AAAA record any more
+            - When false, reverse zones without any forward address are not read at all
+        required: false
+        type: bool
+        default: false
+    batch_size:
+        description:
+            - The number of changes sent in one batch request
+        required: false
+        type: int
+        default: 10
+    max_workers:
+        description:
+            - The number of zones read or changed at the same time
+        required: false
+        type: int
+        default: 8
+notes:
+    - Addresses outside every reverse zone are listed under RV(unmanaged) and otherwise ignored.
+    - In check mode the changes are counted per reverse zone but not applied.
+'''
+
+EXAMPLES = '''
+- name: Sync the reverse zones with the production zones every night
+  ultradns.ultradns.ptr_sync:
+    zones:
+      - example.com.
+      - example.net.
+    reverse_zones:
+      - 2.0.192.in-addr.arpa.
+      - 8.b.d.0.1.0.0.2.ip6.arpa.
+    prune: true
+    provider: "{{ ultra_provider }}"
+  register: ptrs
+
+- name: Show the addresses without a reverse zone
+  ansible.builtin.debug:
+    var: ptrs.unmanaged
+'''
+
+RETURN = '''
+zones:
+    description: The outcome per reverse zone
+    returned: always
+    type: dict
+    sample:
+        2.0.192.in-addr.arpa.:
+            operations: 14
+            applied: 14
+            failed: false
+            changes:
+                create: {PTR: 12}
+                update: {PTR: 2}
+unmanaged:
+    description: Addresses of the forward zones that are in none of the reverse zones
+    returned: always
+    type: list
+    elements: str
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_paging_spec
+from ..module_utils.ultraapi import UltraDNSModule
+
+
+def main():
+    argspec = {
+        'zones': dict(required=True, type='list', elements='str'),
+        'reverse_zones': dict(required=False, type='list', elements='str'),
+        'ttl': dict(required=False, type='int'),
+        'prune': dict(required=False, type='bool', default=False),
+        'batch_size': dict(required=False, type='int', default=10),
+        'max_workers': dict(required=False, type='int', default=8),
+    }
+
+    # Add the arguments required for connecting to UltraDNS API
+    argspec.update(ultra_connection_spec())
+    argspec.update(ultra_paging_spec())
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+    api = UltraDNSModule(module.params)
+
+    result = api.ptr_sync(check_mode=module.check_mode)
+    result.update(api.api_stats())
+
+    if result['failed']:
+        module.fail_json(**result)
+    else:
+        module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
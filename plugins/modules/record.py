@@ -15,7 +15,9 @@ short_description: Manage zone resource records in UltraDNS
 description:
     - Add or remove common zone resource records in UltraDNS
 version_added: 0.1.0
-extends_documentation_fragment: ultradns.ultradns.ultra_provider
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_provider
+    - ultradns.ultradns.ultra_journal
 options:
     zone:
         description:
@@ -49,8 +51,33 @@ options:
             - Required for O(state=present) when creating a new record
             - If not specified for O(state=present) with an existing record, only the TTL will be updated
             - If not specified for O(state=absent), all records in the rrset will be removed
+            - Mutually exclusive with O(rdata)
         type: str
         required: false
+    rdata:
+        description:
+            - A list of rdata values for the rrset, each given as a complete rdata string
+            - Lets a whole rrset be converged with one read and one write instead of one task per value
+            - How the values are applied to an existing rrset is set by O(rdata_mode)
+            - For O(state=absent), every listed value is removed from the rrset
+            - Mutually exclusive with O(data)
+        type: list
+        elements: str
+        required: false
+        version_added: 1.2.0
+    rdata_mode:
+        description:
+            - How O(rdata) or O(data) is applied to an existing rrset when O(state=present)
+            - V(append) adds the values that are missing and keeps the existing ones
+            - V(replace) makes the rrset contain exactly the given values, in any order
+            - V(exact) makes the rrset contain exactly the given values in the given order, which matters for rdpools with a fixed order
+            - O(solo=true) is the same as V(replace)
+            - Ignored when O(state=absent)
+        type: str
+        required: false
+        choices: ['append', 'replace', 'exact']
+        default: append
+        version_added: 1.2.0
     solo:
         description:
             - Determines the behavior when adding a record to an existing rrset.
@@ -68,6 +95,36 @@ options:
         type: str
         required: true
         choices: ['present', 'absent']
+    wait_for_propagation:
+        description:
+            - After a change, query every nameserver of the zone directly until it serves the rrset as stored in UltraDNS
+            - Nameservers are checked in parallel, each with its own backoff, until O(propagation_timeout) expires
+            - Record types other than A, AAAA, CNAME, MX, NS, PTR, SRV and TXT are checked by waiting for the zone's SOA serial
+        type: bool
+        required: false
+        default: false
+        version_added: 1.2.0
+    propagation_timeout:
+        description:
+            - How long in seconds to wait for all nameservers when O(wait_for_propagation=true)
+        type: int
+        required: false
+        default: 300
+        version_added: 1.2.0
+    propagation_nameservers:
+        description:
+            - The nameservers to check, as host names or addresses with an optional port, e.g. V(192.0.2.53:5353)
+            - Defaults to the NS records at the zone apex
+        type: list
+        elements: str
+        required: false
+        version_added: 1.2.0
+notes:
+    - Tasks changing the same rrset from parallel forks on one control node take turns using a lock file in the system temporary directory.
+    - Writes to an existing rrset only apply if it still holds the values they were computed from.
+      If another writer changed the rrset in between, the change is computed again from a fresh read and retried for up to a minute.
+    - Values are checked before connecting to the API, so malformed data such as an invalid address, MX preference or SSHFP fingerprint
+      fails without any API call.
 '''
 
 EXAMPLES = '''
@@ -110,6 +167,43 @@ EXAMPLES = '''
     state: present
     provider: "{{ ultra_provider }}"
 
+- name: Set all NS records of a delegation in one call
+  ultradns.ultradns.record:
+    zone: example.com.
+    name: sub
+    type: NS
+    ttl: 86400
+    rdata:
+      - ns1.example.net.
+      - ns2.example.net.
+      - ns3.example.net.
+    rdata_mode: replace
+    state: present
+    provider: "{{ ultra_provider }}"
+
+- name: Make sure two addresses are part of the www rdpool
+  ultradns.ultradns.record:
+    zone: example.com.
+    name: www
+    type: A
+    rdata:
+      - 192.0.2.10
+      - 192.0.2.11
+    state: present
+    provider: "{{ ultra_provider }}"
+
+- name: Change a record and wait until every UltraDNS nameserver serves it
+  ultradns.ultradns.record:
+    zone: example.com.
+    name: api
+    type: A
+    data: 192.0.2.80
+    solo: true
+    wait_for_propagation: true
+    propagation_timeout: 120
+    state: present
+    provider: "{{ ultra_provider }}"
+
 - name: Update only the TTL of an existing record
   ultradns.ultradns.record:
     zone: example.com.
@@ -137,10 +231,21 @@ EXAMPLES = '''
     provider: "{{ ultra_provider }}"
 '''
 
-RETURN = ''' # '''
+RETURN = '''
+propagation:
+    description: Convergence of each nameserver, keyed by nameserver
+    returned: when O(wait_for_propagation=true) and the record changed
+    type: dict
+    sample:
+        pdns1.ultradns.net.:
+            converged: true
+            seconds: 2.418
+            attempts: 2
+'''
 
 from ansible.module_utils.basic import AnsibleModule
 from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_journal_spec
 from ..module_utils.ultraapi import UltraDNSModule
 
 
@@ -152,17 +257,29 @@ def main():
         'type': dict(required=True, type='str', choices=['A', 'AAAA', 'CNAME', 'TXT', 'MX', 'NS', 'CAA', 'HTTPS', 'SVCB', 'PTR', 'SOA', 'SRV', 'SSHFP']),
         'ttl': dict(required=False, type='int'),
         'data': dict(required=False, type='str'),
+        'rdata': dict(required=False, type='list', elements='str'),
+        'rdata_mode': dict(required=False, type='str', choices=['append', 'replace', 'exact'], default='append'),
         'solo': dict(required=False, type='bool', default=False),
-        'state': dict(required=True, type='str', choices=['present', 'absent'])
+        'state': dict(required=True, type='str', choices=['present', 'absent']),
+        'wait_for_propagation': dict(required=False, type='bool', default=False),
+        'propagation_timeout': dict(required=False, type='int', default=300),
+        'propagation_nameservers': dict(required=False, type='list', elements='str'),
     }
 
     # Add the arguments required for connecting to UltraDNS API
     argspec.update(ultra_connection_spec())
+    argspec.update(ultra_journal_spec())
 
-    module = AnsibleModule(argument_spec=argspec)
+    module = AnsibleModule(argument_spec=argspec, mutually_exclusive=[('data', 'rdata')])
     api = UltraDNSModule(module.params)
 
     result = api.record()
+    if module.params['wait_for_propagation'] and result['changed'] and not result['failed']:
+        propagation = api.wait_for_propagation()
+        result.update({'propagation': propagation['propagation']} if 'propagation' in propagation else {})
+        if propagation['failed']:
+            result.update({'failed': True, 'msg': propagation['msg']})
+    result.update(api.api_stats())
     if 'failed' in result and result['failed']:
         module.fail_json(**result)
     else:
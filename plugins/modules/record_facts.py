@@ -20,6 +20,9 @@ description:
     - This module is idempotent and does not make any changes.
 author:
     - "UltraDNS (@ultradns)"
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_paging
+    - ultradns.ultradns.ultra_snapshot
 options:
     zone:
         description:
@@ -95,6 +98,7 @@ notes:
     - The API may return an error code 70002 (Data not found) if no records match the filters.
     - In such cases, an empty list is returned rather than failing the play.
     - Record types (rrtype) in the API response include type numbers, e.g., 'A (1)', 'AAAA (28)'.
+    - O(sys_generated) is always answered by the API, as the snapshot does not keep the system generated status.
 '''
 
 EXAMPLES = '''
@@ -146,6 +150,14 @@ EXAMPLES = '''
     provider: "{{ ultra_provider }}"
   register: system_records
 
+- name: Answer repeated audits from a local snapshot, reading the zone again only when its serial changed
+  ultradns.ultradns.record_facts:
+    zone: example.com
+    value: 192.0.2.
+    snapshot: /var/tmp/ultradns-snapshot.db
+    provider: "{{ ultra_provider }}"
+  register: audit_records
+
 - name: Display records with system-generated status
   ansible.builtin.debug:
     msg: "Record {{ item.ownerName }} ({{ item.rrtype }}) is {{ 'system-generated' if item.systemGenerated[0] else 'user-created' }}"
@@ -173,6 +185,8 @@ ansible_facts:
 
 from ansible.module_utils.basic import AnsibleModule
 from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_paging_spec
+from ..module_utils.ultraapi import ultra_snapshot_spec
 from ..module_utils.ultraapi import UltraDNSModule
 
 
@@ -192,6 +206,8 @@ def main():
 
     # Add the arguments required for connecting to UltraDNS API
     argspec.update(ultra_connection_spec())
+    argspec.update(ultra_paging_spec())
+    argspec.update(ultra_snapshot_spec())
 
     module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
     api = UltraDNSModule(module.params)
@@ -200,11 +216,12 @@ def main():
     records, result = api.get_records()
 
     # Check if there was an error
+    result.update(api.api_stats())
     if 'failed' in result and result['failed']:
         module.fail_json(**result)
     else:
         # Return the records as ansible_facts
-        module.exit_json(changed=False, ansible_facts={'record_facts': records})
+        module.exit_json(ansible_facts={'record_facts': records}, **result)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,171 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2024, UltraDNS <info@ultradns.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: record_search
+short_description: Find DNS records referencing a value across all zones in UltraDNS
+version_added: 1.2.0
+description:
+    - Searches every zone, or a given list of zones, for RRSets whose rdata matches a value.
+    - Zones are read from the zone listing as a stream and searched concurrently with the API's server-side value filter.
+    - Stops early once O(max_results) matches have been found.
+    - This module is idempotent and does not make any changes.
+author:
+    - "UltraDNS (@ultradns)"
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_provider
+    - ultradns.ultradns.ultra_providers
+    - ultradns.ultradns.ultra_paging
+options:
+    value:
+        description:
+            - The rdata value to search for (partial match), e.g. an IP address being retired.
+        required: true
+        type: str
+    types:
+        description:
+            - Only return RRSets of these record types, e.g. V(A), V(CNAME) and V(MX).
+            - All record types are returned when not set.
+        required: false
+        type: list
+        elements: str
+    owner:
+        description:
+            - Only search owner names matching this value (partial match).
+        required: false
+        type: str
+    zones:
+        description:
+            - The zones to search.
+            - When not set, every zone visible to the account is searched.
+        required: false
+        type: list
+        elements: str
+    account:
+        description:
+            - Only search zones of this account when O(zones) is not set.
+        required: false
+        type: str
+    max_results:
+        description:
+            - Stop searching once this many RRSets have been found.
+            - No limit when not set.
+        required: false
+        type: int
+    max_workers:
+        description:
+            - The number of zones searched at the same time.
+        required: false
+        type: int
+        default: 8
+    fail_on_error:
+        description:
+            - Fail if any zone could not be searched, rather than reporting it under RV(errors).
+        required: false
+        type: bool
+        default: false
+notes:
+    - Matches are collected in completion order, not sorted by zone.
+    - When the search stops early at O(max_results), RV(truncated) is true.
+'''
+
+EXAMPLES = '''
+- name: Find every A, CNAME and MX record that references a retired address
+  ultradns.ultradns.record_search:
+    value: 192.0.2.15
+    types: [A, CNAME, MX]
+    provider: "{{ ultra_provider }}"
+  register: references
+
+- name: Show where the address is still in use
+  ansible.builtin.debug:
+    msg: "{{ item.ownerName }} {{ item.rrtype }} in {{ item.zoneName }}"
+  loop: "{{ references.matches }}"
+
+- name: Check whether a mail host is referenced at all
+  ultradns.ultradns.record_search:
+    value: mail.example.net
+    types: [MX]
+    max_results: 1
+    provider: "{{ ultra_provider }}"
+  register: mx
+'''
+
+RETURN = '''
+matches:
+    description: The matching RRSets, each with the name of its zone added as C(zoneName)
+    returned: always
+    type: list
+    elements: dict
+    sample:
+        - zoneName: "example.com."
+          ownerName: "www.example.com."
+          rrtype: "A (1)"
+          ttl: 300
+          rdata: ["192.0.2.15"]
+zones_searched:
+    description: The number of zones searched
+    returned: always
+    type: int
+truncated:
+    description: Whether the search stopped early because O(max_results) was reached
+    returned: always
+    type: bool
+errors:
+    description:
+        - Error messages of zones that could not be searched, keyed by zone name
+        - With O(providers), keyed by the account label and zone name, or by the account label alone
+          for an account that could not be searched at all
+    returned: always
+    type: dict
+providers:
+    description: The outcome of each account, keyed by username@host
+    returned: when O(providers) is set
+    type: dict
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_paging_spec
+from ..module_utils.ultraapi import ultra_providers_spec
+from ..module_utils.ultraapi import UltraDNSModule
+
+
+def main():
+    argspec = {
+        'value': dict(required=True, type='str'),
+        'types': dict(required=False, type='list', elements='str'),
+        'owner': dict(required=False, type='str'),
+        'zones': dict(required=False, type='list', elements='str'),
+        'account': dict(required=False, type='str'),
+        'max_results': dict(required=False, type='int'),
+        'max_workers': dict(required=False, type='int', default=8),
+        'fail_on_error': dict(required=False, type='bool', default=False),
+    }
+
+    # Add the arguments required for connecting to UltraDNS API
+    argspec.update(ultra_connection_spec())
+    argspec.update(ultra_paging_spec())
+    argspec.update(ultra_providers_spec())
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+    api = UltraDNSModule(module.params)
+
+    result = api.search_records()
+    result.update(api.api_stats())
+
+    if result['failed']:
+        module.fail_json(**result)
+    else:
+        module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
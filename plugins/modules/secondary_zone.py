@@ -14,14 +14,51 @@ author: UltraDNS (@ultradns)
 short_description: Manage secondary zones in UltraDNS
 description:
     - Add or remove secondary zones in UltraDNS. A secondary zone is a copy of a zone that is transferred from an external nameserver.
+    - A list of zones sharing the same primary nameserver can be managed in one task with O(zones).
 version_added: 0.1.0
-extends_documentation_fragment: ultradns.ultradns.ultra_provider
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_provider
+    - ultradns.ultradns.ultra_journal
 options:
     name:
         description:
             - The fully qualified (dot-terminated) name of the zone to transfer
-        required: true
+            - Mutually exclusive with O(zones)
+        required: false
         type: str
+    zones:
+        description:
+            - A list of fully qualified (dot-terminated) zone names to manage in bulk
+            - All zones share the O(account), O(primary) and O(state) settings
+            - Zones are created, updated or removed concurrently
+            - Mutually exclusive with O(name)
+        required: false
+        type: list
+        elements: str
+        version_added: 1.2.0
+    max_workers:
+        description:
+            - The maximum number of concurrent API requests when O(zones) is used
+        required: false
+        type: int
+        default: 8
+        version_added: 1.2.0
+    wait:
+        description:
+            - When O(zones) is used with O(state=present), wait for every created or updated zone to become active
+            - Transfer status is polled with a backoff that grows while no zone changes state
+        required: false
+        type: bool
+        default: false
+        version_added: 1.2.0
+    wait_timeout:
+        description:
+            - How long to wait in seconds for zones to become active when O(wait=true)
+            - Zones that are not active when the timeout expires are reported as failed
+        required: false
+        type: int
+        default: 300
+        version_added: 1.2.0
     account:
         description:
             - The account name to which the zone belongs as shown in the UltraDNS portal.
@@ -66,6 +103,7 @@ notes:
     - When O(state=present) and the zone already exists, the module will call the UltraDNS API with PUT which will overwrite
       existing primary nameserver details.
     - If setting TSIG keys in the O(primary) section, all O(primary.tsigKey), O(primary.tsigKeyValue), and O(primary.tsigAlgorithm) must be set together.
+    - One of O(name) or O(zones) is required.
 '''
 
 EXAMPLES = '''
@@ -119,12 +157,40 @@ EXAMPLES = '''
       ip: 10.0.0.1
     state: absent
     provider: "{{ ultra_provider }}"
+
+- name: Onboard a batch of secondary zones from the same primary and wait for their first transfer
+  ultradns.ultradns.secondary_zone:
+    zones:
+      - example.com.
+      - example.net.
+      - example.org.
+    account: example-account
+    primary:
+      ip: 10.0.0.1
+    max_workers: 16
+    wait: true
+    wait_timeout: 600
+    state: present
+    provider: "{{ ultra_provider }}"
+'''
+
+RETURN = '''
+zones:
+    description: Outcome for each zone when O(zones) is used, keyed by zone name
+    returned: when O(zones) is used
+    type: dict
+    sample:
+        example.com.:
+            changed: true
+            failed: false
+            msg: Success
+            status: ACTIVE
 '''
-RETURN = ''' # '''
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import env_fallback
 from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_journal_spec
 from ..module_utils.ultraapi import UltraDNSModule
 
 PRIMARY_NS_SPEC = {
@@ -138,7 +204,11 @@ PRIMARY_NS_SPEC = {
 def main():
     # Arguments required for the primary zone
     argspec = {
-        'name': dict(required=True, type='str'),
+        'name': dict(required=False, type='str'),
+        'zones': dict(required=False, type='list', elements='str'),
+        'max_workers': dict(required=False, type='int', default=8),
+        'wait': dict(required=False, type='bool', default=False),
+        'wait_timeout': dict(required=False, type='int', default=300),
         'account': dict(required=True, type='str', fallback=(env_fallback, ['ULTRADNS_ACCOUNT'])),
         'primary': dict(required=True, type='dict', options=PRIMARY_NS_SPEC),
         'state': dict(required=True, type='str', choices=['present', 'absent'])
@@ -146,11 +216,18 @@ def main():
 
     # Add the arguments required for connecting to UltraDNS API
     argspec.update(ultra_connection_spec())
+    argspec.update(ultra_journal_spec())
 
-    module = AnsibleModule(argument_spec=argspec)
+    module = AnsibleModule(argument_spec=argspec,
+                           required_one_of=[('name', 'zones')],
+                           mutually_exclusive=[('name', 'zones')])
     api = UltraDNSModule(module.params)
 
-    result = api.secondary_zone()
+    if module.params['zones']:
+        result = api.secondary_zones()
+    else:
+        result = api.secondary_zone()
+    result.update(api.api_stats())
     if 'failed' in result and result['failed']:
         module.fail_json(**result)
     else:
@@ -0,0 +1,133 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2024, UltraDNS <info@ultradns.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: snapshot_query
+short_description: Query a local snapshot of UltraDNS zones and records with SQL
+version_added: 1.2.0
+description:
+    - Runs a read-only SQL query against the SQLite snapshot kept by M(ultradns.ultradns.zone_facts)
+      and M(ultradns.ultradns.record_facts) with O(snapshot) set.
+    - The zones listed in O(refresh) are brought up to date with the API first. Their RRSets are only
+      read again when their SOA serial changed.
+    - The snapshot is opened read-only, so a query cannot change it.
+author:
+    - "UltraDNS (@ultradns)"
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_provider
+    - ultradns.ultradns.ultra_paging
+options:
+    snapshot:
+        description:
+            - Path of the snapshot file
+        required: true
+        type: path
+    query:
+        description:
+            - The SQL query, with C(?) placeholders for O(parameters)
+            - "The tables are C(zones) (name, account, type, status, data, serial, checked, loaded),
+              C(rrsets) (zone, owner, rrtype, ttl, pool, data) and C(rdata) (zone, owner, rrtype, value)"
+            - Names are stored fully qualified and lower case, and C(rrtype) is the numeric type, e.g. V(1) for A
+            - C(data) holds the zone or RRSet as the API returned it, as JSON
+        required: true
+        type: str
+    parameters:
+        description:
+            - Values bound to the C(?) placeholders of O(query), in order
+        required: false
+        type: list
+        elements: raw
+    refresh:
+        description:
+            - Zones whose RRSets are brought up to date with the API before the query runs
+            - Without it the snapshot is queried as it is and the API is not called
+        required: false
+        type: list
+        elements: str
+    snapshot_max_age:
+        description:
+            - Seconds a zone of O(refresh) is used without checking its SOA serial
+        required: false
+        type: int
+        default: 300
+notes:
+    - This module returns query results only, not state changes.
+    - The snapshot is filled by M(ultradns.ultradns.zone_facts) and M(ultradns.ultradns.record_facts), or by O(refresh).
+'''
+
+EXAMPLES = '''
+- name: Find every name pointing at an address, across all zones of the snapshot
+  ultradns.ultradns.snapshot_query:
+    snapshot: /var/tmp/ultradns-snapshot.db
+    query: SELECT zone, owner, rrtype FROM rdata WHERE value = ?
+    parameters: ["192.0.2.10"]
+  register: users
+
+- name: Count the RRSets of every zone by type, checking two zones for changes first
+  ultradns.ultradns.snapshot_query:
+    snapshot: /var/tmp/ultradns-snapshot.db
+    query: SELECT zone, rrtype, COUNT(*) AS rrsets FROM rrsets GROUP BY zone, rrtype
+    refresh:
+      - example.com.
+      - example.net.
+    provider: "{{ ultra_provider }}"
+  register: counts
+'''
+
+RETURN = '''
+rows:
+    description: The rows returned by the query, keyed by column name
+    returned: success
+    type: list
+    elements: dict
+    sample:
+        - zone: example.com.
+          owner: www.example.com.
+          rrtype: 1
+count:
+    description: The number of rows returned
+    returned: success
+    type: int
+    sample: 1
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_paging_spec
+from ..module_utils.ultraapi import UltraDNSModule
+
+
+def main():
+    argspec = {
+        'snapshot': dict(required=True, type='path'),
+        'query': dict(required=True, type='str'),
+        'parameters': dict(required=False, type='list', elements='raw'),
+        'refresh': dict(required=False, type='list', elements='str'),
+        'snapshot_max_age': dict(required=False, type='int', default=300),
+    }
+
+    # Add the arguments required for connecting to UltraDNS API
+    argspec.update(ultra_connection_spec())
+    argspec.update(ultra_paging_spec())
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+    api = UltraDNSModule(module.params)
+
+    rows, result = api.query_snapshot()
+    result.update(api.api_stats())
+
+    if result['failed']:
+        module.fail_json(**result)
+    else:
+        module.exit_json(rows=rows, count=len(rows), **result)
+
+
+if __name__ == '__main__':
+    main()
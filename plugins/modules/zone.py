@@ -14,25 +14,128 @@ author: UltraDNS (@ultradns)
 short_description: Manage primary zones in UltraDNS
 description:
     - Add or remove primary zones in UltraDNS
+    - A list of zones can be created and removed in one task with O(zones)
 version_added: 0.1.0
-extends_documentation_fragment: ultradns.ultradns.ultra_provider
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_provider
+    - ultradns.ultradns.ultra_journal
 options:
     name:
         description:
             - The fully qualified (dot-terminated) name of the zone to manage
-        required: true
+            - Mutually exclusive with O(zones)
+        required: false
         type: str
     account:
         description:
             - The account name to which the zone belongs as shown in the UltraDNS portal.
-        required: true
+            - Required with O(name)
+            - Used as the default account for entries of O(zones)
+        required: false
         type: str
+    zones:
+        description:
+            - A list of zones to create or remove concurrently
+            - Background task IDs returned by the API are tracked by a single poller until they finish
+            - Mutually exclusive with O(name)
+        required: false
+        type: list
+        elements: dict
+        version_added: 1.2.0
+        suboptions:
+            name:
+                description:
+                    - The fully qualified (dot-terminated) name of the zone
+                required: true
+                type: str
+            account:
+                description:
+                    - The account name for this zone, defaults to O(account)
+                required: false
+                type: str
+            state:
+                description:
+                    - The desired state of this zone, defaults to O(state)
+                required: false
+                type: str
+                choices: ['present', 'absent']
+    max_workers:
+        description:
+            - The maximum number of concurrent API requests when O(zones) is used
+        required: false
+        type: int
+        default: 8
+        version_added: 1.2.0
+    wait_timeout:
+        description:
+            - How long to wait in seconds for background tasks returned by zone creates and deletes
+            - Zones whose task is still running when the timeout expires are reported as failed
+        required: false
+        type: int
+        default: 300
+        version_added: 1.2.0
+    create_type:
+        description:
+            - How a new zone is populated when it is created
+            - V(NEW) creates an empty zone
+            - V(UPLOAD) creates the zone from the BIND zone file given in O(zone_file) in a single request
+            - V(TRANSFER) creates the zone by transferring it from the nameserver given in O(transfer)
+            - Ignored if the zone already exists
+        required: false
+        type: str
+        choices: ['NEW', 'UPLOAD', 'TRANSFER']
+        default: NEW
+        version_added: 1.2.0
+    zone_file:
+        description:
+            - Path to a BIND format zone file on the control node
+            - Required when O(create_type=UPLOAD)
+        required: false
+        type: path
+        version_added: 1.2.0
+    transfer:
+        description:
+            - The nameserver to transfer the zone from
+            - Required when O(create_type=TRANSFER)
+        required: false
+        type: dict
+        version_added: 1.2.0
+        suboptions:
+            ip:
+                description:
+                    - The IP address of the nameserver.
+                required: true
+                type: str
+            tsigKey:
+                description:
+                    - The TSIG key name.
+                required: false
+                type: str
+            tsigKeyValue:
+                description:
+                    - The TSIG key value.
+                required: false
+                type: str
+            tsigAlgorithm:
+                description:
+                    - The TSIG algorithm.
+                required: false
+                type: str
+                choices: ['hmac-md5', 'sha-256', 'sha-512']
     state:
         description:
             - The desired state of the primary zone
-        required: true
+            - Required with O(name)
+            - With O(zones), the state of every entry that does not set its own, V(present) when not set
+        required: false
         choices: ['present', 'absent']
         type: str
+notes:
+    - One of O(name) or O(zones) is required.
+    - With O(zones), O(account) or the entry's own account is required when creating a zone.
+    - Zones created with O(create_type=UPLOAD) or O(create_type=TRANSFER) are imported by a background task,
+      the module waits up to O(wait_timeout) seconds for the task to finish.
+    - O(create_type=UPLOAD) cannot be used through the proxy daemon, tasks that upload a zone file need a provider without C(proxy_socket).
 seealso:
     - module: ultradns.ultradns.secondary_zone
 '''
@@ -51,31 +154,103 @@ EXAMPLES = '''
     account: example-account
     state: absent
     provider: "{{ ultra_provider }}"
+
+- name: Create a zone pre-populated from a BIND zone file
+  ultradns.ultradns.zone:
+    name: example.com.
+    account: example-account
+    create_type: UPLOAD
+    zone_file: files/example.com.zone
+    state: present
+    provider: "{{ ultra_provider }}"
+
+- name: Create a zone by transferring it from the current primary nameserver
+  ultradns.ultradns.zone:
+    name: example.org.
+    account: example-account
+    create_type: TRANSFER
+    transfer:
+      ip: 192.0.2.53
+    state: present
+    provider: "{{ ultra_provider }}"
+
+- name: Create and remove several zones in one task
+  ultradns.ultradns.zone:
+    zones:
+      - name: example.com.
+      - name: example.net.
+      - name: old-example.org.
+        state: absent
+    account: example-account
+    state: present
+    provider: "{{ ultra_provider }}"
 '''
 
-RETURN = ''' # '''
+RETURN = '''
+zones:
+    description: Outcome for each zone when O(zones) is used, keyed by zone name
+    returned: when O(zones) is used
+    type: dict
+    sample:
+        example.com.:
+            changed: true
+            failed: false
+            msg: Success
+            task_id: 0b4e2a4c-1c1f-4b70-9a37-3ddc1dd6c6c9
+            status: COMPLETE
+'''
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import env_fallback
 from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_journal_spec
 from ..module_utils.ultraapi import UltraDNSModule
 
+TRANSFER_NS_SPEC = {
+    'ip': dict(required=True, type='str'),
+    'tsigKey': dict(required=False, type='str'),
+    'tsigKeyValue': dict(required=False, type='str', no_log=True),
+    'tsigAlgorithm': dict(required=False, type='str', choices=['hmac-md5', 'sha-256', 'sha-512'])
+}
+
+ZONE_SPEC = {
+    'name': dict(required=True, type='str'),
+    'account': dict(required=False, type='str'),
+    'state': dict(required=False, type='str', choices=['present', 'absent'])
+}
+
 
 def main():
     # Arguments required for the primary zone
     argspec = {
-        'name': dict(required=True, type='str'),
-        'account': dict(required=True, type='str', fallback=(env_fallback, ['ULTRADNS_ACCOUNT'])),
-        'state': dict(required=True, type='str', choices=['present', 'absent'])
+        'name': dict(required=False, type='str'),
+        'account': dict(required=False, type='str', fallback=(env_fallback, ['ULTRADNS_ACCOUNT'])),
+        'zones': dict(required=False, type='list', elements='dict', options=ZONE_SPEC),
+        'create_type': dict(required=False, type='str', choices=['NEW', 'UPLOAD', 'TRANSFER'], default='NEW'),
+        'zone_file': dict(required=False, type='path'),
+        'transfer': dict(required=False, type='dict', options=TRANSFER_NS_SPEC),
+        'max_workers': dict(required=False, type='int', default=8),
+        'wait_timeout': dict(required=False, type='int', default=300),
+        'state': dict(required=False, type='str', choices=['present', 'absent'])
     }
 
     # Add the arguments required for connecting to UltraDNS API
     argspec.update(ultra_connection_spec())
+    argspec.update(ultra_journal_spec())
 
-    module = AnsibleModule(argument_spec=argspec)
+    module = AnsibleModule(argument_spec=argspec,
+                           required_one_of=[('name', 'zones')],
+                           mutually_exclusive=[('name', 'zones')],
+                           required_by={'name': ('account', 'state')},
+                           required_if=[('create_type', 'UPLOAD', ['zone_file']),
+                                        ('create_type', 'TRANSFER', ['transfer'])])
     api = UltraDNSModule(module.params)
 
-    result = api.primary_zone()
+    if module.params['zones']:
+        result = api.primary_zones()
+    else:
+        result = api.primary_zone()
+    result.update(api.api_stats())
     if 'failed' in result and result['failed']:
         module.fail_json(**result)
     else:
@@ -0,0 +1,195 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2024, UltraDNS <info@ultradns.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: zone_clone
+short_description: Create copies of a zone under other names in UltraDNS
+version_added: 1.2.0
+description:
+    - Creates new primary zones holding the RRSets of a source zone, e.g. customer zones from a template zone.
+    - The source zone's RRSets are read once. For every target the owner names are moved to the target apex in memory.
+    - Each target zone is created and its RRSets are written through the batch API, O(batch_size) RRSets per request.
+    - O(max_workers) targets are cloned at the same time, all from the same source read.
+author:
+    - "UltraDNS (@ultradns)"
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_provider
+    - ultradns.ultradns.ultra_paging
+options:
+    source:
+        description:
+            - The zone to copy
+        required: true
+        type: str
+    targets:
+        description:
+            - The zones to create
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description:
+                    - The name of the new zone
+                required: true
+                type: str
+            account:
+                description:
+                    - The account the zone is created in, overriding O(account)
+                required: false
+                type: str
+    account:
+        description:
+            - The account the target zones are created in
+            - Required unless every entry of O(targets) sets its own account
+        required: false
+        type: str
+    source_provider:
+        description:
+            - Connection information used to read the source zone, when it is kept under another login
+            - When not set, the source is read with O(provider)
+        required: false
+        type: dict
+        suboptions:
+            use_test:
+                description:
+                    - Whether to use the test API endpoint
+                required: false
+                type: bool
+                default: false
+            username:
+                description:
+                    - The UltraDNS username, defaults to the E(ULTRADNS_USERNAME) environment variable
+                required: false
+                type: str
+            password:
+                description:
+                    - The UltraDNS password, defaults to the E(ULTRADNS_PASSWORD) environment variable
+                required: false
+                type: str
+            proxy_socket:
+                description:
+                    - Unix socket of a running UltraDNS proxy daemon to read the source through
+                required: false
+                type: path
+    rewrite_rdata:
+        description:
+            - Also move names inside the source zone found in the rdata of CNAME, MX, NS, PTR, SRV,
+              HTTPS and SVCB RRSets to the target zone
+            - For example C(www.template.com.) becomes C(www.customer.com.) when cloning C(template.com.) to C(customer.com.)
+        required: false
+        type: bool
+        default: true
+    batch_size:
+        description:
+            - The number of RRSets written in one batch request
+        required: false
+        type: int
+        default: 100
+    max_workers:
+        description:
+            - The number of target zones cloned at the same time
+        required: false
+        type: int
+        default: 8
+    wait_timeout:
+        description:
+            - Seconds to wait for the creation of a zone to finish before its RRSets are written
+        required: false
+        type: int
+        default: 300
+notes:
+    - The SOA and the NS RRSet at the apex are not copied, the new zones get their own.
+    - Pool profiles are copied as they are.
+    - Targets that already exist are left untouched and reported as not changed.
+    - In check mode the zones that would be created are reported and nothing is sent.
+'''
+
+EXAMPLES = '''
+- name: Create customer zones from the template zone
+  ultradns.ultradns.zone_clone:
+    source: template.example.
+    account: customers
+    targets:
+      - name: customer1.com.
+      - name: customer2.com.
+      - name: customer3.net.
+        account: customers-eu
+    provider: "{{ ultra_provider }}"
+
+- name: Clone a template kept under a separate login, twenty zones at a time
+  ultradns.ultradns.zone_clone:
+    source: template.example.
+    source_provider: "{{ template_provider }}"
+    account: customers
+    targets: "{{ new_customers }}"   # a list of {name: ...} entries
+    max_workers: 20
+    provider: "{{ ultra_provider }}"
+'''
+
+RETURN = '''
+zones:
+    description: The outcome per target zone
+    returned: always
+    type: dict
+    sample:
+        customer1.com.:
+            rrsets: 42
+            applied: 42
+            changed: true
+            failed: false
+        customer2.com.:
+            rrsets: 0
+            applied: 0
+            changed: false
+            failed: false
+            msg: The zone already exists
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.ultraapi import CONNECTION_SPEC
+from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_paging_spec
+from ..module_utils.ultraapi import UltraDNSModule
+
+
+def main():
+    argspec = {
+        'source': dict(required=True, type='str'),
+        'targets': dict(required=True, type='list', elements='dict', options={
+            'name': dict(required=True, type='str'),
+            'account': dict(required=False, type='str'),
+        }),
+        'account': dict(required=False, type='str'),
+        'source_provider': dict(required=False, type='dict', options=CONNECTION_SPEC),
+        'rewrite_rdata': dict(required=False, type='bool', default=True),
+        'batch_size': dict(required=False, type='int', default=100),
+        'max_workers': dict(required=False, type='int', default=8),
+        'wait_timeout': dict(required=False, type='int', default=300),
+    }
+
+    # Add the arguments required for connecting to UltraDNS API
+    argspec.update(ultra_connection_spec())
+    argspec.update(ultra_paging_spec())
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+    api = UltraDNSModule(module.params)
+
+    result = api.zone_clone(check_mode=module.check_mode)
+    result.update(api.api_stats())
+
+    if result['failed']:
+        module.fail_json(**result)
+    else:
+        module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,10 @@ description:
     - This module is idempotent and does not make any changes.
 author:
     - "UltraDNS (@ultradns)"
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_paging
+    - ultradns.ultradns.ultra_providers
+    - ultradns.ultradns.ultra_snapshot
 options:
     name:
         description:
@@ -48,6 +52,12 @@ options:
         required: false
         type: str
         choices: ['ultra1', 'ultra2']
+    max_workers:
+        description:
+            - The number of accounts listed at the same time when O(providers) is set.
+        required: false
+        type: int
+        default: 8
     provider:
         description:
             - Dictionary containing connection details.
@@ -75,6 +85,7 @@ options:
                 default: false
 notes:
     - This module returns facts only, not state changes.
+    - With O(providers) or O(network) set, the zones are always listed by the API and O(snapshot) is not used.
 '''
 
 EXAMPLES = '''
@@ -87,6 +98,24 @@ EXAMPLES = '''
     provider: "{{ ultra_provider }}"
   register: zone_data
 
+- name: Gather the zones of several accounts in one task
+  ultradns.ultradns.zone_facts:
+    status: ACTIVE
+    providers:
+      - username: "{{ ops_username }}"
+        password: "{{ ops_password }}"
+      - username: "{{ marketing_username }}"
+        password: "{{ marketing_password }}"
+  register: all_zones
+
+- name: Gather the zones from a local snapshot, listing them from the API at most every 10 minutes
+  ultradns.ultradns.zone_facts:
+    type: PRIMARY
+    snapshot: /var/tmp/ultradns-snapshot.db
+    snapshot_max_age: 600
+    provider: "{{ ultra_provider }}"
+  register: zone_data
+
 - name: Display zones
   ansible.builtin.debug:
     msg: "Found zone: {{ item.properties.name }}"
@@ -113,6 +142,9 @@ ansible_facts:
 
 from ansible.module_utils.basic import AnsibleModule
 from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_paging_spec
+from ..module_utils.ultraapi import ultra_snapshot_spec
+from ..module_utils.ultraapi import ultra_providers_spec
 from ..module_utils.ultraapi import UltraDNSModule
 
 
@@ -124,10 +156,14 @@ def main():
         'status': dict(required=False, type='str', choices=['ACTIVE', 'SUSPENDED', 'ALL']),
         'account': dict(required=False, type='str'),
         'network': dict(required=False, type='str', choices=['ultra1', 'ultra2']),
+        'max_workers': dict(required=False, type='int', default=8),
     }
 
     # Add the arguments required for connecting to UltraDNS API
     argspec.update(ultra_connection_spec())
+    argspec.update(ultra_paging_spec())
+    argspec.update(ultra_snapshot_spec())
+    argspec.update(ultra_providers_spec())
 
     module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
     api = UltraDNSModule(module.params)
@@ -136,11 +172,12 @@ def main():
     zones, result = api.get_zones()
 
     # Check if there was an error
+    result.update(api.api_stats())
     if 'failed' in result and result['failed']:
         module.fail_json(**result)
     else:
         # Return the zones as ansible_facts
-        module.exit_json(changed=False, ansible_facts={'zones': zones})
+        module.exit_json(ansible_facts={'zones': zones}, **result)
 
 
 if __name__ == '__main__':
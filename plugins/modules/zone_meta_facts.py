@@ -150,11 +150,12 @@ def main():
     zone_metadata, result = api.get_zone_metadata()
 
     # Check if there was an error
+    result.update(api.api_stats())
     if 'failed' in result and result['failed']:
         module.fail_json(**result)
     else:
         # Return the zone metadata as ansible_facts
-        module.exit_json(changed=False, ansible_facts={'zone_meta': zone_metadata})
+        module.exit_json(ansible_facts={'zone_meta': zone_metadata}, **result)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,180 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2024, UltraDNS <info@ultradns.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: zone_report
+short_description: Report zone and record statistics for UltraDNS without gathering every record
+version_added: 1.2.0
+description:
+    - Counts zones by status and type, records by type, TTLs in buckets, pools by kind and records per owner.
+    - Zones and their RRSets are read page by page and folded into counters as they arrive, so memory use does not grow with the number or size of zones.
+    - Writes one CSV row per zone to O(csv_path) and per-zone statistics plus totals to O(json_path) while zones are read.
+    - Returns only the account-wide totals.
+author:
+    - "UltraDNS (@ultradns)"
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_provider
+    - ultradns.ultradns.ultra_paging
+options:
+    zones:
+        description:
+            - The zones to report on.
+            - When not set, every zone matching O(type), O(status), O(account) and O(network) is included.
+        required: false
+        type: list
+        elements: str
+    type:
+        description:
+            - Only include zones of this type when O(zones) is not set.
+        required: false
+        type: str
+        choices: ['PRIMARY', 'SECONDARY', 'ALIAS']
+    status:
+        description:
+            - Only include zones with this status when O(zones) is not set.
+        required: false
+        type: str
+        choices: ['ACTIVE', 'SUSPENDED', 'ALL']
+    account:
+        description:
+            - Only include zones of this account when O(zones) is not set.
+        required: false
+        type: str
+    network:
+        description:
+            - Only include zones on this network when O(zones) is not set.
+        required: false
+        type: str
+        choices: ['ultra1', 'ultra2']
+    include_records:
+        description:
+            - Read the RRSets of every zone for the record statistics.
+            - When false only zone counts by status and type are reported, from the zone listing alone.
+        required: false
+        type: bool
+        default: true
+    ttl_buckets:
+        description:
+            - Upper bounds in seconds of the TTL histogram buckets.
+        required: false
+        type: list
+        elements: int
+        default: [60, 300, 900, 3600, 86400]
+    csv_path:
+        description:
+            - Write one row per zone to this CSV file.
+        required: false
+        type: path
+    json_path:
+        description:
+            - Write the statistics of every zone and the totals to this JSON file.
+        required: false
+        type: path
+    max_workers:
+        description:
+            - The number of zones read at the same time.
+        required: false
+        type: int
+        default: 8
+    fail_on_error:
+        description:
+            - Fail if the records of any zone could not be read, rather than reporting it under RV(errors).
+        required: false
+        type: bool
+        default: false
+notes:
+    - Records per owner are counted from consecutive RRSets of the same owner, as the API returns RRSets ordered by owner name.
+    - The report files are only replaced when their content changes, which is what RV(changed) reports.
+    - In check mode the totals are returned but no files are written.
+'''
+
+EXAMPLES = '''
+- name: Write an inventory of every zone with record statistics
+  ultradns.ultradns.zone_report:
+    csv_path: zone_inventory.csv
+    json_path: zone_inventory.json
+    provider: "{{ ultra_provider }}"
+  register: inventory
+
+- name: Show the totals
+  ansible.builtin.debug:
+    msg: "{{ inventory.report.zones }} zones, {{ inventory.report.records }} records, {{ inventory.report.records_by_type }}"
+
+- name: Count zones by status only, without reading records
+  ultradns.ultradns.zone_report:
+    include_records: false
+    type: SECONDARY
+    provider: "{{ ultra_provider }}"
+'''
+
+RETURN = '''
+report:
+    description: Totals across all reported zones
+    returned: success
+    type: dict
+    sample:
+        zones: 2
+        zones_by_status: {ACTIVE: 2}
+        zones_by_type: {PRIMARY: 1, SECONDARY: 1}
+        rrsets: 14
+        records: 19
+        pools: 1
+        records_by_type: {A: 8, AAAA: 2, MX: 2, NS: 4, SOA: 2, TXT: 1}
+        ttl_histogram: {"<=300": 9, "<=86400": 5}
+        pools_by_kind: {RDPool: 1}
+        records_per_owner: {"<=1": 6, "<=2": 2, "<=5": 2}
+errors:
+    description: Error messages of zones whose records could not be read, keyed by zone name
+    returned: success
+    type: dict
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_paging_spec
+from ..module_utils.ultraapi import UltraDNSModule
+
+
+def main():
+    argspec = {
+        'zones': dict(required=False, type='list', elements='str'),
+        'type': dict(required=False, type='str', choices=['PRIMARY', 'SECONDARY', 'ALIAS']),
+        'status': dict(required=False, type='str', choices=['ACTIVE', 'SUSPENDED', 'ALL']),
+        'account': dict(required=False, type='str'),
+        'network': dict(required=False, type='str', choices=['ultra1', 'ultra2']),
+        'include_records': dict(required=False, type='bool', default=True),
+        'ttl_buckets': dict(required=False, type='list', elements='int', default=[60, 300, 900, 3600, 86400]),
+        'csv_path': dict(required=False, type='path'),
+        'json_path': dict(required=False, type='path'),
+        'max_workers': dict(required=False, type='int', default=8),
+        'fail_on_error': dict(required=False, type='bool', default=False),
+    }
+
+    # Add the arguments required for connecting to UltraDNS API
+    argspec.update(ultra_connection_spec())
+    argspec.update(ultra_paging_spec())
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+    api = UltraDNSModule(module.params)
+
+    if module.check_mode:
+        result = api.zone_report()
+    else:
+        result = api.zone_report(module.params['csv_path'], module.params['json_path'])
+    result.update(api.api_stats())
+
+    if result['failed']:
+        module.fail_json(**result)
+    else:
+        module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
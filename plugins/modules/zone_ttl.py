@@ -0,0 +1,171 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2024, UltraDNS <info@ultradns.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+module: zone_ttl
+short_description: Set the TTL of many RRSets of a zone in UltraDNS
+version_added: 1.2.0
+description:
+    - Sets the TTL of every RRSet of a zone selected by owner, kind, current TTL and type.
+    - Typically used to lower TTLs ahead of a migration and raise them again afterwards.
+    - RRSets are read page by page and RRSets already at the target TTL are skipped without a request.
+    - The others are updated with concurrent TTL-only PATCH requests, rate limited across all workers.
+author:
+    - "UltraDNS (@ultradns)"
+extends_documentation_fragment:
+    - ultradns.ultradns.ultra_provider
+    - ultradns.ultradns.ultra_paging
+options:
+    zone:
+        description:
+            - The zone whose RRSets are updated
+        required: true
+        type: str
+    ttl:
+        description:
+            - The TTL to set
+        required: true
+        type: int
+    owner:
+        description:
+            - Only update RRSets whose owner name matches (partial match)
+        required: false
+        type: str
+    kind:
+        description:
+            - Only update RRSets of this kind
+        required: false
+        type: str
+        choices: ['ALL', 'RECORDS', 'POOLS', 'RD_POOLS', 'DIR_POOLS', 'SB_POOLS', 'TC_POOLS']
+        default: 'ALL'
+    current_ttl:
+        description:
+            - Only update RRSets that currently have this TTL
+            - Only applies to O(kind=ALL) and O(kind=RECORDS)
+        required: false
+        type: int
+    types:
+        description:
+            - Only update RRSets of these record types, e.g. V(A) or V(CNAME)
+            - When not set, every type except SOA is updated
+        required: false
+        type: list
+        elements: str
+    max_workers:
+        description:
+            - The number of PATCH requests in flight at the same time
+        required: false
+        type: int
+        default: 8
+    rate_limit:
+        description:
+            - The most PATCH requests sent per second across all workers
+        required: false
+        type: float
+        default: 10
+notes:
+    - Progress is written to the system log of the control node every 100 RRSets.
+    - In check mode the RRSets that would change are reported and nothing is sent.
+'''
+
+EXAMPLES = '''
+- name: Lower every TTL of the zone ahead of the migration
+  ultradns.ultradns.zone_ttl:
+    zone: example.com.
+    ttl: 60
+    provider: "{{ ultra_provider }}"
+
+- name: Restore the TTL of the records lowered before
+  ultradns.ultradns.zone_ttl:
+    zone: example.com.
+    ttl: 3600
+    current_ttl: 60
+    kind: RECORDS
+    provider: "{{ ultra_provider }}"
+
+- name: Lower the TTL of the web front ends only
+  ultradns.ultradns.zone_ttl:
+    zone: example.com.
+    ttl: 300
+    owner: www
+    types: [A, AAAA, CNAME]
+    rate_limit: 5
+    provider: "{{ ultra_provider }}"
+'''
+
+RETURN = '''
+rrset_counts:
+    description:
+        - The number of RRSets selected, already at the TTL, changed and failed
+        - In check mode C(changed) counts the RRSets that would change
+    returned: success
+    type: dict
+    sample:
+        selected: 1200
+        unchanged: 14
+        changed: 1186
+        failed: 0
+rrsets:
+    description: The RRSets whose TTL was changed, with the TTL they had before
+    returned: success
+    type: list
+    elements: dict
+    sample:
+        - owner: www.example.com.
+          type: A
+          previous_ttl: 3600
+errors:
+    description: Error messages of RRSets that could not be updated, keyed by owner and type
+    returned: success
+    type: dict
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.ultraapi import ultra_connection_spec
+from ..module_utils.ultraapi import ultra_paging_spec
+from ..module_utils.ultraapi import UltraDNSModule
+
+
+def main():
+    argspec = {
+        'zone': dict(required=True, type='str'),
+        'ttl': dict(required=True, type='int'),
+        'owner': dict(required=False, type='str'),
+        'kind': dict(required=False, type='str',
+                     choices=['ALL', 'RECORDS', 'POOLS', 'RD_POOLS', 'DIR_POOLS', 'SB_POOLS', 'TC_POOLS'],
+                     default='ALL'),
+        'current_ttl': dict(required=False, type='int'),
+        'types': dict(required=False, type='list', elements='str'),
+        'max_workers': dict(required=False, type='int', default=8),
+        'rate_limit': dict(required=False, type='float', default=10),
+    }
+
+    # Add the arguments required for connecting to UltraDNS API
+    argspec.update(ultra_connection_spec())
+    argspec.update(ultra_paging_spec())
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+    api = UltraDNSModule(module.params)
+
+    def progress(counts):
+        module.log(f"zone_ttl {module.params['zone']}: {counts['changed']} changed, {counts['failed']} failed "
+                   f"of {counts['selected']} rrsets read so far")
+
+    result = api.zone_ttl(check_mode=module.check_mode, progress=progress)
+    result.update(api.api_stats())
+
+    if result['failed']:
+        module.fail_json(**result)
+    else:
+        module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
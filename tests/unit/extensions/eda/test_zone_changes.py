@@ -0,0 +1,197 @@
+"""Tests for the zone_changes event source against a local stub API."""
+
+import asyncio
+import json
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+
+pytest.importorskip('ultra_rest_client')
+
+from ansible_collections.ultradns.ultradns.extensions.eda.plugins.event_source import zone_changes  # noqa: E402
+from ansible_collections.ultradns.ultradns.extensions.eda.plugins.event_source.zone_changes import (  # noqa: E402
+    ZoneChangeDetector,
+    _connect,
+)
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSError  # noqa: E402
+
+
+class StubApi:
+    """Zones and SOA serials served by the stub, editable between polls."""
+
+    def __init__(self):
+        self.zones = {}
+        self.requests = []
+        # zones whose rrsets answer with an error
+        self.broken = set()
+        self.fail_listing = False
+
+    def set_zone(self, name, modified, serial, count=2):
+        self.zones[name] = {'modified': modified, 'serial': serial, 'count': count}
+
+    def handle(self, path, query):
+        self.requests.append(path)
+        if path == '/v3/zones':
+            if self.fail_listing:
+                return {'errorCode': 60001, 'errorMessage': 'Service unavailable'}
+            names = sorted(self.zones)
+            start = int(query.get('cursor', ['0'])[0])
+            limit = int(query.get('limit', ['1000'])[0])
+            page = names[start:start + limit]
+            body = {'zones': list(
+                {'properties': {'name': n, 'lastModifiedDateTime': self.zones[n]['modified'],
+                                'resourceRecordCount': self.zones[n]['count'], 'status': 'ACTIVE'}}
+                for n in page)}
+            if start + limit < len(names):
+                body['cursorInfo'] = {'next': str(start + limit)}
+            return body
+        name = path.split('/')[3]
+        if '/rrsets/SOA/' in path:
+            serial = self.zones[name]['serial']
+            return {'rrSets': [{'ownerName': name, 'rrtype': 'SOA (6)',
+                                'rdata': [f'ns1.example.net. admin.{name} {serial} 3600 600 86400 300']}]}
+        if name in self.broken:
+            return {'errorCode': 1801, 'errorMessage': 'Zone does not exist in the system.'}
+        rrsets = [{'ownerName': f'www.{name}', 'rrtype': 'A (1)', 'ttl': 300, 'rdata': ['192.0.2.1']}]
+        return {'rrSets': rrsets, 'resultInfo': {'totalCount': 1, 'returnedCount': 1, 'offset': 0}}
+
+
+@pytest.fixture
+def stub():
+    api = StubApi()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, body):
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            self._send({'accessToken': 'token', 'refreshToken': 'refresh'})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            self._send(api.handle(url.path, parse_qs(url.query)))
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    api.host = f'http://127.0.0.1:{server.server_port}'
+    yield api
+    server.shutdown()
+
+
+def test_only_changed_zones_are_reported(stub):
+    for i in range(5):
+        stub.set_zone(f'zone{i}.com.', '2024-01-01T00:00:00Z', 1)
+    connection = _connect({'host': stub.host, 'username': 'user', 'password': 'pass'})
+    detector = ZoneChangeDetector(connection, include_rrsets=True, page_size=2, seed_serials=True)
+
+    assert detector.poll() == []
+    assert len(detector.index) == 5
+
+    stub.requests.clear()
+    stub.set_zone('zone1.com.', '2024-01-02T00:00:00Z', 2, count=3)
+    stub.set_zone('zone3.com.', '2024-01-02T00:00:00Z', 1)
+    del stub.zones['zone4.com.']
+    events = detector.poll()
+
+    changes = dict((e['zone'], e) for e in events)
+    assert changes['zone1.com.']['change'] == 'modified'
+    assert changes['zone1.com.']['serial'] == 2
+    assert changes['zone1.com.']['rrsets'][0]['ownerName'] == 'www.zone1.com.'
+    assert changes['zone1.com.']['previous_serial'] == 1
+    assert changes['zone1.com.']['records_changed'] is True
+    # the serial seeded on the first poll shows zone3 only changed its metadata
+    assert changes['zone3.com.']['records_changed'] is False
+    assert 'rrsets' not in changes['zone3.com.']
+    assert changes['zone4.com.']['change'] == 'deleted'
+    # rrsets are only fetched for the zones whose records changed
+    assert list(r for r in stub.requests if r.endswith('/rrsets')) == ['/v3/zones/zone1.com./rrsets']
+
+
+def test_unknown_previous_serial_is_reported_as_unknown(stub):
+    stub.set_zone('zone0.com.', '2024-01-01T00:00:00Z', 1)
+    connection = _connect({'host': stub.host, 'username': 'user', 'password': 'pass'})
+    detector = ZoneChangeDetector(connection, include_rrsets=True)
+    assert detector.poll() == []
+    assert not any('/SOA/' in r for r in stub.requests)
+
+    stub.set_zone('zone0.com.', '2024-01-02T00:00:00Z', 1)
+    event = detector.poll()[0]
+    assert event['previous_serial'] is None
+    assert event['records_changed'] is None
+    assert 'rrsets' not in event
+
+
+def test_unreadable_rrsets_are_reported_as_an_error(stub):
+    stub.set_zone('zone0.com.', '2024-01-01T00:00:00Z', 1)
+    connection = _connect({'host': stub.host, 'username': 'user', 'password': 'pass'})
+    detector = ZoneChangeDetector(connection, include_rrsets=True, seed_serials=True)
+    detector.poll()
+
+    stub.broken.add('zone0.com.')
+    stub.set_zone('zone0.com.', '2024-01-02T00:00:00Z', 2)
+    event = detector.poll()[0]
+    assert event['records_changed'] is True
+    assert 'rrsets' not in event
+    assert 'Zone does not exist' in event['error']
+
+
+def test_failed_poll_keeps_the_index(stub):
+    stub.set_zone('zone0.com.', '2024-01-01T00:00:00Z', 1)
+    connection = _connect({'host': stub.host, 'username': 'user', 'password': 'pass'})
+    detector = ZoneChangeDetector(connection, seed_serials=True)
+    detector.poll()
+
+    stub.set_zone('zone0.com.', '2024-01-02T00:00:00Z', 2)
+    stub.fail_listing = True
+    with pytest.raises(UltraDNSError):
+        detector.poll()
+
+    # the change is still reported once the API answers again
+    stub.fail_listing = False
+    event = detector.poll()[0]
+    assert (event['zone'], event['previous_serial'], event['serial']) == ('zone0.com.', 1, 2)
+
+
+def test_event_source_survives_a_failed_poll(monkeypatch):
+    class FlakyDetector:
+        polls = 0
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def poll(self):
+            FlakyDetector.polls += 1
+            if FlakyDetector.polls == 1:
+                raise TimeoutError('read timed out')
+            return [{'change': 'added', 'zone': 'zone0.com.'}]
+
+    class Stop(Exception):
+        pass
+
+    class Queue:
+        async def put(self, event):
+            raise Stop(event)
+
+    async def sleep(delay):
+        pass
+
+    monkeypatch.setattr(zone_changes, '_connect', lambda args: None)
+    monkeypatch.setattr(zone_changes, 'ZoneChangeDetector', FlakyDetector)
+    monkeypatch.setattr(zone_changes.asyncio, 'sleep', sleep)
+    with pytest.raises(Stop):
+        asyncio.run(zone_changes.main(Queue(), {}))
+    assert FlakyDetector.polls == 2
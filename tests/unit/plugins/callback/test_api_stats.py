@@ -0,0 +1,63 @@
+"""Unit tests for the api_stats callback plugin."""
+
+from ansible.plugins.loader import callback_loader
+from ansible_collections.ultradns.ultradns.plugins.module_utils.connection import ApiStats
+
+
+class FakeTask:
+    def __init__(self, name, action):
+        self._uuid = name
+        self.name = name
+        self.action = action
+
+    def get_name(self):
+        return self.name
+
+
+class FakeResult:
+    def __init__(self, task, result):
+        self._task = task
+        self._result = result
+
+
+def run_stats(uri):
+    stats = ApiStats()
+    stats.add_login(0.2)
+    stats.add_call('GET', uri, 0.1, received=100)
+    stats.add_call('PATCH', uri, 0.3, sent=40)
+    return stats.as_dict()
+
+
+def test_loop_of_record_runs_is_aggregated_with_bulk_estimate():
+    callback = callback_loader.get('ultradns.ultradns.api_stats')
+    callback.set_options()
+    task = FakeTask('add txt values', 'ultradns.ultradns.record')
+    items = list(
+        {'api_stats': run_stats('/zones/example.com./rrsets/TXT/www'),
+         'invocation': {'module_args': {'zone': 'example.com.', 'name': 'www', 'type': 'TXT', 'data': str(i)}}}
+        for i in range(3))
+    callback.v2_runner_on_ok(FakeResult(task, {'results': items}))
+
+    report = callback.report()
+
+    assert report['totals']['calls'] == 6
+    assert report['totals']['logins'] == 3
+    assert report['tasks'][0]['bulk_savings'] == 2 + 4
+    assert report['endpoints'][0] == {'endpoint': 'PATCH /zones/{zone}/rrsets/TXT/{owner}', 'calls': 3,
+                                      'seconds': 0.9, 'average': 0.3, 'slowest': 0.3}
+    assert 'Bulk modes could have saved about 6 calls' in callback.format_report(report)
+
+
+def test_reads_answered_by_the_proxy_are_counted():
+    callback = callback_loader.get('ultradns.ultradns.api_stats')
+    callback.set_options()
+    stats = ApiStats()
+    stats.add_cached()
+    stats.add_call('GET', '/zones/example.com./rrsets/A/www', 0.1)
+    callback.v2_runner_on_ok(FakeResult(FakeTask('read', 'ultradns.ultradns.record_facts'), {'api_stats': stats.as_dict()}))
+
+    report = callback.report()
+
+    assert report['totals']['cached'] == 1
+    assert report['tasks'][0]['cached'] == 1
+    assert '1 reads were answered by the UltraDNS proxy' in callback.format_report(report)
@@ -0,0 +1,75 @@
+"""Unit tests for the rrset lookup plugin."""
+
+import os
+import time
+
+from ansible.plugins.loader import lookup_loader
+from ansible_collections.ultradns.ultradns.plugins.lookup import rrset
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+
+RECORDS = [
+    {'ownerName': 'www.example.com.', 'rrtype': 'A (1)', 'ttl': 300, 'rdata': ['192.0.2.1']},
+    {'ownerName': 'mail.example.com.', 'rrtype': 'A (1)', 'ttl': 300, 'rdata': ['192.0.2.25']},
+    {'ownerName': 'example.com.', 'rrtype': 'MX (15)', 'ttl': 300, 'rdata': ['10 mail.example.com.']},
+]
+
+
+def test_lookups_for_one_zone_share_a_single_read(monkeypatch, tmp_path):
+    reads = []
+
+    def get_records(self):
+        reads.append(self.params['zone'])
+        return RECORDS, {'changed': False, 'failed': False, 'msg': ''}
+
+    def get_zones(self):
+        zones = [{'properties': {'name': 'example.com.'}}, {'properties': {'name': 'sub.example.com.'}}]
+        return zones, {'changed': False, 'failed': False, 'msg': ''}
+
+    monkeypatch.setattr(UltraDNSModule, 'get_records', get_records)
+    monkeypatch.setattr(UltraDNSModule, 'get_zones', get_zones)
+    monkeypatch.setattr(rrset, 'CACHE_DIR', str(tmp_path))
+
+    lookup = lookup_loader.get('ultradns.ultradns.rrset')
+    assert lookup.run(['www.example.com', 'mail.example.com.'], username='u', password='p') == ['192.0.2.1', '192.0.2.25']
+    assert lookup.run(['example.com'], type='MX', username='u', password='p') == ['10 mail.example.com.']
+    assert lookup.run(['www', 'nothere'], zone='example.com', username='u', password='p') == ['192.0.2.1']
+    assert reads == ['example.com.']
+
+    # a later task runs the lookup in a new worker, which reads the zone from the cache file
+    lookup = lookup_loader.get('ultradns.ultradns.rrset')
+    assert lookup.run(['mail'], zone='example.com', username='u', password='p') == ['192.0.2.25']
+    assert reads == ['example.com.']
+    assert all(oct(os.stat(p).st_mode & 0o777) == '0o600' for p in tmp_path.iterdir())
+
+    assert lookup.run(['mail'], zone='example.com', cache_ttl=0, username='u', password='p') == ['192.0.2.25']
+    assert reads == ['example.com.', 'example.com.']
+
+
+def test_cache_in_a_directory_others_can_write_is_ignored(monkeypatch, tmp_path):
+    reads = []
+
+    def get_records(self):
+        reads.append(self.params['zone'])
+        return RECORDS, {'changed': False, 'failed': False, 'msg': ''}
+
+    monkeypatch.setattr(UltraDNSModule, 'get_records', get_records)
+    cache = tmp_path / 'cache'
+    cache.mkdir()
+    cache.chmod(0o777)
+    monkeypatch.setattr(rrset, 'CACHE_DIR', str(cache))
+
+    lookup = lookup_loader.get('ultradns.ultradns.rrset')
+    assert lookup.run(['www'], zone='example.com', username='u', password='p') == ['192.0.2.1']
+    assert lookup.run(['www'], zone='example.com', username='u', password='p') == ['192.0.2.1']
+    assert reads == ['example.com.', 'example.com.']
+    assert list(cache.iterdir()) == []
+
+    # a planted file readable by others is not trusted either
+    cache.chmod(0o700)
+    lookup.run(['www'], zone='example.com', username='u', password='p')
+    planted = next(cache.iterdir())
+    planted.write_text(f'[{time.time()}, [["www.example.com.", 1, ["203.0.113.66"]]]]')
+    planted.chmod(0o644)
+    assert lookup.run(['www'], zone='example.com', username='u', password='p') == ['192.0.2.1']
+    assert reads == ['example.com.'] * 4
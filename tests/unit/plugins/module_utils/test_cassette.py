@@ -0,0 +1,46 @@
+"""Unit tests for recording and replaying API traffic."""
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils import connection
+from ansible_collections.ultradns.ultradns.plugins.module_utils.connection import UltraConnection
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+RRSET = '/zones/example.com./rrsets/A/www.example.com.'
+TASK = '/tasks/abc'
+
+
+def test_record_then_replay_offline(tmp_path, monkeypatch):
+    cassette = str(tmp_path / 'api.jsonl.gz')
+    answers = {
+        RRSET: [{'rrSets': [{'ownerName': 'www.example.com.', 'rrtype': 'A (1)', 'ttl': 300, 'rdata': ['192.0.2.1']}]}],
+        TASK: [{'code': 'PENDING'}, {'code': 'COMPLETE'}],
+    }
+
+    def upstream(self, uri, method, params=None, body=None, retry=True, files=None, content_type='application/json'):
+        return answers[uri].pop(0) if method == 'GET' else {}
+
+    # GETs go through _do_call like every other request when the SDK transport is not used
+    monkeypatch.setattr(connection, 'HAS_SDK', False)
+    monkeypatch.setattr(connection.RestApiConnection, '_do_call', upstream)
+    monkeypatch.setenv('ULTRADNS_CASSETTE', cassette)
+    monkeypatch.setenv('ULTRADNS_CASSETTE_MODE', 'record')
+    recorder = UltraConnection()
+    rrset = recorder.get(RRSET)
+    recorder.put(RRSET, {'ttl': 60, 'rdata': ['192.0.2.1']})
+    assert [recorder.get(TASK)['code'] for _ in range(2)] == ['PENDING', 'COMPLETE']
+    recorder.cassette.flush()
+
+    # nothing may reach the API from here on
+    def offline(self, *args, **kwargs):
+        raise AssertionError('replay made an API call')
+
+    monkeypatch.setattr(connection.RestApiConnection, '_do_call', offline)
+    monkeypatch.setattr(connection, 'HAS_SDK', True)
+    monkeypatch.setenv('ULTRADNS_CASSETTE_MODE', 'replay')
+    api = UltraDNSModule({'provider': {'username': None, 'password': None, 'use_test': False}})
+    assert api.connect() is True
+    assert api.connection.get(RRSET) == rrset
+    # body key order and encoding do not matter when matching a request
+    assert api.update(RRSET, '{"rdata": ["192.0.2.1"], "ttl": 60}')['failed'] is False
+    assert [api.connection.get(TASK)['code'] for _ in range(3)] == ['PENDING', 'COMPLETE', 'COMPLETE']
+    assert api.connection.get('/zones/missing./rrsets')['errorCode'] == 404
+    assert api.connection.stats.as_dict()['calls'] == 6
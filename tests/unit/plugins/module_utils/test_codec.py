@@ -0,0 +1,92 @@
+"""Unit tests for the JSON codec and the incremental array parser."""
+
+import json
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils import codec
+
+
+PAGE = {
+    'zoneName': 'example.com.',
+    'rrSets': list({'ownerName': f'h{i}.example.com.', 'rrtype': 'A (1)', 'ttl': 300 + i,
+                    'rdata': [f'192.0.2.{i}'], 'note': 'café \\"q\\"'} for i in range(25)),
+    'queryInfo': {'limit': 1000},
+    'resultInfo': {'totalCount': 25, 'offset': 0, 'returnedCount': 25},
+}
+
+
+def chunked(data, size):
+    return list(data[i:i + size] for i in range(0, len(data), size))
+
+
+def test_codec_round_trip():
+    assert codec.loads(codec.dumps(PAGE).encode('utf-8')) == PAGE
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 64, 100000])
+def test_iter_array_at_any_chunk_boundary(size):
+    meta = {}
+    data = json.dumps(PAGE, indent=1, ensure_ascii=False).encode('utf-8')
+    items = list(codec.iter_array(chunked(data, size), 'rrSets', meta))
+
+    assert items == PAGE['rrSets']
+    assert meta == {'zoneName': 'example.com.', 'queryInfo': {'limit': 1000}, 'resultInfo': PAGE['resultInfo']}
+
+
+def test_iter_array_keeps_non_object_documents():
+    meta = {}
+    data = json.dumps([{'errorCode': 70002, 'errorMessage': 'Data not found.'}]).encode()
+
+    assert list(codec.iter_array(chunked(data, 5), 'rrSets', meta)) == []
+    assert meta['_body'][0]['errorCode'] == 70002
+
+
+def test_iter_array_is_lazy():
+    meta = {}
+    chunks = iter(chunked(json.dumps(PAGE).encode(), 50))
+    items = codec.iter_array(chunks, 'rrSets', meta)
+    next(items)
+
+    assert next(chunks, None) is not None
+    assert 'resultInfo' not in meta
+
+
+def test_connection_streams_pages():
+    pytest.importorskip('ultra_rest_client')
+    from ansible_collections.ultradns.ultradns.plugins.module_utils.connection import UltraConnection
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if 'missing' in self.path:
+                status, body = 404, [{'errorCode': 70002, 'errorMessage': 'Data not found.'}]
+            else:
+                status, body = 200, PAGE
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        conn = UltraConnection(host=f'http://127.0.0.1:{server.server_port}')
+        conn.stream_threshold = 0
+        meta = {}
+        assert list(conn.stream('/v3/zones/example.com./rrsets', 'rrSets', meta)) == PAGE['rrSets']
+        assert meta['resultInfo']['totalCount'] == 25
+
+        meta = {}
+        assert list(conn.stream('/v3/zones/missing./rrsets', 'rrSets', meta)) == []
+        assert meta['errorCode'] == 70002
+        assert conn.stats.as_dict()['calls'] == 2
+    finally:
+        server.shutdown()
@@ -0,0 +1,110 @@
+"""Unit tests for the concurrency helpers."""
+
+import os
+
+import pytest
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils import concurrency
+from ansible_collections.ultradns.ultradns.plugins.module_utils.concurrency import (
+    Backoff,
+    file_lock,
+    LockError,
+    PageSizer,
+    TaskPoller,
+    run_parallel,
+)
+
+
+class TaskConnection:
+    """Serves a task listing where each task completes after a number of polls."""
+
+    def __init__(self, rounds, listed=True):
+        self.rounds = rounds
+        self.listed = listed
+        self.calls = []
+
+    def _task(self, task_id):
+        code = 'IN_PROCESS' if self.rounds[task_id] > 0 else 'COMPLETE'
+        self.rounds[task_id] -= 1
+        return {'taskId': task_id, 'code': code}
+
+    def get(self, uri, params=None):
+        self.calls.append(uri)
+        if uri == '/tasks':
+            if not self.listed:
+                return {'tasks': []}
+            return {'tasks': list(self._task(t) for t in self.rounds)}
+        return self._task(uri.rsplit('/', 1)[-1])
+
+
+def test_run_parallel_keeps_order():
+    assert run_parallel(lambda x: x * 2, range(20), max_workers=4) == list(x * 2 for x in range(20))
+
+
+def test_backoff_stops_at_deadline():
+    backoff = Backoff(initial=0.01, maximum=0.01, timeout=0)
+    assert backoff.wait() is False
+
+
+def test_poller_uses_one_listing_per_round():
+    conn = TaskConnection({'t1': 0, 't2': 1})
+    poller = TaskPoller(conn, Backoff(initial=0.01, maximum=0.01, timeout=5))
+    poller.add('a.com.', 't1')
+    poller.add('b.com.', 't2')
+
+    results = poller.run()
+
+    assert results['a.com.']['code'] == 'COMPLETE'
+    assert results['b.com.']['code'] == 'COMPLETE'
+    assert conn.calls == ['/tasks', '/tasks']
+
+
+def test_poller_falls_back_to_single_task():
+    conn = TaskConnection({'t1': 0}, listed=False)
+    poller = TaskPoller(conn, Backoff(initial=0.01, maximum=0.01, timeout=5))
+    poller.add('a.com.', 't1')
+
+    assert poller.run()['a.com.']['code'] == 'COMPLETE'
+    assert conn.calls == ['/tasks', '/tasks/t1']
+
+
+def test_page_sizer_grows_on_fast_full_pages_and_shrinks_on_slow_or_large_ones():
+    sizer = PageSizer(size=100, minimum=10, maximum=400, target=2.0, max_bytes=50000)
+
+    assert sizer.observe(0.1, 100) == 200
+    assert sizer.observe(0.1, 150) == 200
+    assert sizer.observe(5.0, 200) == 100
+    assert sizer.observe(0.1, 100, received=100000) == 50
+
+
+def test_page_sizer_falls_back_to_size_that_worked():
+    sizer = PageSizer(size=100, minimum=10, maximum=1000)
+    assert sizer.reject() is False
+
+    sizer.observe(0.1, 100)
+    assert sizer.reject() is True
+    assert (sizer.size, sizer.maximum) == (100, 100)
+    assert sizer.observe(0.1, 100) == 100
+
+
+def test_file_lock_uses_private_files_and_forgets_released_names(tmp_path, monkeypatch):
+    monkeypatch.setattr(concurrency, 'LOCK_DIR', str(tmp_path / 'locks'))
+    with file_lock('zone|a.com.'):
+        assert 'zone|a.com.' in concurrency._thread_locks
+    assert 'zone|a.com.' not in concurrency._thread_locks
+    if concurrency.HAS_FCNTL:
+        assert os.stat(tmp_path / 'locks').st_mode & 0o777 == 0o700
+        assert all(not os.stat(entry).st_mode & 0o077 for entry in (tmp_path / 'locks').iterdir())
+
+
+def test_file_lock_refuses_a_shared_directory(tmp_path, monkeypatch):
+    if not concurrency.HAS_FCNTL:
+        pytest.skip('lock files need fcntl')
+    shared = tmp_path / 'locks'
+    shared.mkdir()
+    shared.chmod(0o777)
+    monkeypatch.setattr(concurrency, 'LOCK_DIR', str(shared))
+    with pytest.raises(LockError):
+        with file_lock('zone|a.com.'):
+            pass
+    assert 'zone|a.com.' not in concurrency._thread_locks
@@ -0,0 +1,98 @@
+"""Unit tests for the requests UltraConnection puts on the wire."""
+
+import json
+
+import pytest
+
+requests = pytest.importorskip('requests')
+pytest.importorskip('ultra_rest_client')
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils import connection
+from ansible_collections.ultradns.ultradns.plugins.module_utils.connection import UltraConnection
+
+
+class Response:
+    def __init__(self, body, status=200, headers=None):
+        self.content = json.dumps(body).encode('utf-8')
+        self.status_code = status
+        self.headers = {'content-type': 'application/json', 'content-length': str(len(self.content))}
+        self.headers.update(headers or {})
+        self.text = self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, size):
+        for i in range(0, len(self.content), size):
+            yield self.content[i:i + size]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+@pytest.fixture
+def wire(monkeypatch):
+    sent = []
+
+    def request(method, url, **kwargs):
+        sent.append(dict(kwargs, method=method, url=url))
+        return Response({})
+
+    monkeypatch.setattr(requests, 'request', request)
+    return sent
+
+
+@pytest.mark.parametrize('body', [
+    {'ttl': 300, 'rdata': ['192.0.2.1']},
+    [{'method': 'POST', 'uri': '/v1/zones/example.com./rrsets/A/www', 'body': {'rdata': ['192.0.2.1']}}],
+])
+def test_post_sends_json(wire, body):
+    conn = UltraConnection(host='http://api.invalid')
+    conn.post('/v1/zones/example.com./rrsets/A/www', body)
+
+    assert len(wire) == 1
+    assert wire[0]['method'] == 'POST'
+    assert json.loads(wire[0]['data']) == body
+    assert wire[0]['headers']['Content-Type'] == 'application/json'
+
+
+def test_post_without_body(wire):
+    UltraConnection(host='http://api.invalid').post('/v1/zones/example.com./dnssec')
+
+    assert wire[0]['data'] is None
+
+
+def test_pages_are_read_whole_below_the_threshold(monkeypatch):
+    page = {'rrSets': [{'ownerName': f'h{i}.example.com.'} for i in range(3)], 'resultInfo': {'totalCount': 3}}
+    calls = []
+
+    def get(self, url, **kwargs):
+        calls.append(kwargs)
+        return Response(page)
+
+    # older SDK releases do not export AuthError, which leaves HAS_SDK unset
+    monkeypatch.setattr(connection, 'HAS_SDK', True)
+    monkeypatch.setattr(requests.Session, 'get', get)
+    conn = UltraConnection(host='http://api.invalid')
+    conn.access_token = 'token'
+
+    meta = {}
+    assert list(conn.stream('/v3/zones/example.com./rrsets', 'rrSets', meta)) == page['rrSets']
+    assert meta['resultInfo'] == {'totalCount': 3}
+    assert meta['_received'] == len(json.dumps(page))
+    assert calls[0]['stream'] is False
+    assert calls[0]['headers'] == {'Authorization': 'Bearer token'}
+
+    # a threshold above the page size still reads it whole, one below streams it
+    conn.stream_threshold = 10 ** 6
+    assert list(conn.stream('/v3/zones/example.com./rrsets', 'rrSets', {})) == page['rrSets']
+    conn.stream_threshold = 10
+    streamed = conn.stream('/v3/zones/example.com./rrsets', 'rrSets', {})
+    assert list(streamed) == page['rrSets']
+    assert [c['stream'] for c in calls] == [False, True, True]
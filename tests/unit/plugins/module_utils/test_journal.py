@@ -0,0 +1,61 @@
+"""Unit tests for the journal of completed operations."""
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.journal import Journal, operation_key
+
+from .test_plan import ZONES, ZoneConnection, make_module
+
+
+class FlakyConnection(ZoneConnection):
+    """Fails the first create it is asked for, as if the run was interrupted there."""
+
+    failures = 1
+
+    def post(self, uri, body=None):
+        if uri != '/batch' and self.failures:
+            self.failures -= 1
+            self.calls.append(('POST', uri))
+            return {'errorCode': 500, 'errorMessage': 'Service unavailable'}
+        return super().post(uri, body)
+
+
+def test_journal_buffers_and_persists(tmp_path):
+    path = str(tmp_path / 'journal.db')
+    key = operation_key('record', 'api.ultradns.com', 'example.com.', 'www')
+    assert key == operation_key('record', 'api.ultradns.com', 'example.com.', 'www')
+    assert key != operation_key('record', 'api.ultradns.com', 'example.com.', 'api')
+
+    journal = Journal(path, flush_every=2, flush_interval=3600)
+    journal.put(key, {'serial': 11})
+    assert journal.get(key) == {'serial': 11}
+    assert Journal(path).done(key) is False
+
+    journal.put('other')
+    assert Journal(path).get(key) == {'serial': 11}
+    journal.put('third')
+    journal.close()
+    assert Journal(path).done('third') is True
+    assert Journal(path).done('missing') is False
+
+
+def test_apply_resumes_from_journal(tmp_path):
+    plan_path = str(tmp_path / 'change.plan')
+    journal = str(tmp_path / 'journal.db')
+    conn = FlakyConnection(ZONES)
+    make_module(conn).dns_plan(plan_path)
+
+    first = make_module(conn, batch_size=1, journal=journal).dns_apply(plan_path)
+    assert first['failed'] is True
+    assert first['zones']['example.com.']['applied'] == 1
+    assert first['zones']['example.com.']['pending'] == 2
+
+    # the zone moved on by the applied operation only, which the journal accounts for
+    conn.calls = []
+    second = make_module(conn, batch_size=1, journal=journal).dns_apply(plan_path)
+    assert second['failed'] is False
+    assert second['zones']['example.com.'] == {'applied': 2, 'pending': 0, 'failed': False, 'resumed': 1}
+    assert [c[0] for c in conn.calls if c[0] != 'GET'] == ['POST', 'DELETE']
+
+    conn.calls = []
+    third = make_module(conn, batch_size=1, journal=journal).dns_apply(plan_path)
+    assert third['changed'] is False and third['journal'] == 'skipped'
+    assert conn.calls == []
@@ -0,0 +1,38 @@
+"""Unit tests for the slotted API models."""
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.models import RRSet, rrtype_code, Zone
+
+
+RDPOOL = {'@context': 'http://schemas.ultradns.com/RDPool.jsonschema', 'order': 'ROUND_ROBIN', 'description': 'www'}
+
+
+def test_rrtype_code_accepts_api_strings_names_and_codes():
+    assert rrtype_code('A (1)') == 1
+    assert rrtype_code('aaaa') == 28
+    assert rrtype_code('TYPE65') == 65
+    assert rrtype_code(257) == 257
+    assert rrtype_code('BOGUS') is None
+
+
+def test_rrsets_compare_and_hash_by_value():
+    data = {'ownerName': 'WWW.example.com.', 'rrtype': 'A (1)', 'ttl': 300,
+            'rdata': ['192.0.2.1', '192.0.2.2'], 'profile': dict(RDPOOL)}
+    one, two = RRSet.from_api(data), RRSet.from_api(dict(data, profile=dict(RDPOOL)))
+
+    assert one == two and hash(one) == hash(two)
+    assert one.key == ('www.example.com.', 1)
+    assert one.rdata == ('192.0.2.1', '192.0.2.2')
+    assert one.pool.kind == 'RDPool'
+    assert one != RRSet.from_api(dict(data, ttl=60))
+    assert len({one, two, RRSet.from_api(dict(data, rdata=['192.0.2.1']))}) == 2
+    assert RRSet.from_api(one.as_dict()) == one
+
+
+def test_models_have_no_instance_dict():
+    rrset = RRSet('www.example.com', 'A', 300, ['192.0.2.1'])
+    zone = Zone.from_api({'properties': {'name': 'example.com', 'status': 'ACTIVE'}})
+
+    assert not hasattr(rrset, '__dict__') and not hasattr(zone, '__dict__')
+    assert zone.name == 'example.com.'
+    assert RRSet.first({'rrSets': [{'rrtype': 'SOA (6)', 'rdata': ['ns. admin. 2024 1 1 1 1']}]}).serial == 2024
+    assert RRSet.first({'errorCode': 70002}) is None
@@ -0,0 +1,169 @@
+"""Unit tests for planning and applying DNS changesets."""
+
+import copy
+import json
+
+import pytest
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.connection import UltraConnection
+from ansible_collections.ultradns.ultradns.plugins.module_utils.models import RRTYPE_CODES
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+
+class ZoneConnection:
+    """Holds the rrsets of each zone by (owner, type) and applies single and batched writes."""
+
+    host = 'api.ultradns.com'
+
+    def __init__(self, zones):
+        self.zones = copy.deepcopy(zones)
+        self.calls = []
+
+    def _soa(self, zone):
+        return self.zones[zone][(zone, 'SOA')]
+
+    def _bump(self, zone):
+        parts = self._soa(zone)['rdata'][0].split()
+        parts[2] = str(int(parts[2]) + 1)
+        self._soa(zone)['rdata'] = [' '.join(parts)]
+
+    def get(self, uri, params=None):
+        self.calls.append(('GET', uri))
+        path = uri.split('?')[0].split('/')
+        zone = path[3] if path[1] == 'v3' else path[2]
+        if uri.startswith('/v3/'):
+            rrsets = list(dict(r, ownerName=o, rrtype=f'{t} ({RRTYPE_CODES[t]})') for (o, t), r in sorted(self.zones[zone].items()))
+            return {'rrSets': rrsets, 'resultInfo': {'totalCount': len(rrsets), 'returnedCount': len(rrsets)}}
+        return {'rrSets': [dict(self._soa(zone), ownerName=zone, rrtype='SOA (6)')]}
+
+    def _write(self, method, uri, body):
+        _, _, zone, _, rrtype, owner = uri.split('/')
+        if method == 'DELETE':
+            del self.zones[zone][(owner, rrtype)]
+        else:
+            self.zones[zone][(owner, rrtype)] = dict(body)
+        self._bump(zone)
+
+    def post(self, uri, body=None):
+        self.calls.append(('POST', uri))
+        if uri == '/batch':
+            for request in body:
+                self._write(request['method'], request['uri'], request.get('body'))
+            return list({'code': 200} for _ in body)
+        self._write('POST', uri, body)
+        return {}
+
+    def put(self, uri, body):
+        self.calls.append(('PUT', uri))
+        self._write('PUT', uri, body)
+        return {}
+
+    def delete(self, uri):
+        self.calls.append(('DELETE', uri))
+        self._write('DELETE', uri, None)
+        return {}
+
+
+def soa(serial):
+    return {'ttl': 86400, 'rdata': [f'ns1.example.net. admin.example.com. {serial} 3600 600 604800 300']}
+
+
+ZONES = {
+    'example.com.': {
+        ('example.com.', 'SOA'): soa(10),
+        ('www.example.com.', 'A'): {'ttl': 300, 'rdata': ['192.0.2.1']},
+        ('old.example.com.', 'TXT'): {'ttl': 300, 'rdata': ['retire me']},
+        ('mail.example.com.', 'CNAME'): {'ttl': 300, 'rdata': ['mx.example.net.']},
+    },
+}
+
+RECORDS = [
+    {'zone': 'example.com.', 'name': 'www', 'type': 'A', 'rdata': ['192.0.2.2', '192.0.2.1'], 'ttl': None, 'state': 'present'},
+    {'zone': 'example.com.', 'name': 'api', 'type': 'A', 'rdata': ['192.0.2.9'], 'ttl': 60, 'state': 'present'},
+    {'zone': 'example.com.', 'name': 'old', 'type': 'TXT', 'rdata': None, 'ttl': None, 'state': 'absent'},
+    {'zone': 'example.com.', 'name': 'mail', 'type': 'CNAME', 'rdata': ['mx.example.net.'], 'ttl': None, 'state': 'present'},
+]
+
+
+def make_module(conn, **params):
+    spec = {
+        'records': RECORDS,
+        'max_workers': 2,
+        'batch_size': 10,
+        'wait_timeout': 5,
+        'provider': {'username': 'user', 'password': 'pass', 'use_test': False},
+    }
+    spec.update(params)
+    api = UltraDNSModule(spec)
+    api.connection = conn
+    return api
+
+
+def test_plan_then_apply_in_one_batch(tmp_path):
+    plan_path = str(tmp_path / 'change.plan.gz')
+    conn = ZoneConnection(ZONES)
+
+    planned = make_module(conn).dns_plan(plan_path)
+    assert planned['changed'] is True
+    assert planned['operations'] == 3
+    assert planned['plan']['example.com.']['changes'] == {'update': {'A': 1}, 'create': {'A': 1}, 'delete': {'TXT': 1}}
+    assert make_module(conn).dns_plan(plan_path)['changed'] is False
+
+    conn.calls = []
+    result = make_module(conn).dns_apply(plan_path)
+    assert result['changed'] is True and result['failed'] is False
+    assert [c for c in conn.calls if c[0] != 'GET'] == [('POST', '/batch')]
+    zone = conn.zones['example.com.']
+    assert zone[('www.example.com.', 'A')]['profile']['order'] == 'ROUND_ROBIN'
+    assert zone[('api.example.com.', 'A')] == {'rdata': ['192.0.2.9'], 'ttl': 60}
+    assert ('old.example.com.', 'TXT') not in zone
+
+
+def test_apply_refuses_drifted_zone(tmp_path):
+    plan_path = str(tmp_path / 'change.plan')
+    conn = ZoneConnection(ZONES)
+    make_module(conn).dns_plan(plan_path)
+    conn._bump('example.com.')
+
+    result = make_module(conn).dns_apply(plan_path)
+    assert result['failed'] is True
+    assert result['drifted'] == {'example.com.': {'planned_serial': 10, 'serial': 11}}
+    assert not any(c[0] != 'GET' for c in conn.calls[-1:])
+    assert ('old.example.com.', 'TXT') in conn.zones['example.com.']
+
+
+def test_batch_body_on_the_wire(monkeypatch):
+    requests = pytest.importorskip('requests')
+    pytest.importorskip('ultra_rest_client')
+    sent = []
+
+    class Response:
+        status_code = 200
+        headers = {'content-type': 'application/json'}
+
+        def __init__(self, body):
+            self.body = body
+
+        def json(self):
+            return self.body
+
+    def request(method, url, **kwargs):
+        sent.append((method, url.split('/', 3)[3], kwargs['data'], kwargs['headers'].get('Content-Type')))
+        return Response([{'code': 200}, {'code': 200}] if url.endswith('/batch') else {})
+
+    monkeypatch.setattr(requests, 'request', request)
+    api = make_module(UltraConnection(host='http://api.invalid'), batch_size=2)
+    operations = [
+        ['POST', '/zones/example.com./rrsets/A/api.example.com.', {'ttl': 60, 'rdata': ['192.0.2.9']}],
+        ['DELETE', '/zones/example.com./rrsets/TXT/old.example.com.', None],
+        ['PUT', '/zones/example.com./rrsets/A/www.example.com.', {'ttl': 300, 'rdata': ['192.0.2.1']}],
+    ]
+
+    assert api._apply_operations(operations) == (3, None)
+    assert [(m, u, t) for m, u, _, t in sent] == [
+        ('POST', 'batch', 'application/json'),
+        ('PUT', 'zones/example.com./rrsets/A/www.example.com.', 'application/json')]
+    assert json.loads(sent[0][2]) == [
+        {'method': 'POST', 'uri': '/zones/example.com./rrsets/A/api.example.com.', 'body': {'ttl': 60, 'rdata': ['192.0.2.9']}},
+        {'method': 'DELETE', 'uri': '/zones/example.com./rrsets/TXT/old.example.com.'}]
+    assert json.loads(sent[1][2]) == {'ttl': 300, 'rdata': ['192.0.2.1']}
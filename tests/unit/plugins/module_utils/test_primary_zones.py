@@ -0,0 +1,118 @@
+"""Unit tests for primary zone creation modes and bulk zone management."""
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+
+class FakeConnection:
+    """Connection where every zone is missing and writes return background tasks."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, uri, params=None):
+        self.calls.append(('GET', uri, None))
+        if uri == '/tasks':
+            return {'tasks': [{'taskId': 'task-1', 'code': 'COMPLETE'}]}
+        return {'errorCode': 1801, 'errorMessage': 'Zone does not exist in the system.'}
+
+    def post(self, uri, body=None):
+        self.calls.append(('POST', uri, body))
+        return {'task_id': 'task-1'}
+
+    def post_multi_part(self, uri, files):
+        self.calls.append(('UPLOAD', uri, files['file'][1].read()))
+        return {'task_id': 'task-1'}
+
+    def delete(self, uri):
+        self.calls.append(('DELETE', uri, None))
+        return {}
+
+
+def make_module(conn, **params):
+    spec = {
+        'name': 'example.com.',
+        'account': 'acct',
+        'state': 'present',
+        'zones': None,
+        'create_type': 'NEW',
+        'zone_file': None,
+        'transfer': None,
+        'max_workers': 4,
+        'wait_timeout': 5,
+        'provider': {'username': 'user', 'password': 'pass', 'use_test': False},
+    }
+    spec.update(params)
+    api = UltraDNSModule(spec)
+    api.connection = conn
+    return api
+
+
+def test_upload_sends_zone_file(tmp_path):
+    zone_file = tmp_path / 'example.com.zone'
+    zone_file.write_bytes(b'www 300 IN A 192.0.2.1\n')
+    conn = FakeConnection()
+
+    result = make_module(conn, create_type='UPLOAD', zone_file=str(zone_file)).primary_zone()
+
+    assert result['changed'] is True
+    assert result['status'] == 'COMPLETE'
+    assert ('UPLOAD', '/zones', b'www 300 IN A 192.0.2.1\n') in conn.calls
+
+
+def test_transfer_sets_nameserver():
+    conn = FakeConnection()
+    make_module(conn, create_type='TRANSFER', transfer={'ip': '192.0.2.53'}).primary_zone()
+
+    body = next(call[2] for call in conn.calls if call[0] == 'POST')
+    assert body['primaryCreateInfo'] == {'forceImport': 'True', 'createType': 'TRANSFER', 'nameServer': {'ip': '192.0.2.53'}}
+
+
+def test_bulk_mixes_creates_and_deletes():
+    conn = FakeConnection()
+    zones = [{'name': 'a.com.'}, {'name': 'b.com.', 'state': 'absent'}]
+    result = make_module(conn, name=None, zones=zones).primary_zones()
+
+    assert result['failed'] is False
+    assert result['zones']['a.com.']['status'] == 'COMPLETE'
+    assert ('DELETE', '/zones/b.com.', None) in conn.calls
+
+
+def test_bulk_entries_default_to_present():
+    conn = FakeConnection()
+    result = make_module(conn, name=None, state=None, zones=[{'name': 'a.com.'}]).primary_zones()
+
+    assert result['failed'] is False
+    assert any(call[:2] == ('POST', '/zones') for call in conn.calls)
+
+
+def test_single_zone_still_requires_a_state():
+    result = make_module(FakeConnection(), state=None).primary_zone()
+
+    assert result['failed'] is True
+    assert 'state' in result['msg']
+
+
+def test_bulk_rejects_duplicate_zones():
+    conn = FakeConnection()
+    zones = [{'name': 'a.com.'}, {'name': 'A.com', 'state': 'absent'}]
+    result = make_module(conn, name=None, zones=zones).primary_zones()
+
+    assert result['failed'] is True
+    assert 'a.com.' in result['msg']
+    assert conn.calls == []
+
+
+def test_upload_through_the_proxy_is_rejected(tmp_path):
+    zone_file = tmp_path / 'example.com.zone'
+    zone_file.write_bytes(b'www 300 IN A 192.0.2.1\n')
+    conn = FakeConnection()
+    provider = {'username': None, 'password': None, 'use_test': False, 'proxy_socket': str(tmp_path / 'proxy.sock')}
+
+    result = make_module(conn, create_type='UPLOAD', zone_file=str(zone_file), provider=provider).primary_zone()
+    assert result['failed'] is True
+    assert 'proxy_socket' in result['msg']
+
+    result = make_module(conn, name=None, zones=[{'name': 'a.com.'}], create_type='UPLOAD', zone_file=str(zone_file),
+                         provider=provider).primary_zones()
+    assert result['failed'] is True
+    assert conn.calls == []
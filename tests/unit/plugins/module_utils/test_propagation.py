@@ -0,0 +1,97 @@
+"""Unit tests for the record propagation check against a local stub nameserver."""
+
+import socket
+import struct
+import threading
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils import dns
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+
+class StubNameserver(threading.Thread):
+    """Answers A queries for one name, switching to new addresses after a few queries."""
+
+    def __init__(self, name, before, after, switch_after=2):
+        super().__init__(daemon=True)
+        self.name = dns.fqdn(name)
+        self.before, self.after = before, after
+        self.switch_after = switch_after
+        self.queries = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.port = self.sock.getsockname()[1]
+
+    def run(self):
+        while True:
+            try:
+                message, peer = self.sock.recvfrom(512)
+            except OSError:
+                return
+            self.queries += 1
+            addresses = self.before if self.queries <= self.switch_after else self.after
+            query_id = struct.unpack('!H', message[:2])[0]
+            question = message[12:]
+            answers = b''.join(
+                b'\xc0\x0c' + struct.pack('!HHIH', 1, 1, 300, 4) + socket.inet_aton(address)
+                for address in addresses
+            )
+            header = struct.pack('!HHHHHH', query_id, 0x8400, 1, len(addresses), 0, 0)
+            self.sock.sendto(header + question + answers, peer)
+
+    def stop(self):
+        self.sock.close()
+
+
+class ApiConnection:
+    def __init__(self, rdata):
+        self.rdata = rdata
+
+    def get(self, uri, params=None):
+        return {'rrSets': [{'ttl': 300, 'rdata': self.rdata}]}
+
+
+def make_module(conn, port, timeout):
+    api = UltraDNSModule({
+        'zone': 'example.com.',
+        'name': 'www',
+        'type': 'A',
+        'propagation_timeout': timeout,
+        'propagation_nameservers': [f'127.0.0.1:{port}'],
+        'provider': {'username': 'user', 'password': 'pass', 'use_test': False},
+    })
+    api.connection = conn
+    return api
+
+
+def test_parse_response_reads_compressed_answers():
+    query_id, message = dns.build_query('www.example.com', 'MX')
+    answer = b'\xc0\x0c' + struct.pack('!HHIH', 15, 1, 60, 4) + struct.pack('!H', 10) + b'\xc0\x0c'
+    response = struct.pack('!HHHHHH', query_id, 0x8400, 1, 1, 0, 0) + message[12:] + answer
+
+    assert dns.parse_response(response, query_id) == (0, False, [('www.example.com.', 'MX', '10 www.example.com.')])
+
+
+def test_waits_until_nameserver_serves_new_rrset():
+    server = StubNameserver('www.example.com', ['192.0.2.1'], ['192.0.2.2', '192.0.2.3'])
+    server.start()
+    try:
+        result = make_module(ApiConnection(['192.0.2.3', '192.0.2.2']), server.port, 30).wait_for_propagation()
+    finally:
+        server.stop()
+
+    status = result['propagation'][f'127.0.0.1:{server.port}']
+    assert result['failed'] is False
+    assert status['converged'] is True
+    assert status['attempts'] == 3
+
+
+def test_fails_when_nameserver_never_converges():
+    server = StubNameserver('www.example.com', ['192.0.2.1'], ['192.0.2.1'])
+    server.start()
+    try:
+        result = make_module(ApiConnection(['192.0.2.9']), server.port, 1).wait_for_propagation()
+    finally:
+        server.stop()
+
+    assert result['failed'] is True
+    assert result['propagation'][f'127.0.0.1:{server.port}']['converged'] is False
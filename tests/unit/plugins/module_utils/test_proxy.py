@@ -0,0 +1,112 @@
+"""Unit tests for the local proxy daemon and its client connection."""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import pytest
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.connection import ApiStats
+from ansible_collections.ultradns.ultradns.plugins.module_utils.proxy import ProxyConnection, ProxyServer
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+
+class SlowUpstream:
+    """An API connection whose GETs take a while, so concurrent reads overlap."""
+
+    host = 'api.ultradns.com'
+
+    def __init__(self):
+        self.stats = ApiStats()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, uri, params=None):
+        with self.lock:
+            self.calls.append(('GET', uri))
+        time.sleep(0.2)
+        return {'rrSets': [{'ownerName': 'www.example.com.', 'rrtype': 'A (1)', 'ttl': 300, 'rdata': ['192.0.2.1']}]}
+
+    def put(self, uri, body):
+        self.calls.append(('PUT', uri))
+        return {}
+
+
+@pytest.fixture
+def proxy():
+    # Unix socket paths are limited to about 100 characters, too short for pytest's tmp_path
+    directory = tempfile.mkdtemp(prefix='udns-proxy-')
+    upstream = SlowUpstream()
+    server = ProxyServer(os.path.join(directory, 'proxy.sock'), upstream, rate=100)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server, upstream
+    server.shutdown()
+    server.server_close()
+    shutil.rmtree(directory)
+
+
+def test_concurrent_reads_are_merged_and_cached(proxy):
+    server, upstream = proxy
+    uri = '/zones/example.com./rrsets/A/www.example.com.'
+    results = []
+
+    def read():
+        results.append(ProxyConnection(server.path).get(uri))
+
+    threads = list(threading.Thread(target=read) for _ in range(5))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 5 and all(r == results[0] for r in results)
+    assert upstream.calls == [('GET', uri)]
+
+    client = ProxyConnection(server.path)
+    client.get(uri)
+    assert len(upstream.calls) == 1
+    assert client.stats.as_dict()['cached'] == 1 and client.stats.as_dict()['calls'] == 0
+
+
+def test_write_invalidates_the_zone(proxy):
+    server, upstream = proxy
+    client = ProxyConnection(server.path)
+    client.get('/zones/example.com./rrsets/A/www.example.com.')
+    client.get('/zones/example.net./rrsets/A/www.example.net.')
+
+    client.put('/zones/example.com./rrsets/A/www.example.com.', {'rdata': ['192.0.2.2']})
+    client.get('/zones/example.com./rrsets/A/www.example.com.')
+    client.get('/zones/example.net./rrsets/A/www.example.net.')
+    assert [c[1].split('/')[2] for c in upstream.calls] == ['example.com.', 'example.net.', 'example.com.', 'example.com.']
+
+
+def test_module_connects_through_the_proxy(proxy):
+    server, upstream = proxy
+    api = UltraDNSModule({'provider': {'username': None, 'password': None, 'use_test': False, 'proxy_socket': server.path}})
+    assert api.connect() is True
+    assert api.connection.host == 'api.ultradns.com'
+
+    other = UltraDNSModule({'provider': {'username': None, 'password': None, 'use_test': True, 'proxy_socket': server.path}})
+    assert other.connect() is False
+    assert 'not test-api.ultradns.com' in other.msg
+
+
+def test_socket_is_never_open_to_other_users():
+    modes = []
+
+    class Recording(ProxyServer):
+        def server_bind(self):
+            super().server_bind()
+            modes.append(os.stat(self.server_address).st_mode & 0o777)
+
+    directory = tempfile.mkdtemp(prefix='udns-proxy-')
+    umask = os.umask(0o022)
+    try:
+        server = Recording(os.path.join(directory, 'proxy.sock'), SlowUpstream())
+        server.server_close()
+    finally:
+        os.umask(umask)
+        shutil.rmtree(directory)
+    assert modes and not modes[0] & 0o077
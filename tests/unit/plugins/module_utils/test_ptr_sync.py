@@ -0,0 +1,74 @@
+"""Unit tests for syncing PTR records from forward zones."""
+
+from ipaddress import ip_address
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ptr import reverse_names
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+from .test_plan import ZoneConnection, soa
+
+
+def test_reverse_names_match_ipaddress():
+    addresses = ['192.0.2.1', '10.20.30.255', '2001:db8::1', '::ffff:192.0.2.1', 'not-an-address']
+    expected = list(f'{ip_address(a).reverse_pointer}.' for a in addresses[:-1]) + [None]
+    assert reverse_names(addresses) == expected
+
+
+ZONES = {
+    'example.com.': {
+        ('example.com.', 'SOA'): soa(1),
+        ('www.example.com.', 'A'): {'ttl': 300, 'rdata': ['192.0.2.10', '192.0.2.11']},
+        ('api.example.com.', 'A'): {'ttl': 60, 'rdata': ['192.0.2.10']},
+        ('v6.example.com.', 'AAAA'): {'ttl': 300, 'rdata': ['2001:db8::1']},
+        ('far.example.com.', 'A'): {'ttl': 300, 'rdata': ['198.51.100.1']},
+    },
+    '2.0.192.in-addr.arpa.': {
+        ('2.0.192.in-addr.arpa.', 'SOA'): soa(1),
+        ('11.2.0.192.in-addr.arpa.', 'PTR'): {'ttl': 300, 'rdata': ['old.example.com.']},
+        ('12.2.0.192.in-addr.arpa.', 'PTR'): {'ttl': 300, 'rdata': ['gone.example.com.']},
+        ('13.2.0.192.in-addr.arpa.', 'PTR'): {'ttl': 300, 'rdata': ['printer.example.org.']},
+    },
+    '8.b.d.0.1.0.0.2.ip6.arpa.': {
+        ('8.b.d.0.1.0.0.2.ip6.arpa.', 'SOA'): soa(1),
+    },
+}
+
+
+def make_module(conn, **params):
+    spec = {'zones': ['example.com.'], 'reverse_zones': ['2.0.192.in-addr.arpa.', '8.b.d.0.1.0.0.2.ip6.arpa.'],
+            'ttl': None, 'prune': False, 'batch_size': 10, 'max_workers': 2,
+            'provider': {'username': 'user', 'password': 'pass', 'use_test': False}}
+    spec.update(params)
+    api = UltraDNSModule(spec)
+    api.connection = conn
+    return api
+
+
+def test_sync_creates_and_updates_ptrs():
+    conn = ZoneConnection(ZONES)
+    result = make_module(conn).ptr_sync()
+
+    assert result['failed'] is False and result['changed'] is True
+    assert result['unmanaged'] == ['198.51.100.1']
+    reverse = conn.zones['2.0.192.in-addr.arpa.']
+    assert sorted(reverse[('10.2.0.192.in-addr.arpa.', 'PTR')]['rdata']) == ['api.example.com.', 'www.example.com.']
+    assert reverse[('10.2.0.192.in-addr.arpa.', 'PTR')]['ttl'] == 60
+    assert reverse[('11.2.0.192.in-addr.arpa.', 'PTR')]['rdata'] == ['www.example.com.']
+    # without prune, stale and foreign PTRs stay
+    assert ('12.2.0.192.in-addr.arpa.', 'PTR') in reverse
+    v6 = conn.zones['8.b.d.0.1.0.0.2.ip6.arpa.']
+    assert v6[(f"{ip_address('2001:db8::1').reverse_pointer}.", 'PTR')]['rdata'] == ['v6.example.com.']
+
+    assert make_module(conn).ptr_sync()['changed'] is False
+
+
+def test_prune_keeps_foreign_targets():
+    conn = ZoneConnection(ZONES)
+    result = make_module(conn, prune=True, ttl=3600).ptr_sync(check_mode=True)
+    assert result['zones']['2.0.192.in-addr.arpa.']['changes'] == {'create': {'PTR': 1}, 'update': {'PTR': 1}, 'delete': {'PTR': 1}}
+    assert not any(c[0] != 'GET' for c in conn.calls)
+
+    make_module(conn, prune=True).ptr_sync()
+    reverse = conn.zones['2.0.192.in-addr.arpa.']
+    assert ('12.2.0.192.in-addr.arpa.', 'PTR') not in reverse
+    assert reverse[('13.2.0.192.in-addr.arpa.', 'PTR')]['rdata'] == ['printer.example.org.']
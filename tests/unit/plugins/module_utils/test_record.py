@@ -0,0 +1,254 @@
+"""Unit tests for record updates."""
+
+import copy
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+
+RDPOOL = {'@context': 'http://schemas.ultradns.com/RDPool.jsonschema', 'order': 'ROUND_ROBIN'}
+
+
+class FakeConnection:
+    """Connection holding a single rrset that records every write."""
+
+    def __init__(self, rrset=None, reject_patch=False):
+        self.rrset = copy.deepcopy(rrset)
+        self.reject_patch = reject_patch
+        self.calls = []
+
+    def get(self, uri, params=None):
+        self.calls.append(('GET', uri, None))
+        if self.rrset is None:
+            return {'errorCode': 70002, 'errorMessage': 'Data not found.'}
+        return {'rrSets': [copy.deepcopy(self.rrset)]}
+
+    def post(self, uri, body=None):
+        self.calls.append(('POST', uri, body))
+        self.rrset = dict(body)
+        return {}
+
+    def put(self, uri, body):
+        self.calls.append(('PUT', uri, body))
+        self.rrset = dict(body)
+        return {}
+
+    def patch(self, uri, body):
+        self.calls.append(('PATCH', uri, body))
+        self.rrset.update(body)
+        return {}
+
+    def json_patch(self, uri, operations):
+        self.calls.append(('JSON_PATCH', uri, operations))
+        if self.reject_patch:
+            return {'errorCode': 400, 'errorMessage': 'Unsupported patch'}
+        # a patch applies as a whole or not at all
+        rrset = copy.deepcopy(self.rrset)
+        for op in operations:
+            field, _, index = op['path'][1:].partition('/')
+            if op['op'] == 'test':
+                if (rrset.get(field) if not index else rrset[field][int(index)]) != op['value']:
+                    return {'errorCode': 2111, 'errorMessage': 'Test operation failed'}
+            elif op['op'] == 'add' and index == '-':
+                rrset[field].append(op['value'])
+            elif op['op'] == 'remove':
+                if index:
+                    del rrset[field][int(index)]
+                else:
+                    del rrset[field]
+            else:
+                rrset[field] = op['value']
+        self.rrset = rrset
+        return {}
+
+    def delete(self, uri):
+        self.calls.append(('DELETE', uri, None))
+        self.rrset = None
+        return {}
+
+
+def make_module(conn, **params):
+    spec = {
+        'zone': 'example.com.',
+        'name': 'www',
+        'type': 'TXT',
+        'ttl': None,
+        'data': None,
+        'solo': False,
+        'state': 'present',
+        'provider': {'username': 'user', 'password': 'pass', 'use_test': False},
+    }
+    spec.update(params)
+    api = UltraDNSModule(spec)
+    api.connection = conn
+    return api
+
+
+def writes(conn):
+    return list(call for call in conn.calls if call[0] != 'GET')
+
+
+def test_append_sends_only_new_value():
+    conn = FakeConnection({'ttl': 300, 'rdata': ['one', 'two']})
+    result = make_module(conn, data='three').record()
+
+    assert result['changed'] is True
+    assert writes(conn) == [('JSON_PATCH', '/zones/example.com./rrsets/TXT/www',
+                             [{'op': 'add', 'path': '/rdata/-', 'value': 'three'}])]
+    assert conn.rrset['rdata'] == ['one', 'two', 'three']
+
+
+def test_remove_tests_and_removes_index():
+    conn = FakeConnection({'ttl': 300, 'rdata': ['one', 'two', 'three']})
+    make_module(conn, data='two', state='absent').record()
+
+    assert writes(conn)[0][2] == [{'op': 'test', 'path': '/rdata/1', 'value': 'two'},
+                                  {'op': 'remove', 'path': '/rdata/1'}]
+    assert conn.rrset['rdata'] == ['one', 'three']
+
+
+def test_single_a_record_growing_into_pool_is_guarded():
+    conn = FakeConnection({'ttl': 300, 'rdata': ['192.0.2.1']})
+    make_module(conn, type='A', data='192.0.2.2').record()
+
+    assert writes(conn) == [('JSON_PATCH', '/zones/example.com./rrsets/A/www', [
+        {'op': 'test', 'path': '/rdata', 'value': ['192.0.2.1']},
+        {'op': 'replace', 'path': '/rdata', 'value': ['192.0.2.1', '192.0.2.2']},
+        {'op': 'replace', 'path': '/ttl', 'value': 300},
+        {'op': 'add', 'path': '/profile', 'value': RDPOOL}])]
+    assert conn.rrset['profile'] == RDPOOL
+
+
+def test_rejected_patch_falls_back_to_put_after_reread():
+    conn = FakeConnection({'ttl': 300, 'rdata': ['one']}, reject_patch=True)
+    make_module(conn, data='two').record()
+
+    assert [call[0] for call in conn.calls] == ['GET', 'JSON_PATCH', 'GET', 'JSON_PATCH', 'GET', 'PUT']
+    assert conn.rrset['rdata'] == ['one', 'two']
+
+
+class RacingConnection(FakeConnection):
+    """Another writer sneaks a value in just before the first write lands."""
+
+    def json_patch(self, uri, operations):
+        if not any(call[0] == 'JSON_PATCH' for call in self.calls):
+            self.rrset['rdata'].append('192.0.2.9')
+        return super().json_patch(uri, operations)
+
+
+def test_conflicting_write_is_retried_from_fresh_read():
+    conn = RacingConnection({'ttl': 300, 'rdata': ['192.0.2.1']})
+    result = make_module(conn, type='A', data='192.0.2.2').record()
+
+    assert result['failed'] is False
+    assert conn.rrset['rdata'] == ['192.0.2.1', '192.0.2.9', '192.0.2.2']
+
+
+def test_failed_write_without_conflict_is_not_retried():
+    conn = FakeConnection({'ttl': 300, 'rdata': ['192.0.2.1']}, reject_patch=True)
+    conn.put = lambda uri, body: {'errorCode': 400, 'errorMessage': 'Invalid rdata'}
+    result = make_module(conn, type='A', data='192.0.2.2').record()
+
+    assert result['failed'] is True
+    assert result['msg'] == 'Invalid rdata'
+    assert [call[0] for call in conn.calls] == ['GET', 'JSON_PATCH', 'GET', 'GET']
+
+
+def test_overwrite_of_a_concurrent_change_is_refused():
+    # the rrset changes between the read and a PUT fallback, which must not go through
+    conn = FakeConnection({'ttl': 300, 'rdata': ['192.0.2.1', '192.0.2.2'], 'profile': RDPOOL}, reject_patch=True)
+    api = make_module(conn, type='A', rdata=['192.0.2.3'], rdata_mode='replace')
+    read = copy.deepcopy(conn.rrset)
+    conn.rrset['rdata'].append('192.0.2.9')
+    result = api._put_rrset('/zones/example.com./rrsets/A/www', read, {'ttl': 300, 'rdata': ['192.0.2.3']})
+
+    assert result['failed'] is True
+    assert not any(call[0] == 'PUT' for call in conn.calls)
+    assert conn.rrset['rdata'] == ['192.0.2.1', '192.0.2.2', '192.0.2.9']
+
+
+def test_owner_spellings_share_one_lock(monkeypatch):
+    from ansible_collections.ultradns.ultradns.plugins.module_utils import ultraapi
+    keys = []
+
+    class Lock:
+        def __init__(self, key):
+            keys.append(key)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+    monkeypatch.setattr(ultraapi, 'file_lock', Lock)
+    for name in ('www', 'www.example.com.', 'WWW'):
+        make_module(FakeConnection({'ttl': 300, 'rdata': ['one']}), name=name, data='one').record()
+    make_module(FakeConnection({'ttl': 300, 'rdata': ['one']}), name='@', zone='Example.com', data='one').record()
+
+    assert len(set(keys[:3])) == 1
+    assert keys[3].endswith('|example.com.|TXT|example.com.')
+
+
+def test_rdata_list_appends_missing_values_in_one_patch():
+    conn = FakeConnection({'ttl': 300, 'rdata': ['ns1.example.net.']})
+    make_module(conn, type='NS', rdata=['ns1.example.net.', 'ns2.example.net.', 'ns3.example.net.']).record()
+
+    assert [call[0] for call in writes(conn)] == ['JSON_PATCH']
+    assert conn.rrset['rdata'] == ['ns1.example.net.', 'ns2.example.net.', 'ns3.example.net.']
+
+
+def test_rdata_replace_ignores_order_but_exact_does_not():
+    current = {'ttl': 300, 'rdata': ['192.0.2.1', '192.0.2.2'], 'profile': RDPOOL}
+
+    conn = FakeConnection(current)
+    result = make_module(conn, type='A', rdata=['192.0.2.2', '192.0.2.1'], rdata_mode='replace').record()
+    assert result['changed'] is False
+
+    conn = FakeConnection(current)
+    result = make_module(conn, type='A', rdata=['192.0.2.2', '192.0.2.1'], rdata_mode='exact').record()
+    assert result['changed'] is True
+    assert writes(conn) == [('JSON_PATCH', '/zones/example.com./rrsets/A/www', [
+        {'op': 'test', 'path': '/rdata', 'value': ['192.0.2.1', '192.0.2.2']},
+        {'op': 'test', 'path': '/profile', 'value': RDPOOL},
+        {'op': 'replace', 'path': '/rdata', 'value': ['192.0.2.2', '192.0.2.1']},
+        {'op': 'replace', 'path': '/ttl', 'value': 300},
+        {'op': 'add', 'path': '/profile', 'value': RDPOOL}])]
+
+
+def test_new_rrset_with_several_addresses_is_created_as_rdpool():
+    conn = FakeConnection()
+    make_module(conn, type='A', rdata=['192.0.2.1', '192.0.2.2']).record()
+
+    assert conn.rrset == {'rdata': ['192.0.2.1', '192.0.2.2'], 'profile': RDPOOL}
+
+
+def test_invalid_value_is_rejected_before_any_call():
+    conn = FakeConnection({'ttl': 300, 'rdata': ['192.0.2.1']})
+    result = make_module(conn, type='A', data='192.0.2.300').record()
+
+    assert result['failed'] is True
+    assert conn.calls == []
+
+
+def test_value_failing_validation_can_still_be_removed():
+    conn = FakeConnection({'ttl': 300, 'rdata': ['10 mail.example.com.', '10 bad_host!']})
+    result = make_module(conn, type='MX', data='10 bad_host!', state='absent').record()
+
+    assert result['failed'] is False
+    assert conn.rrset['rdata'] == ['10 mail.example.com.']
+
+
+def test_untrusted_lock_directory_fails_the_task(tmp_path, monkeypatch):
+    from ansible_collections.ultradns.ultradns.plugins.module_utils import concurrency
+    if not concurrency.HAS_FCNTL:
+        return
+    shared = tmp_path / 'locks'
+    shared.mkdir()
+    shared.chmod(0o777)
+    monkeypatch.setattr(concurrency, 'LOCK_DIR', str(shared))
+    conn = FakeConnection({'ttl': 300, 'rdata': ['192.0.2.1']})
+    result = make_module(conn, type='A', data='192.0.2.2').record()
+
+    assert result['failed'] is True
+    assert str(shared) in result['msg']
+    assert not any(call[0] != 'GET' for call in conn.calls)
@@ -0,0 +1,135 @@
+"""Unit tests for the streaming readers and cross-zone record search."""
+
+import pytest
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSError, UltraDNSModule
+
+
+class PagedConnection:
+    """Serves a paged zone listing and paged rrsets per zone, counting every request."""
+
+    def __init__(self, zones, page_size=2):
+        self.zones = zones
+        self.page_size = page_size
+        self.calls = []
+
+    def get(self, uri, params=None):
+        self.calls.append(uri)
+        path, _, query = uri.partition('?')
+        args = dict(part.split('=', 1) for part in query.split('&') if part)
+        if path == '/v3/zones':
+            names = sorted(self.zones)
+            start = int(args.get('cursor', 0))
+            page = names[start:start + self.page_size]
+            result = {'zones': list({'properties': {'name': name}} for name in page)}
+            if start + self.page_size < len(names):
+                result['cursorInfo'] = {'next': str(start + self.page_size)}
+            return result
+
+        zone = path.split('/')[3]
+        value = args.get('q', '').partition('value:')[2]
+        rrsets = list(r for r in self.zones[zone] if any(value in v for v in r['rdata']))
+        if not rrsets:
+            return {'errorCode': 70002, 'errorMessage': 'Data not found.'}
+        offset = int(args['offset'])
+        page = rrsets[offset:offset + self.page_size]
+        return {'rrSets': page, 'resultInfo': {'totalCount': len(rrsets), 'returnedCount': len(page)}}
+
+
+class SlowConnection(PagedConnection):
+    """Times out on pages larger than max_page, after sending part of them when streaming."""
+
+    def __init__(self, zones, max_page):
+        super().__init__(zones, page_size=None)
+        self.max_page = max_page
+
+    def get(self, uri, params=None):
+        limit = int(uri.split('limit=')[1].split('&')[0])
+        if limit > self.max_page:
+            self.calls.append(uri)
+            raise TimeoutError(uri)
+        self.page_size = limit
+        return super().get(uri, params)
+
+
+def rrset(owner, rrtype, *rdata):
+    return {'ownerName': owner, 'rrtype': rrtype, 'ttl': 300, 'rdata': list(rdata)}
+
+
+ZONES = {
+    'a.com.': [rrset('www.a.com.', 'A (1)', '192.0.2.15'), rrset('a.com.', 'MX (15)', '10 mx.a.com.')],
+    'b.com.': [rrset('api.b.com.', 'A (1)', '192.0.2.15', '192.0.2.16'), rrset('b.com.', 'TXT (16)', 'v=spf1 ip4:192.0.2.15 -all')],
+    'c.com.': [rrset('c.com.', 'NS (2)', 'ns1.c.com.')],
+}
+
+
+def make_module(conn, **params):
+    spec = {
+        'value': '192.0.2.15',
+        'types': None,
+        'owner': None,
+        'zones': None,
+        'account': None,
+        'max_results': None,
+        'max_workers': 2,
+        'fail_on_error': False,
+        'provider': {'username': 'user', 'password': 'pass', 'use_test': False},
+    }
+    spec.update(params)
+    api = UltraDNSModule(spec)
+    api.connection = conn
+    return api
+
+
+def test_iter_records_fetches_pages_lazily():
+    conn = PagedConnection({'a.com.': list(rrset(f'h{i}.a.com.', 'A (1)', '192.0.2.1') for i in range(5))})
+    records = make_module(conn).iter_records('a.com.')
+
+    assert next(records)['ownerName'] == 'h0.a.com.'
+    assert len(conn.calls) == 1
+    assert len(list(records)) == 4
+    assert len(conn.calls) == 3
+
+
+def test_search_streams_all_zones_and_filters_types():
+    result = make_module(PagedConnection(ZONES), types=['a']).search_records()
+
+    assert result['failed'] is False
+    assert result['zones_searched'] == 3
+    assert result['truncated'] is False
+    assert sorted((m['zoneName'], m['ownerName']) for m in result['matches']) == [
+        ('a.com.', 'www.a.com.'), ('b.com.', 'api.b.com.')]
+
+
+def test_search_stops_at_max_results():
+    conn = PagedConnection(ZONES)
+    result = make_module(conn, max_results=1, max_workers=1).search_records()
+
+    assert len(result['matches']) == 1
+    assert result['truncated'] is True
+    assert result['zones_searched'] == 1
+    assert not any(uri.startswith('/v3/zones/c.com.') for uri in conn.calls)
+
+
+def test_timed_out_pages_are_retried_smaller():
+    records = list(rrset(f'h{i}.a.com.', 'A (1)', '192.0.2.1') for i in range(300))
+    conn = SlowConnection({'a.com.': records}, max_page=100)
+    api = make_module(conn, page_size=400)
+
+    assert list(r['ownerName'] for r in api.iter_records('a.com.')) == list(r['ownerName'] for r in records)
+    assert list(uri.split('limit=')[1].split('&')[0] for uri in conn.calls[:3]) == ['400', '200', '100']
+
+
+def test_list_responses_end_the_listing():
+    class ListConnection(PagedConnection):
+        def get(self, uri, params=None):
+            self.calls.append(uri)
+            if 'missing' in uri:
+                return [{'errorCode': 1801, 'errorMessage': 'Zone does not exist in the system.'}]
+            return []
+
+    api = make_module(ListConnection({}))
+    assert list(api.iter_zones()) == []
+    assert list(api.iter_records('a.com.')) == []
+    with pytest.raises(UltraDNSError, match='Zone does not exist'):
+        list(api.iter_zones({'name': 'missing'}))
@@ -0,0 +1,81 @@
+"""Unit tests for bulk secondary zone provisioning."""
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+
+class FakeConnection:
+    """Minimal connection that records calls and serves zone state from a dict."""
+
+    def __init__(self, zones=None, statuses=None):
+        self.zones = zones or {}
+        self.statuses = statuses or {}
+        self.calls = []
+
+    def get(self, uri, params=None):
+        self.calls.append(('GET', uri))
+        name = uri.rsplit('/', 1)[-1]
+        if name not in self.zones:
+            return {'errorCode': 1801, 'errorMessage': 'Zone does not exist in the system.'}
+        status = self.statuses.get(name, ['ACTIVE'])
+        zone = dict(self.zones[name])
+        zone['properties'] = dict(zone['properties'], status=status.pop(0) if len(status) > 1 else status[0])
+        return zone
+
+    def post(self, uri, body=None):
+        self.calls.append(('POST', uri))
+        name = body['properties']['name']
+        self.zones[name] = {'properties': dict(body['properties'])}
+        return {}
+
+    def put(self, uri, body):
+        self.calls.append(('PUT', uri))
+        return {}
+
+    def delete(self, uri):
+        self.calls.append(('DELETE', uri))
+        return {}
+
+
+def make_module(conn, **params):
+    spec = {
+        'zones': ['a.com.', 'b.com.'],
+        'account': 'acct',
+        'primary': {'ip': '10.0.0.1'},
+        'state': 'present',
+        'max_workers': 4,
+        'wait': False,
+        'wait_timeout': 5,
+        'provider': {'username': 'user', 'password': 'pass', 'use_test': False},
+    }
+    spec.update(params)
+    api = UltraDNSModule(spec)
+    api.connection = conn
+    return api
+
+
+def test_creates_every_zone():
+    conn = FakeConnection()
+    result = make_module(conn).secondary_zones()
+
+    assert result['changed'] is True
+    assert result['failed'] is False
+    assert set(result['zones']) == {'a.com.', 'b.com.'}
+    assert sum(1 for call in conn.calls if call[0] == 'POST') == 2
+
+
+def test_wait_polls_until_active():
+    conn = FakeConnection(statuses={'a.com.': ['PENDING', 'ACTIVE'], 'b.com.': ['ACTIVE']})
+    result = make_module(conn, wait=True).secondary_zones()
+
+    assert result['failed'] is False
+    assert result['zones']['a.com.']['status'] == 'ACTIVE'
+    assert result['zones']['b.com.']['status'] == 'ACTIVE'
+
+
+def test_wait_reports_timeout():
+    conn = FakeConnection(statuses={'a.com.': ['PENDING'], 'b.com.': ['ACTIVE']})
+    result = make_module(conn, wait=True, wait_timeout=0).secondary_zones()
+
+    assert result['failed'] is True
+    assert result['zones']['a.com.']['msg'] == 'Timed out waiting for zone transfer'
+    assert result['zones']['b.com.']['failed'] is False
@@ -0,0 +1,72 @@
+"""Unit tests for the session pool and modules working on several accounts."""
+
+import threading
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils import ultraapi
+from ansible_collections.ultradns.ultradns.plugins.module_utils.connection import ApiStats
+from ansible_collections.ultradns.ultradns.plugins.module_utils.sessions import SessionPool
+
+from .test_record_search import PagedConnection, ZONES, make_module, rrset
+
+
+class LoginCounter:
+    logins = []
+
+    def __init__(self, host):
+        self.host = host
+        self.stats = ApiStats()
+
+    def auth(self, username, password):
+        self.logins.append((self.host, username))
+
+
+def test_pool_reuses_and_evicts_sessions():
+    LoginCounter.logins = []
+    pool = SessionPool(max_sessions=2)
+    first = pool.get('api.ultradns.com', 'ops', 'secret', LoginCounter)
+    threads = list(threading.Thread(target=pool.get, args=('api.ultradns.com', 'ops', 'secret', LoginCounter)) for _ in range(4))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert pool.get('api.ultradns.com', 'ops', 'secret', LoginCounter) is first
+    assert len(LoginCounter.logins) == 1
+
+    # a changed password logs in again
+    assert pool.get('api.ultradns.com', 'ops', 'rotated', LoginCounter) is not first
+
+    # ops was used last, so dns is the one evicted when a third account arrives
+    pool.get('api.ultradns.com', 'dns', 'secret', LoginCounter)
+    pool.get('api.ultradns.com', 'ops', 'rotated', LoginCounter)
+    pool.get('test-api.ultradns.com', 'ops', 'secret', LoginCounter)
+    assert list(pool.sessions) == [('api.ultradns.com', 'ops'), ('test-api.ultradns.com', 'ops')]
+
+    pool.idle_timeout = -1
+    pool.get('api.ultradns.com', 'ops', 'rotated', LoginCounter)
+    assert LoginCounter.logins[-1] == ('api.ultradns.com', 'ops') and len(LoginCounter.logins) == 5
+
+
+def test_search_across_providers(monkeypatch):
+    accounts = {
+        'ops': PagedConnection(ZONES),
+        'marketing': PagedConnection({'d.com.': [rrset('shop.d.com.', 'A (1)', '192.0.2.15')]}),
+    }
+    for conn in accounts.values():
+        conn.stats = ApiStats()
+
+    class Pool:
+        def get(self, host, username, password):
+            return accounts[username]
+
+    monkeypatch.setattr(ultraapi, 'SESSIONS', Pool())
+    providers = list({'username': name, 'password': 'pass', 'use_test': False} for name in accounts)
+    api = make_module(None, providers=providers, max_workers=4)
+    res = api.search_records()
+
+    assert res['failed'] is False
+    assert res['zones_searched'] == 4
+    assert sorted((m['provider'], m['zoneName']) for m in res['matches']) == [
+        ('marketing@api.ultradns.com', 'd.com.'), ('ops@api.ultradns.com', 'a.com.'),
+        ('ops@api.ultradns.com', 'b.com.'), ('ops@api.ultradns.com', 'b.com.')]
+    assert set(res['providers']) == {'ops@api.ultradns.com', 'marketing@api.ultradns.com'}
+    assert 'api_stats' in api.api_stats()
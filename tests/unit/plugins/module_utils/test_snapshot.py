@@ -0,0 +1,147 @@
+"""Unit tests for the SQLite snapshot store and the facts answered from it."""
+
+import pytest
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils import snapshot
+from ansible_collections.ultradns.ultradns.plugins.module_utils.snapshot import SnapshotStore
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+
+def rrset(owner, rrtype, *rdata, **extra):
+    data = {'ownerName': owner, 'rrtype': rrtype, 'ttl': 300, 'rdata': list(rdata)}
+    data.update(extra)
+    return data
+
+
+class SnapshotConnection:
+    """Serves a zone listing, the SOA of every zone and its rrsets, counting every request."""
+
+    def __init__(self):
+        self.zones = {
+            'example.com.': [
+                rrset('example.com.', 'SOA (6)', 'ns1.example.net. admin.example.com. 1 3600 600 86400 300'),
+                rrset('www.example.com.', 'A (1)', '192.0.2.10', '192.0.2.11'),
+                rrset('mail.example.com.', 'A (1)', '192.0.2.20', ttl=60),
+                rrset('pool.example.com.', 'A (1)', '192.0.2.30',
+                      profile={'@context': 'http://schemas.ultradns.com/RDPool.jsonschema', 'order': 'RANDOM'}),
+            ],
+            'example.net.': [rrset('example.net.', 'SOA (6)', 'ns1.example.net. admin.example.net. 7 3600 600 86400 300')],
+        }
+        self.calls = []
+
+    def set_serial(self, zone, serial):
+        self.zones[zone][0]['rdata'] = [f'ns1.example.net. admin.{zone} {serial} 3600 600 86400 300']
+
+    def get(self, uri, params=None):
+        self.calls.append(uri)
+        path = uri.partition('?')[0]
+        if path == '/v3/zones':
+            return {'zones': list({'properties': {'name': name, 'type': 'PRIMARY', 'status': 'ACTIVE'}}
+                                  for name in sorted(self.zones))}
+        parts = path.split('/')
+        zone = parts[parts.index('zones') + 1].rstrip('.') + '.'
+        if '/SOA/' in path:
+            return {'rrSets': [self.zones[zone][0]]}
+        rrsets = self.zones[zone]
+        return {'rrSets': rrsets, 'resultInfo': {'totalCount': len(rrsets), 'returnedCount': len(rrsets)}}
+
+
+def make_module(conn, path, **params):
+    spec = {
+        'zone': 'example.com',
+        'snapshot': str(path),
+        'snapshot_max_age': 0,
+        'page_size': 1000,
+        'provider': {'username': 'user', 'password': 'pass', 'use_test': False},
+    }
+    spec.update(params)
+    api = UltraDNSModule(spec)
+    api.connection = conn
+    return api
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / 'snapshot.db'
+
+
+def test_records_are_read_again_only_when_the_serial_changed(path):
+    conn = SnapshotConnection()
+    records, result = make_module(conn, path).get_records()
+    assert not result['failed']
+    assert len(records) == 4
+    assert any(c.startswith('/v3/zones/example.com/rrsets?') for c in conn.calls)
+
+    # the serial did not move, so only the SOA is read
+    conn.calls.clear()
+    records, result = make_module(conn, path).get_records()
+    assert len(records) == 4
+    assert conn.calls == ['/zones/example.com/rrsets/SOA/example.com']
+
+    conn.set_serial('example.com.', 2)
+    conn.zones['example.com.'].append(rrset('api.example.com.', 'A (1)', '192.0.2.40'))
+    conn.calls.clear()
+    records, result = make_module(conn, path).get_records()
+    assert len(records) == 5
+    assert len(conn.calls) == 2
+
+
+def test_a_recent_check_makes_no_api_call(path):
+    conn = SnapshotConnection()
+    make_module(conn, path, snapshot_max_age=300).get_records()
+    conn.calls.clear()
+    records, result = make_module(conn, path, snapshot_max_age=300, owner='www').get_records()
+    assert conn.calls == []
+    assert list(r['ownerName'] for r in records) == ['www.example.com.']
+    assert result['msg'] == 'Retrieved 1 records from the snapshot'
+
+
+def test_snapshot_filters_match_record_facts(path):
+    conn = SnapshotConnection()
+    make_module(conn, path).get_records()
+
+    def owners(**filters):
+        records, result = make_module(conn, path, snapshot_max_age=300, **filters).get_records()
+        return list(r['ownerName'] for r in records)
+
+    assert owners(value='192.0.2.1') == ['www.example.com.']
+    assert owners(ttl=60) == ['mail.example.com.']
+    assert owners(kind='RD_POOLS') == ['pool.example.com.']
+    assert 'pool.example.com.' not in owners(kind='RECORDS')
+    assert owners(owner='mail', reverse=True) == ['mail.example.com.']
+    # a wildcard character in a filter is matched literally
+    assert owners(owner='%') == []
+
+
+def test_zone_list_is_answered_from_the_snapshot(path):
+    conn = SnapshotConnection()
+    zones, result = make_module(conn, path, zone=None, snapshot_max_age=300).get_zones()
+    assert list(z['properties']['name'] for z in zones) == ['example.com.', 'example.net.']
+
+    del conn.zones['example.net.']
+    conn.calls.clear()
+    zones, result = make_module(conn, path, zone=None, name='net', snapshot_max_age=300).get_zones()
+    assert conn.calls == []
+    assert list(z['properties']['name'] for z in zones) == ['example.net.']
+
+    # once stale the list is read again and zones that are gone are dropped
+    zones, result = make_module(conn, path, zone=None).get_zones()
+    assert list(z['properties']['name'] for z in zones) == ['example.com.']
+
+
+def test_query_refreshes_zones_and_is_read_only(path):
+    conn = SnapshotConnection()
+    rows, result = make_module(conn, path, query='SELECT zone, owner FROM rdata WHERE value = ?',
+                               parameters=['192.0.2.30'], refresh=['example.com.']).query_snapshot()
+    assert not result['failed']
+    assert rows == [{'zone': 'example.com.', 'owner': 'pool.example.com.'}]
+
+    rows, result = make_module(conn, path, query='DELETE FROM rrsets', refresh=None).query_snapshot()
+    assert result['failed']
+    with SnapshotStore(str(path)) as store:
+        assert len(store.records('example.com.', {})) == 4
+
+
+def test_query_of_a_missing_snapshot_fails(tmp_path):
+    with pytest.raises(OSError):
+        snapshot.query(str(tmp_path / 'missing.db'), 'SELECT 1')
@@ -0,0 +1,75 @@
+"""Unit tests for the offline record validator."""
+
+import pytest
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.validate import validate_rdata, validate_records
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+from .test_plan import ZONES, ZoneConnection, make_module
+
+
+@pytest.mark.parametrize('rrtype,value', [
+    ('A', '192.0.2.1'),
+    ('AAAA', '2001:db8::1'),
+    ('CNAME', 'www.example.net.'),
+    ('MX', '10 mail.example.com.'),
+    ('SRV', '10 60 5060 sip.example.com.'),
+    ('CAA', '0 issue "letsencrypt.org; validationmethods=dns-01"'),
+    ('CAA', '0 issuewild ";"'),
+    ('CAA', '128 iodef "mailto:security@example.com"'),
+    ('SSHFP', '4 2 ' + 'ab' * 32),
+    ('HTTPS', '1 . alpn=h2,h3 ipv4hint=192.0.2.1,192.0.2.2 port=8443'),
+    ('SVCB', '0 svc.example.net.'),
+    ('SOA', 'ns1.example.net. admin.example.com. 2024061201 3600 600 604800 300'),
+])
+def test_valid_values(rrtype, value):
+    assert validate_rdata(rrtype, value) is None
+
+
+@pytest.mark.parametrize('rrtype,value,message', [
+    ('A', '192.0.2.256', 'not an IPv4 address'),
+    ('AAAA', '192.0.2.1', 'not an IPv6 address'),
+    ('MX', '70000 mail.example.com.', 'preference must be a number'),
+    ('SRV', '10 60 mail.example.com.', 'expected 4 fields'),
+    ('CAA', '0 is-sue "ca.example"', 'not a valid CAA tag'),
+    ('CAA', '0 iodef "security@example.com"', 'mailto: or http(s) URL'),
+    ('SSHFP', '1 1 xyz', '40 hexadecimal digits'),
+    ('SSHFP', '5 1 ' + 'a' * 40, 'algorithm must be one of'),
+    ('HTTPS', '1 . alpn=h2 alpn=h3', 'more than once'),
+    ('HTTPS', '1 . port=http', 'port must be a number'),
+    ('SVCB', '0 svc.example.net. alpn=h2', 'takes no parameters'),
+    ('CNAME', 'bad host.example.', 'not a valid host name'),
+])
+def test_invalid_values(rrtype, value, message):
+    assert message in validate_rdata(rrtype, value)
+
+
+def test_batch_names_every_invalid_record():
+    errors = validate_records([
+        {'zone': 'example.com.', 'name': 'www', 'type': 'A', 'rdata': ['192.0.2.1', 'nope'], 'ttl': 300},
+        {'zone': 'example.com.', 'name': 'old', 'type': 'TXT', 'rdata': None, 'state': 'absent'},
+        {'zone': 'example.com.', 'name': 'mail', 'type': 'MX', 'rdata': None},
+        {'zone': 'example.com.', 'name': 'api', 'type': 'AAAA', 'rdata': ['2001:db8::1'], 'ttl': -1},
+    ])
+    assert errors == [
+        'records[0] www A in example.com.: nope: nope is not an IPv4 address',
+        'records[2] mail MX in example.com.: rdata is required for a present record',
+        'records[3] api AAAA in example.com.: TTL must be from 0 to 2147483647, not -1',
+    ]
+
+
+def test_invalid_plan_makes_no_api_call():
+    conn = ZoneConnection(ZONES)
+    records = [{'zone': 'example.com.', 'name': 'www', 'type': 'A', 'rdata': ['192.0.2.300'], 'ttl': None, 'state': 'present'}]
+    result = make_module(conn, records=records).dns_plan()
+    assert result['failed'] is True and len(result['invalid']) == 1
+    assert conn.calls == []
+
+
+def test_invalid_record_fails_before_connecting():
+    api = UltraDNSModule({
+        'zone': 'example.com.', 'name': 'www', 'type': 'MX', 'state': 'present', 'data': 'mail.example.com.',
+        'rdata': None, 'ttl': None, 'provider': {'username': 'user', 'password': 'pass', 'use_test': False}})
+    result = api.record()
+    assert result['failed'] is True and 'expected 2 fields' in result['msg']
+    assert api.connection is None
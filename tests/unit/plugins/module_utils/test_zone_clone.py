@@ -0,0 +1,143 @@
+"""Unit tests for cloning a zone into many target zones."""
+
+import threading
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.clone import clone_operations, rename
+from ansible_collections.ultradns.ultradns.plugins.module_utils.models import RRSet
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+
+def rrset(owner, rrtype, *rdata, **extra):
+    data = {'ownerName': owner, 'rrtype': rrtype, 'ttl': 300, 'rdata': list(rdata)}
+    data.update(extra)
+    return data
+
+
+TEMPLATE = [
+    rrset('template.com.', 'SOA (6)', 'ns1.template.com. admin.template.com. 5 3600 600 86400 300'),
+    rrset('template.com.', 'NS (2)', 'ns1.ultradns.net.', 'ns2.ultradns.net.'),
+    rrset('template.com.', 'MX (15)', '10 mail.template.com.', '20 mx.backup.net.'),
+    rrset('www.template.com.', 'CNAME (5)', 'web.template.com.'),
+    rrset('web.template.com.', 'A (1)', '192.0.2.10', '192.0.2.11',
+          profile={'@context': 'http://schemas.ultradns.com/RDPool.jsonschema', 'order': 'ROUND_ROBIN'}),
+    rrset('sub.template.com.', 'NS (2)', 'ns.sub.template.com.'),
+    rrset('template.com.', 'TXT (16)', 'site=template.com.'),
+]
+
+
+class CloneConnection:
+    """Serves the source zone's rrsets and records zone creates and batches, thread safe."""
+
+    def __init__(self, existing=()):
+        self.existing = set(existing)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _log(self, *call):
+        with self.lock:
+            self.calls.append(call)
+
+    def get(self, uri, params=None):
+        self._log('GET', uri.partition('?')[0], None)
+        if uri.startswith('/v3/zones/template.com'):
+            return {'rrSets': TEMPLATE, 'resultInfo': {'totalCount': len(TEMPLATE), 'returnedCount': len(TEMPLATE)}}
+        name = uri.split('/')[2]
+        if name in self.existing:
+            return {'properties': {'name': name, 'type': 'PRIMARY'}}
+        return {'errorCode': 1801, 'errorMessage': 'Zone does not exist in the system.'}
+
+    def post(self, uri, body=None):
+        self._log('POST', uri, body)
+        if uri == '/batch':
+            return list({'code': 201, 'body': {}} for _ in body)
+        return {}
+
+
+def make_module(conn, **params):
+    spec = {
+        'source': 'template.com',
+        'targets': [{'name': 'a.com'}, {'name': 'b.com.'}, {'name': 'c.net.', 'account': 'other'}],
+        'account': 'customers',
+        'source_provider': None,
+        'rewrite_rdata': True,
+        'batch_size': 100,
+        'max_workers': 3,
+        'wait_timeout': 5,
+        'page_size': 1000,
+        'provider': {'username': 'user', 'password': 'pass', 'use_test': False},
+    }
+    spec.update(params)
+    api = UltraDNSModule(spec)
+    api.connection = conn
+    return api
+
+
+def test_rename_moves_names_under_the_source_only():
+    assert rename('template.com.', 'template.com.', 'a.com.') == 'a.com.'
+    assert rename('www.template.com.', 'template.com.', 'a.com.') == 'www.a.com.'
+    assert rename('mytemplate.com.', 'template.com.', 'a.com.') == 'mytemplate.com.'
+    assert rename('mx.backup.net.', 'template.com.', 'a.com.') == 'mx.backup.net.'
+
+
+def test_clone_operations_rewrite_owners_and_names_in_rdata():
+    operations = clone_operations(list(map(RRSet.from_api, TEMPLATE)), 'template.com', 'a.com')
+    by_path = dict((path, body) for _, path, body in operations)
+
+    # the new zone gets its own SOA and apex NS
+    assert '/zones/a.com./rrsets/SOA/a.com.' not in by_path
+    assert '/zones/a.com./rrsets/NS/a.com.' not in by_path
+    assert by_path['/zones/a.com./rrsets/NS/sub.a.com.']['rdata'] == ['ns.sub.a.com.']
+    assert by_path['/zones/a.com./rrsets/MX/a.com.']['rdata'] == ['10 mail.a.com.', '20 mx.backup.net.']
+    assert by_path['/zones/a.com./rrsets/CNAME/www.a.com.']['rdata'] == ['web.a.com.']
+    assert by_path['/zones/a.com./rrsets/A/web.a.com.']['profile']['order'] == 'ROUND_ROBIN'
+    # TXT values are free text and kept as they are
+    assert by_path['/zones/a.com./rrsets/TXT/a.com.']['rdata'] == ['site=template.com.']
+
+    kept = clone_operations(list(map(RRSet.from_api, TEMPLATE)), 'template.com', 'a.com', rewrite_rdata=False)
+    assert dict((p, b) for _, p, b in kept)['/zones/a.com./rrsets/CNAME/www.a.com.']['rdata'] == ['web.template.com.']
+
+
+def test_source_is_read_once_for_every_target():
+    conn = CloneConnection()
+    result = make_module(conn).zone_clone()
+
+    assert result['changed'] and not result['failed']
+    assert list(c for c in conn.calls if c[1].startswith('/v3/')) == [('GET', '/v3/zones/template.com./rrsets', None)]
+
+    creates = dict((c[2]['properties']['name'], c[2]['properties']['accountName']) for c in conn.calls if c[1] == '/zones')
+    assert creates == {'a.com.': 'customers', 'b.com.': 'customers', 'c.net.': 'other'}
+    # every target is written with a single batch request
+    batches = list(c[2] for c in conn.calls if c[1] == '/batch')
+    assert len(batches) == 3
+    assert all(len(b) == 5 for b in batches)
+    assert result['zones']['c.net.'] == {'rrsets': 5, 'applied': 5, 'changed': True, 'failed': False}
+
+
+def test_existing_targets_are_left_untouched():
+    conn = CloneConnection(existing={'b.com.'})
+    result = make_module(conn).zone_clone()
+
+    assert result['zones']['b.com.']['changed'] is False
+    assert result['zones']['b.com.']['msg'] == 'The zone already exists'
+    batches = list(c[2] for c in conn.calls if c[1] == '/batch')
+    assert len(batches) == 2
+    assert not any(r['uri'].startswith('/zones/b.com./') for batch in batches for r in batch)
+    assert not any(c[1] == '/zones' and c[2]['properties']['name'] == 'b.com.' for c in conn.calls)
+
+
+def test_check_mode_creates_nothing():
+    conn = CloneConnection()
+    result = make_module(conn).zone_clone(check_mode=True)
+
+    assert result['changed'] is True
+    assert result['msg'].startswith('3 of 3 zones would be cloned')
+    assert not any(c[0] == 'POST' for c in conn.calls)
+
+
+def test_duplicate_targets_are_rejected():
+    result = make_module(CloneConnection(), targets=[{'name': 'a.com'}, {'name': 'A.com.'}]).zone_clone()
+    assert result['failed']
+    assert 'a.com.' in result['msg']
+
+    result = make_module(CloneConnection(), targets=[{'name': 'template.com.'}]).zone_clone()
+    assert result['failed']
@@ -0,0 +1,81 @@
+"""Unit tests for the streaming zone report."""
+
+import csv
+import json
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+from .test_record_search import PagedConnection, rrset
+
+
+RDPOOL = {'@context': 'http://schemas.ultradns.com/RDPool.jsonschema', 'order': 'ROUND_ROBIN'}
+
+
+class ReportConnection(PagedConnection):
+    def get(self, uri, params=None):
+        result = super().get(uri, params)
+        for zone in result.get('zones', []):
+            name = zone['properties']['name']
+            zone['properties'].update({'type': 'PRIMARY', 'status': 'SUSPENDED' if name == 'c.com.' else 'ACTIVE'})
+        return result
+
+
+ZONES = {
+    'a.com.': [
+        rrset('a.com.', 'NS (2)', 'ns1.a.com.', 'ns2.a.com.'),
+        rrset('a.com.', 'SOA (6)', 'ns1.a.com. admin.a.com. 1 3600 600 604800 300'),
+        dict(rrset('www.a.com.', 'A (1)', '192.0.2.1', '192.0.2.2', '192.0.2.3'), ttl=60, profile=RDPOOL),
+    ],
+    'b.com.': [rrset('b.com.', 'MX (15)', '10 mx.b.com.'), dict(rrset('mx.b.com.', 'A (1)', '192.0.2.9'), ttl=86400)],
+    'c.com.': [],
+}
+
+
+def make_module(conn, **params):
+    spec = {
+        'zones': None,
+        'type': None,
+        'status': None,
+        'account': None,
+        'network': None,
+        'include_records': True,
+        'ttl_buckets': [60, 300, 3600],
+        'max_workers': 3,
+        'fail_on_error': False,
+        'provider': {'username': 'user', 'password': 'pass', 'use_test': False},
+    }
+    spec.update(params)
+    api = UltraDNSModule(spec)
+    api.connection = conn
+    return api
+
+
+def test_report_aggregates_and_writes_rows_in_listing_order(tmp_path):
+    csv_path, json_path = str(tmp_path / 'zones.csv'), str(tmp_path / 'zones.json')
+    result = make_module(ReportConnection(ZONES)).zone_report(csv_path, json_path)
+
+    report = result['report']
+    assert result['changed'] is True
+    assert report['zones'] == 3
+    assert report['zones_by_status'] == {'ACTIVE': 2, 'SUSPENDED': 1}
+    assert report['records_by_type'] == {'NS': 2, 'SOA': 1, 'A': 4, 'MX': 1}
+    assert report['ttl_histogram'] == {'<=60': 1, '<=300': 3, '>3600': 1}
+    assert report['pools_by_kind'] == {'RDPool': 1}
+    assert report['records_per_owner'] == {'<=5': 2, '<=1': 2}
+
+    with open(csv_path) as handle:
+        rows = list(csv.DictReader(handle))
+    assert list(row['zone'] for row in rows) == ['a.com.', 'b.com.', 'c.com.']
+    assert rows[0]['largest_owner'] == '3'
+
+    with open(json_path) as handle:
+        assert json.load(handle)['totals'] == report
+
+
+def test_unchanged_report_is_not_rewritten(tmp_path):
+    csv_path = str(tmp_path / 'zones.csv')
+    make_module(ReportConnection(ZONES)).zone_report(csv_path)
+    result = make_module(ReportConnection(ZONES)).zone_report(csv_path)
+
+    assert result['changed'] is False
+    assert list(p.name for p in tmp_path.iterdir()) == ['zones.csv']
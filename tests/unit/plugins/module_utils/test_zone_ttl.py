@@ -0,0 +1,80 @@
+"""Unit tests for the zone-wide TTL rewrite."""
+
+from ansible_collections.ultradns.ultradns.plugins.module_utils.ultraapi import UltraDNSModule
+
+from .test_record_search import PagedConnection, rrset
+
+
+class PatchConnection(PagedConnection):
+    """Lists rrsets filtered by owner and TTL like the API and applies TTL PATCHes."""
+
+    def get(self, uri, params=None):
+        path, _, query = uri.partition('?')
+        args = dict(part.split('=', 1) for part in query.split('&') if part)
+        terms = dict(term.split(':', 1) for term in args.get('q', '').split('+') if term)
+        self.calls.append(uri)
+        zone = path.split('/')[3]
+        rrsets = list(r for r in self.zones[zone]
+                      if terms.get('owner', '') in r['ownerName'] and ('ttl' not in terms or r['ttl'] == int(terms['ttl'])))
+        offset = int(args['offset'])
+        page = rrsets[offset:offset + self.page_size]
+        return {'rrSets': page, 'resultInfo': {'totalCount': len(rrsets), 'returnedCount': len(page)}}
+
+    def patch(self, uri, body):
+        self.calls.append(('PATCH', uri))
+        _, _, zone, _, rrtype, owner = uri.split('/')
+        if owner.startswith('locked'):
+            return {'errorCode': 56001, 'errorMessage': 'Cannot update a system generated record'}
+        for item in self.zones[zone]:
+            if item['ownerName'] == owner and item['rrtype'].startswith(f'{rrtype} '):
+                item['ttl'] = body['ttl']
+        return {}
+
+
+def zone():
+    records = [rrset('example.com.', 'SOA (6)', 'ns1.example.net. admin.example.com. 1 3600 600 604800 300'),
+               rrset('example.com.', 'NS (2)', 'ns1.example.net.'),
+               rrset('locked.example.com.', 'TXT (16)', 'system')]
+    records += list(rrset(f'host{i}.example.com.', 'A (1)', f'192.0.2.{i}') for i in range(7))
+    records[4]['ttl'] = 60
+    return {'example.com.': records}
+
+
+def make_module(conn, **params):
+    spec = {'zone': 'example.com.', 'ttl': 60, 'owner': None, 'kind': 'ALL', 'current_ttl': None, 'types': None,
+            'max_workers': 3, 'rate_limit': 1000, 'provider': {'username': 'user', 'password': 'pass', 'use_test': False}}
+    spec.update(params)
+    api = UltraDNSModule(spec)
+    api.connection = conn
+    return api
+
+
+def test_lowers_every_ttl_except_soa():
+    conn = PatchConnection(zone(), page_size=4)
+    seen = []
+    result = make_module(conn).zone_ttl(progress=seen.append)
+
+    assert result['rrset_counts'] == {'selected': 9, 'unchanged': 1, 'changed': 7, 'failed': 1}
+    assert result['failed'] is True and list(result['errors']) == ['locked.example.com. TXT']
+    ttls = dict((r['ownerName'], r['ttl']) for r in conn.zones['example.com.'] if r['rrtype'] != 'SOA (6)')
+    assert ttls.pop('locked.example.com.') == 300 and set(ttls.values()) == {60}
+    assert conn.zones['example.com.'][0]['ttl'] == 300
+    assert seen == []
+
+
+def test_filters_and_check_mode():
+    conn = PatchConnection(zone(), page_size=4)
+    result = make_module(conn, ttl=120, owner='host', types=['A'], current_ttl=300).zone_ttl(check_mode=True)
+    assert result['rrset_counts'] == {'selected': 6, 'unchanged': 0, 'changed': 6, 'failed': 0}
+    assert not any(isinstance(c, tuple) for c in conn.calls)
+
+    result = make_module(conn, ttl=60, owner='host').zone_ttl()
+    assert result['rrset_counts']['unchanged'] == 1 and result['rrset_counts']['changed'] == 6
+    assert all(c[1].startswith('/zones/example.com./rrsets/A/host') for c in conn.calls if isinstance(c, tuple))
+
+
+def test_ttl_filtered_selection_is_read_before_patching():
+    conn = PatchConnection(zone(), page_size=2)
+    result = make_module(conn, ttl=900, current_ttl=300, types=['A']).zone_ttl()
+    assert result['rrset_counts'] == {'selected': 6, 'unchanged': 0, 'changed': 6, 'failed': 0}
+    assert sorted(r['ttl'] for r in conn.zones['example.com.'] if r['rrtype'] == 'A (1)') == [60] + [900] * 6